@@ -3,8 +3,10 @@ import os
 import time
 import random
 import re
+from functools import lru_cache
 
 ASCII_FILE = "asciiArt.txt"
+HEADER_PATTERN = re.compile(r"^[A-Za-z0-9 ]+$")  # only word-like names
 
 def clear():
     os.system('clear' if os.name == 'posix' else 'cls')
@@ -17,7 +19,6 @@ def load_ascii_art(filepath=ASCII_FILE):
     arts = {}
     current_name = None
     current_lines = []
-    header_pattern = re.compile(r"^[A-Za-z0-9 ]+$")  # only word-like names
 
     with open(filepath, "r", encoding="utf-8") as f:
         for line in f:
@@ -25,7 +26,7 @@ def load_ascii_art(filepath=ASCII_FILE):
             if not raw.strip():
                 continue
             # treat it as a header only if it matches the pattern
-            if header_pattern.match(raw.strip()):
+            if HEADER_PATTERN.match(raw.strip()):
                 if current_name and current_lines:
                     arts[current_name.lower()] = current_lines
                 current_name = raw.strip()
@@ -38,19 +39,46 @@ def load_ascii_art(filepath=ASCII_FILE):
 
     return arts
 
-def create_ascii_reveal_animation(ascii_lines):
+def scan_art_names(filepath=ASCII_FILE):
+    """
+    Return the art names in file order without keeping any art lines.
+    Cheap enough for listing menus; use get_ascii_arts() for the art itself.
+    """
+    names = []
+    current_name = None
+    with open(filepath, "r", encoding="utf-8") as f:
+        for line in f:
+            raw = line.strip()
+            if not raw:
+                continue
+            if HEADER_PATTERN.match(raw):
+                current_name = raw.lower()
+            elif current_name:
+                # Headers only count once they have at least one art line
+                names.append(current_name)
+                current_name = None
+    return list(dict.fromkeys(names))
+
+@lru_cache(maxsize=None)
+def get_ascii_arts(filepath=ASCII_FILE):
+    """Parse the art file once per process."""
+    return load_ascii_art(filepath)
+
+def create_ascii_reveal_animation(ascii_lines, seed=None):
     """Returns a function that animates the reveal & dissolve of given ASCII lines."""
+    rng = random.Random(seed)
+
     def animate():
         h = len(ascii_lines)
         w = max(len(row) for row in ascii_lines) if ascii_lines else 1
         chaos_chars = list("░▒▓█▄▀▐▌▆▇▉▊▋●◉✦✧*+#@")
-        grid = [[random.choice(chaos_chars) for _ in range(w)] for _ in range(h)]
+        grid = [[rng.choice(chaos_chars) for _ in range(w)] for _ in range(h)]
 
         def display():
             print("\n".join("".join(row) for row in grid))
 
         positions = [(r, c) for r in range(h) for c in range(len(ascii_lines[r]))]
-        random.shuffle(positions)
+        rng.shuffle(positions)
 
         #clear()
         display()
@@ -67,23 +95,28 @@ def create_ascii_reveal_animation(ascii_lines):
         time.sleep(2.0)
 
         # Dissolve
-        random.shuffle(positions)
+        rng.shuffle(positions)
         for idx in range(0, len(positions), 5):
             #clear()
             for r, c in positions[idx:idx+5]:
-                grid[r][c] = random.choice(chaos_chars)
+                grid[r][c] = rng.choice(chaos_chars)
             display()
             time.sleep(0.04)
     return animate
 
-def build_ascii_animations(start_index=1):
-    """
-    Returns a dict of numeric keys -> (name, animation_fn) for all asciiArt.txt blocks.
-    start_index lets math animations come first.
-    """
-    animations = {}
-    ascii_arts = load_ascii_art()
-    for idx, (header, lines) in enumerate(ascii_arts.items(), start=start_index):
-        readable_name = header.title()
-        animations[str(idx)] = (f"Animate {readable_name}", create_ascii_reveal_animation(lines))
-    return animations, ascii_arts
+def animate_art(art_name, seed=None):
+    """Run the reveal & dissolve animation for one named art block."""
+    create_ascii_reveal_animation(get_ascii_arts()[art_name], seed=seed)()
+
+def animate_art_life(art_name, seed=None):
+    """Run Conway's Life seeded with one named art block."""
+    from animations.automata import iter_art_life
+
+    for frame in iter_art_life(get_ascii_arts()[art_name]):
+        print(frame)
+        time.sleep(0.1)
+
+def animate_image(image_name, seed=None):
+    """Run the reveal & dissolve animation for an image from images/."""
+    from animations.image_ascii import image_art
+    create_ascii_reveal_animation(image_art(image_name), seed=seed)()
@@ -0,0 +1,248 @@
+# animations/asciicast.py
+"""
+asciicast v2 (.cast) export.
+
+A cast file is a JSON header line followed by one `[time, "o", data]` event
+per frame. Only the first frame is written in full; every later frame is
+written as cursor moves plus the cells that changed, so long animations with
+small moving parts stay small.
+
+Frames are consumed one at a time and each event is yielded as soon as it is
+encoded, so memory use does not grow with the length of the animation.
+"""
+import functools
+import importlib
+import json
+import queue
+import threading
+import time
+import unicodedata
+from contextlib import redirect_stdout
+
+CSI = "\x1b["
+MIN_WIDTH, MIN_HEIGHT = 80, 24
+# Unchanged runs shorter than this are rewritten rather than skipped, since
+# a cursor move costs about as many bytes as the cells it skips.
+MIN_GAP = 6
+
+def cell_width(ch):
+    return 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+
+def text_width(text):
+    return sum(cell_width(ch) for ch in text)
+
+def _changed_runs(old, new):
+    """Yield (start, end) index ranges of `new` that differ from `old`."""
+    length = max(len(old), len(new))
+    start = None
+    gap = 0
+    for i in range(length):
+        same = i < len(old) and i < len(new) and old[i] == new[i]
+        if not same:
+            if start is None:
+                start = i
+            gap = 0
+            end = i + 1
+        elif start is not None:
+            gap += 1
+            if gap >= MIN_GAP:
+                yield start, end
+                start = None
+    if start is not None:
+        yield start, end
+
+def diff_frame(prev, frame):
+    """Return the terminal output that turns `prev` into `frame`."""
+    if prev is None:
+        return CSI + "H" + CSI + "2J" + frame.replace("\n", "\r\n")
+    old_rows = prev.split("\n")
+    new_rows = frame.split("\n")
+    out = []
+    for row in range(max(len(old_rows), len(new_rows))):
+        old = old_rows[row] if row < len(old_rows) else ""
+        new = new_rows[row] if row < len(new_rows) else ""
+        if old == new:
+            continue
+        if text_width(old) != len(old) or text_width(new) != len(new):
+            # Wide glyphs shift every later column when they change, so
+            # rewrite the rest of the row from the first difference.
+            start = next(i for i, (a, b) in enumerate(zip(old + "\0", new + "\1")) if a != b)
+            column = text_width(new[:start]) + 1
+            out.append(f"{CSI}{row + 1};{column}H{new[start:]}{CSI}K")
+            continue
+        for start, end in _changed_runs(old, new):
+            out.append(f"{CSI}{row + 1};{start + 1}H{new[start:end]}")
+            if end >= len(new) and len(old) > len(new):
+                out.append(CSI + "K")
+    return "".join(out)
+
+def iter_cast(title, timed_frames, width=None, height=None):
+    """
+    Yield the lines of a cast file for an iterable of (seconds, frame) pairs.
+
+    The header needs the terminal size up front, so it is taken from the
+    first frame (never smaller than 80x24) unless given explicitly.
+    """
+    prev = None
+    for seconds, frame in timed_frames:
+        if prev is None:
+            rows = frame.split("\n")
+            header = {
+                "version": 2,
+                "width": width or max(MIN_WIDTH, max(text_width(r) for r in rows)),
+                "height": height or max(MIN_HEIGHT, len(rows)),
+                "timestamp": int(time.time()),
+                "title": title,
+                "env": {"TERM": "xterm-256color", "SHELL": "/bin/sh"},
+            }
+            yield json.dumps(header) + "\n"
+            data = CSI + "?25l" + diff_frame(None, frame)
+        else:
+            data = diff_frame(prev, frame)
+        if data:
+            yield json.dumps([round(seconds, 6), "o", data], ensure_ascii=False) + "\n"
+        prev = frame
+        last = seconds
+    if prev is not None:
+        yield json.dumps([round(last, 6), "o", CSI + "?25h\r\n"]) + "\n"
+
+def write_cast(path, title, timed_frames):
+    """Stream a cast file to disk, returning the number of bytes written."""
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for line in iter_cast(title, timed_frames):
+            f.write(line)
+            written += len(line.encode("utf-8"))
+    return written
+
+# === Frame sources ===
+def timed_frames(frames, frame_delay_ms=100):
+    """Timestamp a frame list (the web generators) at a fixed frame rate."""
+    for i, frame in enumerate(frames):
+        yield i * frame_delay_ms / 1000.0, frame
+
+class _Stopped(Exception):
+    pass
+
+class _VirtualClock:
+    """Stands in for the `time` module so terminal animations run instantly."""
+
+    def __init__(self, on_sleep):
+        self.now = 0.0
+        self._on_sleep = on_sleep
+
+    def sleep(self, seconds):
+        self._on_sleep()
+        self.now += max(0.0, seconds)
+
+    def monotonic(self):
+        # Animations that schedule frames against the clock see virtual time too
+        return self.now
+
+    perf_counter = monotonic
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+class _FrameCapture:
+    """stdout replacement: everything printed between two sleeps is one frame."""
+
+    def __init__(self, emit):
+        self.parts = []
+        self.emit = emit
+        self.clock = _VirtualClock(self.flush)
+
+    def write(self, text):
+        self.parts.append(text)
+        return len(text)
+
+    def flush(self):
+        if not self.parts:
+            return
+        text = "".join(self.parts)
+        self.parts = []
+        lines = [line for line in text.split("\n") if line != "CLEAR_SCREEN"]
+        frame = "\n".join(lines).strip("\n")
+        if frame:
+            self.emit(self.clock.now, frame)
+
+def _defining_module(func):
+    """
+    Name of the module whose `time` global `func` sleeps through: the one
+    defining the code, past registry placeholders, partials and bound
+    methods (a registry "module:SPEC.play" target is spec.py's Spec.play).
+    """
+    while True:
+        if hasattr(func, "resolve"):
+            func = func.resolve()
+        elif isinstance(func, functools.partial):
+            func = func.func
+        elif hasattr(func, "__func__"):
+            func = func.__func__
+        else:
+            return func.__module__
+
+# Terminal animations are captured by swapping module globals, so only one
+# capture may run at a time.
+_capture_lock = threading.Lock()
+
+def terminal_frames(func, max_queued=8, **kwargs):
+    """
+    Run a print-based terminal animation (MATH_ANIMATIONS, asciiArt reveals)
+    on a virtual clock and yield its (seconds, frame) pairs as they are printed.
+
+    Extra keyword arguments (e.g. seed) are passed to the animation.
+    The animation runs in a helper thread feeding a bounded queue, so at most
+    `max_queued` frames are held in memory. Closing the generator early stops
+    the animation at its next print or sleep.
+    """
+    frames = queue.Queue(maxsize=max_queued)
+    stopped = threading.Event()
+    done = object()
+
+    def emit(seconds, frame):
+        while not stopped.is_set():
+            try:
+                frames.put((seconds, frame), timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise _Stopped()
+
+    def run():
+        capture = _FrameCapture(emit)
+        try:
+            module = importlib.import_module(_defining_module(func))
+            with _capture_lock, redirect_stdout(capture):
+                real_time = module.time
+                module.time = capture.clock
+                try:
+                    func(**kwargs)
+                    capture.flush()
+                finally:
+                    module.time = real_time
+        except _Stopped:
+            pass
+        except Exception as e:
+            frames.put(e)
+        finally:
+            frames.put(done)
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = frames.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+        # Unblock the producer if it is waiting on a full queue
+        while worker.is_alive():
+            try:
+                frames.get(timeout=0.1)
+            except queue.Empty:
+                pass
@@ -0,0 +1,337 @@
+# animations/automata.py
+"""
+Cellular automata: Conway's Life, Brian's Brain and their relatives.
+
+Rules use the usual notation, "B3/S23" for Life-like rules (born with 3
+neighbours, survives with 2 or 3) and "B2/S/C3" for Generations rules,
+where a cell that stops surviving spends C - 2 generations dying before it
+is dead again (Brian's Brain: born with 2, never survives, 3 states).
+
+Two interchangeable backends step a board one generation at a time:
+
+    BitBoard    - bit-packed rows (64 cells per uint64 word); the eight
+                  neighbour counts come from shifts and a bitwise adder, so
+                  one NumPy operation updates 64 cells per word
+    ArrayBoard  - one uint8 per cell, neighbours summed from shifted copies
+                  (a 3x3 convolution)
+
+Edges are toroidal (wrap) or bounded (dead beyond the edge). Boards can be
+far larger than the canvas; frames crop a viewport out of them, so gliders
+can leave the picture and keep going.
+
+    python -m animations.automata --bench    # generations/second per backend
+"""
+import argparse
+import re
+import sys
+import time
+
+import numpy as np
+
+RULES = {
+    "life": "B3/S23",
+    "highlife": "B36/S23",
+    "seeds": "B2/S",
+    "day-and-night": "B3678/S34678",
+    "brians-brain": "B2/S/C3",
+}
+STATE_GLYPHS = " █▓▒░"  # dead, alive, then dying states (the last repeats)
+HOLD_FRAMES = 10  # frames an art seed is shown as itself before it starts to live
+
+RULE_PATTERN = re.compile(r"^B(\d*)/S(\d*)(?:/C(\d+))?$", re.IGNORECASE)
+
+class Rule:
+    """A parsed B/S(/C) rule."""
+
+    def __init__(self, text):
+        match = RULE_PATTERN.match(RULES.get(text, text))
+        if match is None:
+            raise ValueError(f"Not a B/S or B/S/C rule: {text!r}")
+        self.text = match.group(0).upper()
+        self.births = frozenset(int(n) for n in match.group(1))
+        self.survivals = frozenset(int(n) for n in match.group(2))
+        self.states = int(match.group(3) or 2)
+        if self.states < 2:
+            raise ValueError("A rule needs at least 2 states")
+
+# === Bit-packed backend ===
+WORD = 64
+
+def _shift_columns(rows, direction, width, wrap):
+    """
+    Move every row one cell towards higher columns (direction=1) or lower
+    columns (-1). Bit i of word j is column 64 * j + i.
+    """
+    if direction > 0:
+        out = rows << np.uint64(1)
+        out[:, 1:] |= rows[:, :-1] >> np.uint64(WORD - 1)
+        if wrap:
+            last = (width - 1) // WORD, (width - 1) % WORD
+            out[:, 0] |= (rows[:, last[0]] >> np.uint64(last[1])) & np.uint64(1)
+    else:
+        out = rows >> np.uint64(1)
+        out[:, :-1] |= rows[:, 1:] << np.uint64(WORD - 1)
+        if wrap:
+            last = (width - 1) // WORD, (width - 1) % WORD
+            out[:, last[0]] |= (rows[:, 0] & np.uint64(1)) << np.uint64(last[1])
+    return out
+
+def _shift_rows(rows, direction, wrap):
+    """Move the whole board one row down (direction=1) or up (-1)."""
+    if wrap:
+        return np.roll(rows, direction, axis=0)
+    out = np.zeros_like(rows)
+    if direction > 0:
+        out[1:] = rows[:-1]
+    else:
+        out[:-1] = rows[1:]
+    return out
+
+def _add2(a, b):
+    """Add two 2-bit bit-sliced numbers into three bits."""
+    a0, a1 = a
+    b0, b1 = b
+    carry = a0 & b0
+    half = a1 ^ b1
+    return a0 ^ b0, half ^ carry, (a1 & b1) | (carry & half)
+
+def _add32(a, b):
+    """Add a 3-bit and a 2-bit bit-sliced number into four bits."""
+    a0, a1, a2 = a
+    b0, b1 = b
+    carry = a0 & b0
+    half = a1 ^ b1
+    carry2 = (a1 & b1) | (carry & half)
+    return a0 ^ b0, half ^ carry, a2 ^ carry2, a2 & carry2
+
+class BitBoard:
+    """A board of bit-packed planes: alive, then one per dying state."""
+
+    def __init__(self, width, height, rule="life", wrap=True):
+        self.width = width
+        self.height = height
+        self.rule = rule if isinstance(rule, Rule) else Rule(rule)
+        self.wrap = wrap
+        words = -(-width // WORD)
+        self.planes = [np.zeros((height, words), dtype="<u8") for _ in range(self.rule.states - 1)]
+        # Padding bits past the last column must stay zero
+        self.mask = np.full(words, np.uint64(2 ** 64 - 1), dtype="<u8")
+        if width % WORD:
+            self.mask[-1] = np.uint64((1 << (width % WORD)) - 1)
+
+    def set_alive(self, cells):
+        """Replace the board with a (height, width) boolean array of live cells."""
+        padded = np.zeros((self.height, self.planes[0].shape[1] * WORD), dtype=bool)
+        padded[:, :self.width] = cells
+        self.planes[0] = np.packbits(padded, axis=1, bitorder="little").view("<u8")
+        for plane in self.planes[1:]:
+            plane[:] = 0
+
+    def _counts(self, alive):
+        """Bit-sliced neighbour counts (four planes, least significant first)."""
+        left = _shift_columns(alive, 1, self.width, self.wrap)
+        right = _shift_columns(alive, -1, self.width, self.wrap)
+        # Per row: left + right, and left + self + right
+        pair = (left ^ right, left & right)
+        trio = (pair[0] ^ alive, pair[1] | (pair[0] & alive))
+        above = tuple(_shift_rows(bit, 1, self.wrap) for bit in trio)
+        below = tuple(_shift_rows(bit, -1, self.wrap) for bit in trio)
+        return _add32(_add2(above, below), pair)
+
+    def _equals(self, counts, values):
+        """Cells whose count is one of `values`."""
+        result = np.zeros_like(counts[0])
+        for value in values:
+            match = ~np.zeros_like(counts[0])
+            for bit, plane in enumerate(counts):
+                match &= plane if value >> bit & 1 else ~plane
+            result |= match
+        return result
+
+    def step(self):
+        alive = self.planes[0]
+        counts = self._counts(alive)
+        occupied = alive.copy()
+        for plane in self.planes[1:]:
+            occupied |= plane
+        survive = alive & self._equals(counts, self.rule.survivals)
+        born = ~occupied & self._equals(counts, self.rule.births) & self.mask
+        # Dying cells age by one state; cells that stop surviving start dying
+        self.planes = [born | survive] + ([alive & ~survive] + self.planes[1:-1] if len(self.planes) > 1 else [])
+
+    def states(self, x, y, width, height):
+        """The (height, width) uint8 states of a viewport inside the board."""
+        view = np.zeros((height, width), dtype=np.uint8)
+        for state, plane in enumerate(self.planes, start=1):
+            bits = np.unpackbits(plane[y:y + height].view(np.uint8), axis=1, bitorder="little")
+            view[bits[:, x:x + width].astype(bool)] = state
+        return view
+
+# === Array backend ===
+class ArrayBoard:
+    """A board of uint8 states (0 dead, 1 alive, 2.. dying)."""
+
+    def __init__(self, width, height, rule="life", wrap=True):
+        self.width = width
+        self.height = height
+        self.rule = rule if isinstance(rule, Rule) else Rule(rule)
+        self.wrap = wrap
+        self.cells = np.zeros((height, width), dtype=np.uint8)
+        self.born = np.isin(np.arange(9), list(self.rule.births))
+        self.survives = np.isin(np.arange(9), list(self.rule.survivals))
+
+    def set_alive(self, cells):
+        self.cells = np.asarray(cells, dtype=np.uint8)
+
+    def _counts(self, alive):
+        if self.wrap:
+            padded = np.pad(alive, 1, mode="wrap")
+        else:
+            padded = np.pad(alive, 1)
+        h, w = alive.shape
+        counts = np.zeros((h, w), dtype=np.uint8)
+        for dy in range(3):
+            for dx in range(3):
+                if dy != 1 or dx != 1:
+                    counts += padded[dy:dy + h, dx:dx + w]
+        return counts
+
+    def step(self):
+        cells = self.cells
+        alive = (cells == 1).view(np.uint8)
+        counts = self._counts(alive)
+        dying = np.where(cells + 1 < self.rule.states, cells + 1, 0).astype(np.uint8)
+        self.cells = np.where(
+            cells == 0, self.born[counts].view(np.uint8),
+            np.where((cells == 1) & self.survives[counts], 1, dying)).astype(np.uint8)
+
+    def states(self, x, y, width, height):
+        return self.cells[y:y + height, x:x + width]
+
+BACKENDS = {"bits": BitBoard, "numpy": ArrayBoard}
+
+# === Rendering ===
+_STATE_CODES = np.array([ord(STATE_GLYPHS[min(state, len(STATE_GLYPHS) - 1)]) for state in range(256)],
+                        dtype=np.uint32)
+
+def render(states, glyphs=None):
+    """A frame from a (height, width) state array; `glyphs` overrides live cells (0: keep)."""
+    height, width = states.shape
+    codes = np.full((height, width + 1), 10, dtype=np.uint32)
+    codes[:, :width] = _STATE_CODES[states]
+    if glyphs is not None:
+        live = (states == 1) & (glyphs != 0)
+        codes[:, :width][live] = glyphs[live]
+    return codes.tobytes().decode("utf-32-le")[:-1]
+
+def iter_generations(board, viewport, frames, glyphs=None):
+    """Yield `frames` frames of `board` through viewport (x, y, width, height)."""
+    for _ in range(frames):
+        yield render(board.states(*viewport), glyphs)
+        board.step()
+
+# === Presets ===
+def _rng(seed):
+    """A NumPy generator for any integer seed; NumPy rejects negative ones, so they wrap to 64 bits."""
+    return np.random.default_rng(None if seed is None else seed % 2 ** 64)
+
+PRESETS = {
+    "life": dict(rule="life", board=(512, 512), wrap=True, density=0.3, width=70, height=30, frames=150),
+    "brians-brain": dict(rule="brians-brain", board=(256, 256), wrap=True, density=0.2,
+                         width=70, height=30, frames=150),
+}
+
+def iter_automaton(preset, seed=None, backend="bits"):
+    """Yield the frames of a preset: a random soup on a large board, viewed through the canvas."""
+    config = PRESETS[preset]
+    board_width, board_height = config["board"]
+    board = BACKENDS[backend](board_width, board_height, config["rule"], config["wrap"])
+    board.set_alive(_rng(seed).random((board_height, board_width)) < config["density"])
+    viewport = ((board_width - config["width"]) // 2, (board_height - config["height"]) // 2,
+                config["width"], config["height"])
+    yield from iter_generations(board, viewport, config["frames"])
+
+def automaton_frames(preset, seed=None):
+    """Create the frames of an automaton preset"""
+    return list(iter_automaton(preset, seed))
+
+def iter_art_life(lines, rule="life", frames=150, margin=(6, 3), backend="bits"):
+    """
+    Yield frames of `lines` (ASCII art) decaying into `rule`: every non-space
+    character starts alive, and cells alive where the art was keep its glyph.
+    The board extends a canvas-width beyond every side and is bounded, so
+    whatever leaves the picture doesn't wrap back into it.
+    """
+    art_height = len(lines)
+    art_width = max((len(line) for line in lines), default=1)
+    width, height = art_width + 2 * margin[0], art_height + 2 * margin[1]
+    board = BACKENDS[backend](3 * width, 3 * height, rule, wrap=False)
+    viewport = (width, height, width, height)
+
+    glyphs = np.zeros((height, width), dtype=np.uint32)
+    for row, line in enumerate(lines):
+        for column, char in enumerate(line):
+            if char != " ":
+                glyphs[margin[1] + row, margin[0] + column] = ord(char)
+    alive = np.zeros((3 * height, 3 * width), dtype=bool)
+    alive[height:2 * height, width:2 * width] = glyphs != 0
+    board.set_alive(alive)
+
+    art = render(board.states(*viewport), glyphs)
+    for _ in range(HOLD_FRAMES):
+        yield art
+    yield from iter_generations(board, viewport, frames, glyphs)
+
+def art_life_frames(art_name, seed=None):
+    """Create frames of a named art block decaying into Conway's Life"""
+    from animations.ascii_animations import get_ascii_arts
+
+    ascii_arts = get_ascii_arts()
+    if art_name not in ascii_arts:
+        return [f"ASCII art '{art_name}' not found"]
+    return list(iter_art_life(ascii_arts[art_name]))
+
+# === Benchmark ===
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench(sizes=(256, 1024, 4096), rules=("life", "brians-brain"), generations=20, repeat=3, seed=0):
+    """Generations per second for each backend, rule and board size; checks the backends agree."""
+    identical = True
+    print(f"{'rule':<14}{'board':>11}" + "".join(f"{name:>14}" for name in BACKENDS))
+    for rule in rules:
+        for size in sizes:
+            soup = _rng(seed).random((size, size)) < 0.3
+            cells = []
+            results = []
+            for name, backend in BACKENDS.items():
+                board = backend(size, size, rule, wrap=True)
+                board.set_alive(soup)
+                seconds = best_time(board.step, repeat)
+                cells.append(f"{1 / seconds:>10.1f} g/s")
+                for _ in range(generations):
+                    board.step()
+                results.append(board.states(0, 0, size, size))
+            same = all(np.array_equal(results[0], other) for other in results[1:])
+            identical = identical and same
+            print(f"{rule:<14}{f'{size}x{size}':>11}{''.join(cells)}" + ("" if same else "  ❌ backends differ"))
+    return identical
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the cellular automaton backends")
+    parser.add_argument("--bench", action="store_true", help="Generations/second per backend and board size")
+    parser.add_argument("--sizes", default="256,1024,4096")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    if not args.bench:
+        parser.print_help()
+        return 0
+    return 0 if bench([int(n) for n in args.sizes.split(",")], repeat=args.repeat) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+# animations/banner.py
+"""
+FIGlet-style text banners.
+
+Fonts are standard FIGlet .flf files in fonts/ (or $FIGLET_FONT_DIR). Each
+font is parsed once into a glyph atlas: besides the glyph rows, every glyph
+records how many blank columns each row starts with and which character it
+starts with, and every glyph row how many blank columns it ends with. That
+is all the layout needs to work out how far the next glyph can slide left
+(kerning) or overlap (smushing) without rescanning the line built so far.
+Smushing results for the character pairs that can meet at glyph edges are
+precomputed into a table as well.
+
+    render_banner("Hello")               # tuple of lines, LRU-cached
+    render_banner("Hi\\nthere", "slant")  # one banner per line, stacked
+
+The lines work anywhere ASCII art does, e.g.
+create_ascii_art_reveal("hello", lines=render_banner("Hello")).
+"""
+import os
+import re
+from functools import lru_cache
+
+FONT_DIR = os.environ.get(
+    "FIGLET_FONT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fonts"),
+)
+DEFAULT_FONT = "standard"
+FONT_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+DEUTSCH_CHARS = "ÄÖÜäöüß"
+
+# Layout bits of the "full layout" header field
+SM_EQUAL = 1
+SM_LOWLINE = 2
+SM_HIERARCHY = 4
+SM_PAIR = 8
+SM_BIGX = 16
+SM_HARDBLANK = 32
+SM_KERN = 64
+SM_SMUSH = 128
+
+HIERARCHY = ("|", "/\\", "[]", "{}", "()", "<>")
+
+class Glyph:
+    """One character of a font plus its edge profile (the kerning table)."""
+    __slots__ = ("rows", "width", "lead", "first", "trail")
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.width = max(len(row) for row in rows)
+        self.lead = tuple(len(row) - len(row.lstrip(" ")) for row in rows)
+        self.first = tuple(row[lead] if lead < len(row) else "" for row, lead in zip(rows, self.lead))
+        self.trail = tuple(len(row) - len(row.rstrip(" ")) for row in rows)
+
+class FigletFont:
+    def __init__(self, name, hardblank, height, layout, glyphs, comment=""):
+        self.name = name
+        self.hardblank = hardblank
+        self.height = height
+        self.layout = layout
+        self.glyphs = glyphs
+        self.comment = comment
+        self.smush_table = self._build_smush_table()
+
+    @classmethod
+    def parse(cls, name, text):
+        lines = text.splitlines()
+        header = lines[0].split()
+        if not header or not header[0].startswith("flf2a") or len(header) < 6:
+            raise ValueError(f"{name}: not a FIGlet font")
+        hardblank = header[0][5:] or "$"
+        height, _baseline, _max_length, old_layout, comment_lines = (int(v) for v in header[1:6])
+        if len(header) > 7:
+            layout = int(header[7])
+        elif old_layout == 0:
+            layout = SM_KERN
+        elif old_layout < 0:
+            layout = 0
+        else:
+            layout = (old_layout & 31) | SM_SMUSH
+
+        comment = "\n".join(lines[1:1 + comment_lines])
+        position = 1 + comment_lines
+
+        def read_glyph():
+            nonlocal position
+            rows = lines[position:position + height]
+            position += height
+            if len(rows) < height:
+                return None
+            endmark = rows[0].rstrip()[-1:] if rows[0].strip() else ""
+            strip_end = re.compile(re.escape(endmark) + r"{1,2}\s*$") if endmark else None
+            return tuple(strip_end.sub("", row) if strip_end else row.rstrip() for row in rows)
+
+        glyphs = {}
+        for code in range(32, 127):
+            rows = read_glyph()
+            if rows is None:
+                raise ValueError(f"{name}: truncated font")
+            if code == 32 or "".join(rows):
+                glyphs[chr(code)] = Glyph(rows)
+        for char in DEUTSCH_CHARS:
+            if position >= len(lines):
+                break
+            rows = read_glyph()
+            if rows is not None and "".join(rows):
+                glyphs[char] = Glyph(rows)
+        # Code-tagged characters: "<code> [description]" followed by the glyph
+        while position < len(lines):
+            tag = lines[position].split()
+            position += 1
+            if not tag:
+                continue
+            rows = read_glyph()
+            code = _parse_code(tag[0])
+            if rows is None:
+                break
+            if code is not None and code >= 0:
+                glyphs[chr(code)] = Glyph(rows)
+        return cls(name, hardblank, height, layout, glyphs, comment)
+
+    # === Smushing ===
+    def _build_smush_table(self):
+        """Precompute smush results for every pair of glyph edge characters."""
+        right_edges = set()
+        left_edges = set()
+        for glyph in self.glyphs.values():
+            left_edges.update(c for c in glyph.first if c)
+            right_edges.update(row[len(row) - trail - 1] for row, trail in zip(glyph.rows, glyph.trail)
+                               if trail < len(row))
+        table = {}
+        for left in right_edges:
+            for right in left_edges:
+                table[left, right] = self._smush_rule(left, right)
+        return table
+
+    def _smush_rule(self, left, right):
+        """FIGlet horizontal smushing rules for two visible characters (None = no smush)."""
+        layout = self.layout
+        hardblank = self.hardblank
+        if not layout & SM_SMUSH:
+            return None
+        if not layout & 63:
+            # Universal smushing: the later character wins over anything but a hardblank
+            if left == hardblank:
+                return right
+            return left if right == hardblank else right
+        if layout & SM_HARDBLANK and left == hardblank and right == hardblank:
+            return left
+        if left == hardblank or right == hardblank:
+            return None
+        if layout & SM_EQUAL and left == right:
+            return left
+        if layout & SM_LOWLINE:
+            if left == "_" and right in "|/\\[]{}()<>":
+                return right
+            if right == "_" and left in "|/\\[]{}()<>":
+                return left
+        if layout & SM_HIERARCHY:
+            left_class = next((i for i, chars in enumerate(HIERARCHY) if left in chars), None)
+            right_class = next((i for i, chars in enumerate(HIERARCHY) if right in chars), None)
+            if left_class is not None and right_class is not None and left_class != right_class:
+                return right if right_class > left_class else left
+        if layout & SM_PAIR and left + right in ("[]", "][", "{}", "}{", "()", ")("):
+            return "|"
+        if layout & SM_BIGX:
+            if left + right == "/\\":
+                return "|"
+            if left + right == "\\/":
+                return "Y"
+            if left + right == "><":
+                return "X"
+        return None
+
+    def smush(self, left, right, previous_width, width):
+        if left == " ":
+            return right
+        if right == " ":
+            return left
+        if previous_width < 2 or width < 2:
+            return None
+        try:
+            return self.smush_table[left, right]
+        except KeyError:
+            result = self.smush_table[left, right] = self._smush_rule(left, right)
+            return result
+
+    # === Layout ===
+    def _overlap(self, lines, last, length, glyph, previous_width):
+        """How many columns `glyph` can slide into the current line."""
+        if not self.layout & (SM_SMUSH | SM_KERN):
+            return 0
+        amount = glyph.width
+        for row in range(self.height):
+            edge = max(last[row], 0)
+            left = lines[row][edge] if edge < len(lines[row]) else ""
+            right = glyph.first[row]
+            row_amount = glyph.lead[row] + length - 1 - edge
+            if left in ("", " "):
+                row_amount += 1
+            elif right and self.smush(left, right, previous_width, glyph.width) is not None:
+                row_amount += 1
+            amount = min(amount, row_amount)
+        return amount
+
+    def render_line(self, text):
+        lines = [[] for _ in range(self.height)]
+        last = [-1] * self.height  # index of the last non-blank cell per row
+        length = 0
+        previous_width = 0
+        for char in text:
+            glyph = self.glyphs.get(char)
+            if glyph is None:
+                continue
+            amount = self._overlap(lines, last, length, glyph, previous_width)
+            start = length - amount
+            for row in range(self.height):
+                line = lines[row]
+                cells = glyph.rows[row]
+                for k in range(min(amount, len(cells))):
+                    column = start + k
+                    if 0 <= column < len(line):
+                        line[column] = self.smush(line[column], cells[k], previous_width, glyph.width)
+                line.extend(cells[amount:])
+                if glyph.trail[row] < len(cells):
+                    last[row] = max(last[row], start + len(cells) - 1 - glyph.trail[row])
+            length = len(lines[0])
+            previous_width = glyph.width
+        return ["".join(line).replace(self.hardblank, " ") for line in lines]
+
+    def render(self, text):
+        rows = []
+        for line in text.split("\n"):
+            rows.extend(self.render_line(line))
+        return rows
+
+def _parse_code(token):
+    try:
+        if token.lower().startswith(("0x", "-0x")):
+            return int(token, 16)
+        if token.startswith("0") and len(token) > 1:
+            return int(token, 8)
+        return int(token)
+    except ValueError:
+        return None
+
+def list_fonts():
+    if not os.path.isdir(FONT_DIR):
+        return []
+    return sorted(name[:-4] for name in os.listdir(FONT_DIR) if name.endswith(".flf"))
+
+@lru_cache(maxsize=None)
+def load_font(name=DEFAULT_FONT):
+    """Parse fonts/<name>.flf into a glyph atlas (once per process)."""
+    if not FONT_NAME.match(name):
+        raise ValueError(f"Invalid font name: {name!r}")
+    path = os.path.join(FONT_DIR, f"{name}.flf")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Font not found: {name}")
+    with open(path, encoding="latin-1") as f:
+        return FigletFont.parse(name, f.read())
+
+@lru_cache(maxsize=512)
+def render_banner(text, font=DEFAULT_FONT):
+    """Render text as a banner; returns a tuple of lines (cached)."""
+    return tuple(load_font(font).render(text))
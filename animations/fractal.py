@@ -0,0 +1,252 @@
+# animations/fractal.py
+"""
+Escape-time fractal zooms: the Mandelbrot set and Julia sets.
+
+Every frame is a grid of escape times (smoothed iteration counts) mapped to
+a glyph ramp. Iterations run on whole arrays of points at once, dropping
+points from the arrays as they escape, and points inside the Mandelbrot
+set's main cardioid and period-2 bulb are recognised without iterating.
+
+Successive frames of a zoom overlap almost entirely, so each frame starts
+from the previous one (as in XaoS): a column of the new grid reuses the
+old column whose x coordinate is within REUSE_TOLERANCE of a cell of it,
+and likewise for rows. A reused row or column keeps the exact coordinate
+its values were computed at, so the error never grows past the tolerance
+however long the zoom runs. Only cells missing a row or column match are
+iterated; when the zoom deepens and the iteration limit rises, points
+that had not escaped yet are iterated again.
+
+The cells left to compute are split into tiles, handed to a process pool
+when a frame is expensive enough to be worth it.
+
+    python -m animations.fractal --bench    # cache and pool against plain rendering
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from animations.quality import FULL
+
+WIDTH = 70
+HEIGHT = 30
+CELL_ASPECT = 0.5  # terminal cells are about twice as tall as wide
+HALF_WIDTH = 1.6  # of the view before zooming in
+BASE_ITERATIONS = 64
+ITERATIONS_PER_DECADE = 160  # extra iterations for every 10x of zoom
+BAILOUT = 256.0  # escape radius; large so smoothed counts are accurate
+INSIDE = -1.0  # escape time of points that never escaped
+REUSE_TOLERANCE = 0.5  # of a cell: how far a reused row or column may sit from its place
+TILE_POINTS = 4096  # points per pool task
+POOL_MIN_WORK = 2_000_000  # point-iterations in a frame before tiles go to the pool
+RAMP = " .,:;-=+*#%@"
+INSIDE_GLYPH = "█"
+
+# === Escape time ===
+def escape_time(x, y, max_iter, julia=None):
+    """
+    Smoothed escape times of the points x + iy (INSIDE if they never escape
+    within `max_iter`): of z -> z^2 + c from z = 0 with c the point, or, for a
+    Julia set, from z = the point with c = `julia`.
+    """
+    shape = np.shape(x)
+    x, y = np.ravel(x), np.ravel(y)
+    points = x + 1j * y
+    counts = np.full(points.shape, INSIDE)
+    index = np.arange(points.size)
+    if julia is None:
+        # Main cardioid and period-2 bulb: inside, no need to iterate
+        q = (x - 0.25) ** 2 + y ** 2
+        known = (q * (q + (x - 0.25)) <= 0.25 * y ** 2) | ((x + 1) ** 2 + y ** 2 <= 0.0625)
+        index = index[~known]
+        c = points[index]
+        z = c.copy()
+    else:
+        c = complex(*julia)
+        z = points.copy()
+    for i in range(max_iter):
+        size = z.real ** 2 + z.imag ** 2
+        escaped = size > BAILOUT ** 2
+        if escaped.any():
+            counts[index[escaped]] = i + 1 - np.log2(0.5 * np.log(size[escaped]))
+            kept = ~escaped
+            index, z = index[kept], z[kept]
+            if julia is None:
+                c = c[kept]
+            if not index.size:
+                break
+        z = z * z + c
+    return counts.reshape(shape)
+
+def _tile(x, y, max_iter, julia):
+    return escape_time(x, y, max_iter, julia)
+
+@lru_cache(maxsize=None)
+def _executor(workers):
+    # forkserver: the web server is multi-threaded, which makes plain fork unsafe
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(method))
+
+def compute(x, y, max_iter, julia=None, workers=None):
+    """Escape times of flat point arrays, tiled over a process pool when it pays."""
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or x.size <= TILE_POINTS or x.size * max_iter < POOL_MIN_WORK:
+        return escape_time(x, y, max_iter, julia)
+    pool = _executor(workers)
+    futures = [pool.submit(_tile, x[i:i + TILE_POINTS], y[i:i + TILE_POINTS], max_iter, julia)
+               for i in range(0, x.size, TILE_POINTS)]
+    return np.concatenate([future.result() for future in futures])
+
+# === Reprojection ===
+def _match(old, new, tolerance):
+    """
+    For each new coordinate, the index of the old coordinate nearest to it
+    if that is within `tolerance`, else -1. Each old coordinate is matched
+    at most once, to the new one closest to it.
+    """
+    order = np.argsort(old)
+    ordered = old[order]
+    right = np.clip(np.searchsorted(ordered, new), 1, len(old) - 1)
+    nearest = np.where(new - ordered[right - 1] <= ordered[right] - new, right - 1, right)
+    distance = np.abs(ordered[nearest] - new)
+    match = np.where(distance <= tolerance, order[nearest], -1)
+    ranked = np.lexsort((distance, match))
+    taken = match[ranked]
+    repeated = (taken[1:] == taken[:-1]) & (taken[1:] >= 0)
+    match[ranked[1:][repeated]] = -1
+    return match
+
+class ZoomCache:
+    """The previous frame's escape times, with the coordinates they were computed at."""
+
+    def __init__(self):
+        self.xs = None
+        self.ys = None
+        self.counts = None
+        self.max_iter = 0
+        self.reused = 0
+        self.computed = 0
+
+    def frame(self, xs, ys, step, max_iter, julia=None, workers=None):
+        """Escape times of the grid of columns `xs` and rows `ys`, `step` apart."""
+        counts = np.full((len(ys), len(xs)), np.nan)
+        if self.counts is not None:
+            columns = _match(self.xs, xs, REUSE_TOLERANCE * step[0])
+            rows = _match(self.ys, ys, REUSE_TOLERANCE * step[1])
+            xs = np.where(columns >= 0, self.xs[np.maximum(columns, 0)], xs)
+            ys = np.where(rows >= 0, self.ys[np.maximum(rows, 0)], ys)
+            row_hit, column_hit = np.nonzero(rows >= 0)[0], np.nonzero(columns >= 0)[0]
+            old = self.counts[np.ix_(rows[row_hit], columns[column_hit])]
+            if max_iter > self.max_iter:
+                old = np.where(old == INSIDE, np.nan, old)  # may escape with more iterations
+            counts[np.ix_(row_hit, column_hit)] = old
+        missing = np.isnan(counts)
+        grid_x, grid_y = np.meshgrid(xs, ys)
+        counts[missing] = compute(grid_x[missing], grid_y[missing], max_iter, julia, workers)
+        self.reused += counts.size - int(missing.sum())
+        self.computed += int(missing.sum())
+        self.xs, self.ys, self.counts, self.max_iter = xs, ys, counts, max_iter
+        return counts
+
+# === Rendering ===
+_RAMP_CODES = np.array([ord(glyph) for glyph in RAMP], dtype=np.uint32)
+
+def render(counts):
+    """Glyphs by escape time on a log scale, from the fastest to the slowest escape in view."""
+    height, width = counts.shape
+    codes = np.full((height, width + 1), 10, dtype=np.uint32)
+    escaped = counts[counts != INSIDE]
+    low, high = (escaped.min(), escaped.max()) if escaped.size else (0.0, 0.0)
+    shade = np.log1p(np.clip(counts - low, 0, None)) / np.log1p(max(high - low, 1e-9))
+    steps = np.minimum((shade * len(RAMP)).astype(np.int64), len(RAMP) - 1)
+    codes[:, :width] = np.where(counts == INSIDE, ord(INSIDE_GLYPH), _RAMP_CODES[steps])
+    return codes.tobytes().decode("utf-32-le")[:-1]
+
+def view(target, scale, width, height):
+    """Column and row coordinates of a view centered on `target`, zoomed in `scale` times."""
+    step_x = 2 * HALF_WIDTH / scale / width
+    step_y = step_x / CELL_ASPECT
+    xs = target[0] + (np.arange(width) - (width - 1) / 2) * step_x
+    ys = target[1] - (np.arange(height) - (height - 1) / 2) * step_y
+    return xs, ys, (step_x, step_y)
+
+def iterations(scale):
+    return int(BASE_ITERATIONS + ITERATIONS_PER_DECADE * np.log10(scale))
+
+def iter_zoom(target, depth, julia=None, frames=120, quality=FULL, cache=True, workers=None):
+    """
+    Yield the frames of a zoom towards `target` (x, y) that ends `depth`
+    times magnified. Zooming in multiplies the scale by the same factor
+    every frame. With `julia` = (x, y), draws that Julia set instead.
+    """
+    width, height = quality.size(WIDTH, HEIGHT)
+    frames = max(2, quality.frames(frames))
+    zoom = ZoomCache()
+    for frame in range(frames):
+        scale = depth ** (frame / (frames - 1))
+        xs, ys, step = view(target, scale, width, height)
+        if not cache:
+            zoom = ZoomCache()
+        yield render(zoom.frame(xs, ys, step, iterations(scale), julia, workers))
+
+def zoom_frames(target, depth, julia=None, seed=None, quality=FULL):
+    """Create the frames of a fractal zoom (scalable, see animations/quality.py)"""
+    return list(iter_zoom(target, depth, julia, quality=quality))
+
+# === Benchmark ===
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench(target=(-0.743643887037151, 0.131825904205330), depth=1e6, repeat=3):
+    """Time a Mandelbrot zoom with and without reprojection, serial and on the pool."""
+    cache = ZoomCache()
+
+    def counted():
+        cache.__init__()
+        for xs, ys, step, max_iter in views:
+            cache.frame(xs, ys, step, max_iter, workers=1)
+
+    for width, height, frames in ((70, 30, 120), (280, 120, 120)):
+        views = []
+        for frame in range(frames):
+            scale = depth ** (frame / (frames - 1))
+            views.append(view(target, scale, width, height) + (iterations(scale),))
+        full = best_time(lambda: [compute(*np.meshgrid(*v[:2]), v[3], workers=1) for v in views], repeat)
+        reused = best_time(counted, repeat)
+        share = cache.reused / (cache.reused + cache.computed)
+        print(f"{width}x{height}, {frames} frames to {depth:g}x: full {full * 1000 / frames:.1f} ms/frame, "
+              f"reprojected {reused * 1000 / frames:.1f} ms/frame ({share:.0%} of cells reused)")
+    workers = os.cpu_count() or 1
+    x, y = np.meshgrid(*view(target, depth, 1024, 512)[:2])
+    serial = best_time(lambda: escape_time(x.ravel(), y.ravel(), iterations(depth)), 1)
+    if workers > 1:
+        _executor(workers).submit(int).result()  # start the pool
+        pooled = best_time(lambda: compute(x.ravel(), y.ravel(), iterations(depth), workers=workers), 1)
+        print(f"1024x512 tile grid: serial {serial:.2f}s, {workers} processes {pooled:.2f}s")
+    else:
+        print(f"1024x512 tile grid: serial {serial:.2f}s (1 CPU, pool not used)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark fractal zoom rendering")
+    parser.add_argument("--bench", action="store_true", help="Reprojection and pool against plain rendering")
+    parser.add_argument("--depth", type=float, default=1e6)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    if not args.bench:
+        parser.print_help()
+        return 0
+    bench(depth=args.depth, repeat=args.repeat)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,527 @@
+# animations/frame_animations.py
+"""
+Frame-list animations served by the web app.
+
+Each generator returns the complete list of frames as strings; the web
+player (and the frame stores in app.py) take it from there. Colored
+generators return StyledFrame strings that also carry per-row color spans
+(see animations/styles.py), and mostly-empty ones draw through a Scene so
+their frames also carry the few cells that change (see animations/scene.py).
+
+The gallery serves Orbital Motion, Binary Stars, Wave Pattern, DNA Helix
+and Spiral Galaxy from specs (animations/spec_animations.py); their loops
+here are the reference the specs are checked and benchmarked against.
+"""
+import math
+import random
+
+from animations.ascii_animations import get_ascii_arts
+from animations.quality import FULL
+from animations.scene import Scene
+from animations.styles import COLOR, FIRE_GRADIENT, MATRIX_GRADIENT, gradient, styled_frame
+
+def create_orbital_animation(seed=None):
+    """Create orbital motion animation frames"""
+    rng = random.Random(seed)
+    frames = []
+    width, height = 30, 15
+    # Central star
+    scene = Scene(width, height, background={(width//2, height//2): "★"})
+    
+    for i in range(60):
+        cells = {}
+        
+        # Planet orbit
+        angle = i * 0.2
+        x = int(width // 2 + 10 * math.cos(angle))
+        y = int(height // 2 + 6 * math.sin(angle))
+        
+        if 0 <= y < height and 0 <= x < width:
+            cells[x, y] = "◉"
+        
+        # Add some stars
+        for _ in range(8):
+            sx = rng.randint(0, width-1)
+            sy = rng.randint(0, height-1)
+            if scene.is_blank(cells, sx, sy):
+                cells[sx, sy] = "·"
+        
+        frames.append(scene.frame(cells))
+    
+    return frames
+
+def create_binary_stars_animation(seed=None):
+    """Create binary stars animation frames"""
+    rng = random.Random(seed)
+    frames = []
+    width, height = 35, 18
+    
+    for i in range(80):
+        grid = [[" " for _ in range(width)] for _ in range(height)]
+        
+        # Binary star system
+        angle = i * 0.15
+        r = 8
+        
+        # Star 1
+        x1 = int(width//2 + r * math.cos(angle))
+        y1 = int(height//2 + r * math.sin(angle))
+        
+        # Star 2
+        x2 = int(width//2 + r * math.cos(angle + math.pi))
+        y2 = int(height//2 + r * math.sin(angle + math.pi))
+        
+        if 0 <= y1 < height and 0 <= x1 < width:
+            grid[y1][x1] = "⊛"
+        if 0 <= y2 < height and 0 <= x2 < width:
+            grid[y2][x2] = "⊗"
+            
+        # Center of mass
+        grid[height//2][width//2] = "●"
+        
+        # Background stars
+        for _ in range(12):
+            sx = rng.randint(0, width-1)
+            sy = rng.randint(0, height-1)
+            if grid[sy][sx] == " ":
+                grid[sy][sx] = rng.choice(["·", "∘", "•"])
+        
+        frame = "\n".join("".join(row) for row in grid)
+        frames.append(frame)
+    
+    return frames
+
+def create_matrix_rain_animation(seed=None):
+    """Create Matrix rain animation frames"""
+    rng = random.Random(seed)
+    frames = []
+    width, height = 60, 20
+    chars = "アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨラリルレロワヲン0123456789"
+    
+    # Initialize columns
+    columns = []
+    for x in range(width):
+        columns.append({
+            "y": rng.randint(-height, 0),
+            "speed": rng.choice([1, 2, 3]),
+            "chars": [rng.choice(chars) for _ in range(rng.randint(5, 15))],
+            "color": rng.choice(["normal", "bright"])
+        })
+    
+    for frame_num in range(100):
+        grid = [[" " for _ in range(width)] for _ in range(height)]
+        colors = [[0] * width for _ in range(height)]
+        
+        for x, col in enumerate(columns):
+            trail = len(col["chars"])
+            for i, char in enumerate(col["chars"]):
+                y = col["y"] + i
+                if 0 <= y < height:
+                    grid[y][x] = char
+                    # Brightness fades from the leading glyph up the trail
+                    if i == trail - 1:
+                        colors[y][x] = COLOR["green-head"]
+                    else:
+                        boost = 0.25 if col["color"] == "bright" else 0.0
+                        colors[y][x] = gradient(MATRIX_GRADIENT[:-1], (i + 1) / trail + boost)
+            
+            col["y"] += col["speed"]
+            if col["y"] > height + len(col["chars"]):
+                col["y"] = rng.randint(-height, -5)
+                col["speed"] = rng.choice([1, 2, 3])
+                col["chars"] = [rng.choice(chars) for _ in range(rng.randint(5, 15))]
+        
+        frames.append(styled_frame(grid, colors))
+    
+    return frames
+
+def create_bouncing_ball_animation(seed=None):
+    """Create bouncing ball animation frames"""
+    frames = []
+    width, height = 40, 20
+    x, y = width//2, height//2
+    dx, dy = 2, 1
+    
+    # Borders and corners never change
+    border = {}
+    for j in range(width):
+        border[j, 0] = "─"
+        border[j, height-1] = "─"
+    for j in range(height):
+        border[0, j] = "│"
+        border[width-1, j] = "│"
+    border[0, 0] = "┌"
+    border[width-1, 0] = "┐"
+    border[0, height-1] = "└"
+    border[width-1, height-1] = "┘"
+    scene = Scene(width, height, background=border)
+    
+    for i in range(100):
+        cells = {}
+        
+        # Move ball
+        x += dx
+        y += dy
+        
+        # Bounce off walls
+        if x <= 1 or x >= width-2:
+            dx *= -1
+        if y <= 1 or y >= height-2:
+            dy *= -1
+        
+        # Draw ball with trail
+        cells[x, y] = "●"
+        if 0 <= y-dy < height and 0 <= x-dx < width:
+            cells[x-dx, y-dy] = "○"
+        
+        frames.append(scene.frame(cells))
+    
+    return frames
+
+def create_ascii_art_reveal(art_name, seed=None, lines=None):
+    """
+    Create ASCII art reveal animation frames for a named art block, or for
+    any list of `lines` (e.g. a rendered banner) without adding it to the art file.
+    """
+    rng = random.Random(seed)
+    if lines is not None:
+        art_lines = list(lines)
+    else:
+        ascii_arts = get_ascii_arts()
+        if art_name not in ascii_arts:
+            return [f"ASCII art '{art_name}' not found"]
+        art_lines = ascii_arts[art_name]
+    
+    frames = []
+    
+    # Create chaos version first
+    chaos_chars = list("░▒▓█▄▀▐▌▆▇▉▊▋●◉✦✧*+#@")
+    chaos_grid = []
+    
+    for line in art_lines:
+        chaos_line = ""
+        for char in line:
+            if char == " ":
+                chaos_line += " "
+            else:
+                chaos_line += rng.choice(chaos_chars)
+        chaos_grid.append(chaos_line)
+    
+    # Start with chaos
+    frames.append("\n".join(chaos_grid))
+    
+    # Gradually reveal
+    positions = []
+    for row_idx, line in enumerate(art_lines):
+        for col_idx, char in enumerate(line):
+            if char != " ":
+                positions.append((row_idx, col_idx))
+    
+    rng.shuffle(positions)
+    current_grid = [list(line) for line in chaos_grid]
+    
+    # Reveal in chunks
+    chunk_size = max(1, len(positions) // 30)  # 30 frames of reveal
+    
+    for i in range(0, len(positions), chunk_size):
+        chunk = positions[i:i+chunk_size]
+        for row_idx, col_idx in chunk:
+            current_grid[row_idx][col_idx] = art_lines[row_idx][col_idx]
+        
+        frame = "\n".join("".join(row) for row in current_grid)
+        frames.append(frame)
+    
+    # Add final clean version
+    frames.append("\n".join(art_lines))
+    
+    return frames
+
+def create_image_reveal(image_name, seed=None):
+    """Create a reveal animation of an image from images/, converted to ASCII art"""
+    from animations.image_ascii import image_art
+    return create_ascii_art_reveal(image_name, seed=seed, lines=image_art(image_name))
+
+def create_devil_from_lava_animation(seed=None):
+    """Create Devil from Lava animation frames"""
+    rng = random.Random(seed)
+    frames = []
+    width, height = 50, 20
+    lava_wave = [3, 5, 4, 6, 5, 7, 6, 5, 4, 5, 6, 5, 4, 3, 4, 5, 6, 7, 6, 5]
+    
+    # Enhanced devil ASCII art
+    devil = [
+        "      ▄▄████▄▄      ",
+        "    ██▀▀    ▀▀██    ",
+        "   ██  ▄▄  ▄▄  ██   ",
+        "   ██ ████████ ██   ",
+        "    ██  ████  ██    ",
+        "     ▀██▄▄▄▄██▀     ",
+        "       ██████       ",
+        "      ▄██  ██▄      ",
+        "     ██      ██     ",
+        "    ██   ▄▄   ██    ",
+        "   ██   ████   ██   ",
+        "   ██  ██████  ██   ",
+        "    ██  ████  ██    ",
+        "     ▀█▄▄▄▄▄▄█▀     ",
+        "        ████        ",
+        "       ██  ██       "
+    ]
+    
+    devil_h, devil_w = len(devil), len(devil[0]) if devil else 0
+    center_x = width // 2 - devil_w // 2
+    
+    for frame in range(60):
+        grid = [[" " for _ in range(width)] for _ in range(height)]
+        
+        # Create dynamic lava
+        for x in range(width):
+            base_wave = lava_wave[x % len(lava_wave)]
+            wave_h = int(height - 5 - (base_wave + math.sin(frame * 0.3 + x * 0.2) * 2))
+            wave_h = max(0, min(height - 1, wave_h))
+            
+            for y in range(wave_h, height):
+                intensity = (height - y) / (height - wave_h + 1)
+                if intensity > 0.8:
+                    grid[y][x] = "█"
+                elif intensity > 0.6:
+                    grid[y][x] = "▓"
+                elif intensity > 0.4:
+                    grid[y][x] = "▒"
+                elif intensity > 0.2:
+                    grid[y][x] = "░"
+                else:
+                    grid[y][x] = rng.choice(["*", "+", "·"])
+        
+        # Devil rising from lava
+        devil_y = height - frame * 0.4
+        if devil_y < height:
+            for dr in range(devil_h):
+                gr = int(devil_y + dr)
+                if 0 <= gr < height:
+                    for dc in range(devil_w):
+                        if center_x + dc < width and devil[dr][dc] != " ":
+                            grid[gr][center_x + dc] = devil[dr][dc]
+        
+        # Add embers and sparks
+        for _ in range(8):
+            x = rng.randint(0, width - 1)
+            y = rng.randint(0, height // 2)
+            if grid[y][x] == " ":
+                grid[y][x] = rng.choice(["*", "+", "✦", "✧", "◦"])
+        
+        frame_str = "\n".join("".join(row) for row in grid)
+        frames.append(frame_str)
+    
+    return frames
+
+def create_wave_animation(seed=None):
+    """Create Wave Pattern animation frames"""
+    rng = random.Random(seed)
+    frames = []
+    width, height = 70, 20
+    
+    for frame in range(100):
+        grid = [[" " for _ in range(width)] for _ in range(height)]
+        
+        # Create multiple wave layers
+        for x in range(width):
+            # Primary wave
+            y1 = int(height // 2 + math.sin(frame * 0.15 + x * 0.1) * 4)
+            # Secondary wave
+            y2 = int(height // 2 + math.sin(frame * 0.1 + x * 0.08) * 3)
+            # Tertiary wave
+            y3 = int(height // 2 + math.sin(frame * 0.2 + x * 0.12) * 2)
+            
+            # Draw waves with different characters
+            waves = [(y1, "~"), (y2, "≈"), (y3, "∼")]
+            
+            for y, char in waves:
+                if 0 <= y < height:
+                    grid[y][x] = char
+                
+                # Add wave crests
+                if abs(math.sin(frame * 0.15 + x * 0.1)) > 0.9:
+                    if 0 <= y - 1 < height:
+                        grid[y - 1][x] = "^"
+                    if 0 <= y + 1 < height:
+                        grid[y + 1][x] = "v"
+        
+        # Add foam particles
+        for _ in range(10):
+            x = rng.randint(0, width - 1)
+            y = rng.randint(height // 3, 2 * height // 3)
+            if grid[y][x] == " ":
+                grid[y][x] = rng.choice(["·", "°", "◦", "∘"])
+        
+        frame_str = "\n".join("".join(row) for row in grid)
+        frames.append(frame_str)
+    
+    return frames
+
+def create_dna_helix_animation(seed=None):
+    """Create DNA Helix animation frames"""
+    frames = []
+    width, height = 40, 25
+    
+    for frame in range(80):
+        grid = [[" " for _ in range(width)] for _ in range(height)]
+        
+        center_x = width // 2
+        
+        # Draw the DNA double helix
+        for y in range(height):
+            # Calculate the angle for this row
+            angle = frame * 0.2 + y * 0.4
+            
+            # Left and right strands
+            x1 = int(center_x + 10 * math.cos(angle))
+            x2 = int(center_x + 10 * math.cos(angle + math.pi))
+            
+            # Draw backbone
+            if 0 <= x1 < width:
+                grid[y][x1] = "●"
+            if 0 <= x2 < width:
+                grid[y][x2] = "●"
+            
+            # Draw base pairs (connecting lines) every few rows
+            if y % 4 == 0:
+                x_min, x_max = min(x1, x2), max(x1, x2)
+                for x in range(x_min + 1, x_max):
+                    if 0 <= x < width:
+                        # Use different base pair characters
+                        if (y // 4) % 4 == 0:
+                            grid[y][x] = "─"
+                        elif (y // 4) % 4 == 1:
+                            grid[y][x] = "═"
+                        elif (y // 4) % 4 == 2:
+                            grid[y][x] = "⋯"
+                        else:
+                            grid[y][x] = "┅"
+                
+                # Add base letters at connection points
+                mid_x = (x1 + x2) // 2
+                if 0 <= mid_x < width:
+                    bases = ["A", "T", "G", "C"]
+                    grid[y][mid_x] = bases[(y // 4) % 4]
+        
+        frame_str = "\n".join("".join(row) for row in grid)
+        frames.append(frame_str)
+    
+    return frames
+
+def create_spiral_galaxy_animation(seed=None):
+    """Create Spiral Galaxy animation frames"""
+    rng = random.Random(seed)
+    frames = []
+    width, height = 60, 30
+    
+    for frame in range(120):
+        grid = [[" " for _ in range(width)] for _ in range(height)]
+        
+        cx, cy = width // 2, height // 2
+        
+        # Create spiral arms
+        for arm in range(4):
+            arm_offset = arm * math.pi / 2
+            
+            # Draw spiral arm
+            for r in range(1, min(width // 2, height)):
+                angle = arm_offset + frame * 0.05 + r * 0.2
+                
+                # Calculate position
+                x = int(cx + r * math.cos(angle))
+                y = int(cy + r * math.sin(angle) * 0.6)  # Flatten vertically
+                
+                if 0 <= x < width and 0 <= y < height:
+                    # Distance from center affects brightness
+                    distance = math.sqrt((x - cx) ** 2 + (y - cy) ** 2)
+                    
+                    if distance < 3:
+                        grid[y][x] = "◯"  # Core
+                    elif distance < 8:
+                        grid[y][x] = "●"  # Inner spiral
+                    elif distance < 15:
+                        grid[y][x] = "◉"  # Mid spiral
+                    else:
+                        grid[y][x] = rng.choice(["○", "*", "·", "✦"])
+        
+        # Add background stars
+        for _ in range(30):
+            x = rng.randint(0, width - 1)
+            y = rng.randint(0, height - 1)
+            if grid[y][x] == " ":
+                grid[y][x] = rng.choice(["·", "∘", "°", "+"])
+        
+        # Add central black hole
+        if 0 <= cx < width and 0 <= cy < height:
+            grid[cy][cx] = "⬤"
+        
+        frame_str = "\n".join("".join(row) for row in grid)
+        frames.append(frame_str)
+    
+    return frames
+
+def create_fire_animation(seed=None, quality=FULL):
+    """Create Fire Effect animation frames (scalable, see animations/quality.py)"""
+    rng = random.Random(seed)
+    frames = []
+    width, height = quality.size(50, 25)
+    sparks = quality.particles(15)
+    flickers = quality.particles(width // 3)
+    
+    for frame in range(quality.frames(120)):
+        grid = [[" " for _ in range(width)] for _ in range(height)]
+        colors = [[0] * width for _ in range(height)]
+        
+        # Create fire base
+        base_height = height - 3
+        
+        for x in range(width):
+            # Create random flame height
+            flame_intensity = rng.uniform(0.6, 1.0)
+            flame_height = int(base_height * flame_intensity)
+            
+            # Add wind effect
+            wind_offset = int(math.sin(frame * 0.1 + x * 0.1) * 2)
+            
+            for y in range(height - flame_height, height):
+                actual_x = max(0, min(width - 1, x + wind_offset))
+                
+                # Distance from base affects character choice
+                distance_from_base = height - y
+                heat_intensity = distance_from_base / flame_height
+                # Hottest at the base, cooling towards the flame tips
+                colors[y][actual_x] = gradient(FIRE_GRADIENT, 1.0 - heat_intensity)
+                
+                if heat_intensity > 0.9:
+                    grid[y][actual_x] = "█"
+                elif heat_intensity > 0.7:
+                    grid[y][actual_x] = "▓"
+                elif heat_intensity > 0.5:
+                    grid[y][actual_x] = "▒"
+                elif heat_intensity > 0.3:
+                    grid[y][actual_x] = "░"
+                elif heat_intensity > 0.1:
+                    grid[y][actual_x] = rng.choice(["*", "+", "^"])
+                else:
+                    grid[y][actual_x] = rng.choice(["·", "°", "∘"])
+        
+        # Add sparks and embers
+        for _ in range(sparks):
+            x = rng.randint(0, width - 1)
+            y = rng.randint(0, height // 2)
+            if grid[y][x] == " ":
+                grid[y][x] = rng.choice(["*", "+", "✦", "✧", "◦", "°"])
+                colors[y][x] = COLOR["amber"]
+        
+        # Add flickering effect
+        for _ in range(flickers):
+            x = rng.randint(0, width - 1)
+            y = rng.randint(height // 2, height - 1)
+            grid[y][x] = rng.choice(["▄", "▀", "▌", "▐"])
+            colors[y][x] = gradient(FIRE_GRADIENT, (y + 1) / height)
+        
+        frames.append(styled_frame(grid, colors))
+    
+    return frames
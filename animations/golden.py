@@ -0,0 +1,138 @@
+# animations/golden.py
+"""
+Frame checksums and golden-frame fixtures.
+
+Every generator takes a seed, so a (key, seed) pair always renders the same
+frames. golden/<key>.json records a rolling CRC-32 per frame for a fixed
+seed, for both the web (frames) and terminal implementation of each
+animation. After rewriting a generator for speed, check that it still
+renders byte-identical output:
+
+    python -m animations.golden check          # all animations
+    python -m animations.golden check 4 9      # just Matrix Rain and Fire
+    python -m animations.golden update 9       # accept new output for key 9
+
+Checking also renders every entry with a negative seed (any integer is a
+valid seed), and entries declared deterministic in the registry with a
+second seed, failing if that changes their frames.
+"""
+import argparse
+import json
+import os
+import sys
+import zlib
+
+from animations.styles import frame_styles
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "golden")
+GOLDEN_SEED = 1234
+
+def frame_checksums(frames):
+    """
+    Rolling CRC-32 (hex): each checksum covers that frame and every frame
+    before it, including the color spans of styled frames.
+    """
+    checksums = []
+    crc = 0
+    for frame in frames:
+        crc = zlib.crc32(frame.encode("utf-8"), crc)
+        styles = frame_styles(frame)
+        if styles is not None:
+            crc = zlib.crc32(json.dumps(styles, separators=(",", ":")).encode("ascii"), crc)
+        checksums.append(f"{crc:08x}")
+    return checksums
+
+def render_checksums(key, seed=GOLDEN_SEED):
+    """Checksums of both implementations of one registry entry."""
+    from animations.asciicast import terminal_frames
+    from animations.registry import all_entries
+
+    entry = all_entries()[key]
+    result = {"name": entry.name, "seed": seed}
+    if entry.frames is not None:
+        result["frames"] = frame_checksums(entry.load("frames")(seed=seed))
+    if entry.terminal is not None:
+        frames = (frame for _, frame in terminal_frames(entry.load("terminal"), seed=seed))
+        result["terminal"] = frame_checksums(frames)
+    return result
+
+def check_negative_seed(key, seed=-GOLDEN_SEED):
+    """False if the frames implementation of `key` fails on a negative seed."""
+    from animations.registry import all_entries
+
+    entry = all_entries()[key]
+    if entry.frames is None:
+        return True
+    try:
+        entry.load("frames")(seed=seed)
+    except Exception as e:
+        print(f"❌ {key} {entry.name}: seed {seed} raises {type(e).__name__}: {e}")
+        return False
+    return True
+
+def check_deterministic(key, seed, checksums):
+    """False if `key` is declared deterministic but renders differently with another seed."""
+    from animations.registry import all_entries
+
+    entry = all_entries()[key]
+    if not entry.deterministic or entry.frames is None:
+        return True
+    if frame_checksums(entry.load("frames")(seed=seed + 1)) == checksums:
+        return True
+    print(f"❌ {key} {entry.name}: declared deterministic, but seed {seed + 1} renders different frames")
+    return False
+
+def _path(key):
+    return os.path.join(GOLDEN_DIR, f"{key}.json")
+
+def update(keys):
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    for key in keys:
+        checksums = render_checksums(key)
+        with open(_path(key), "w", encoding="utf-8") as f:
+            json.dump(checksums, f, indent=1)
+            f.write("\n")
+        print(f"📝 {key}: golden frames updated")
+    return 0
+
+def check(keys):
+    failures = 0
+    for key in keys:
+        if not os.path.exists(_path(key)):
+            print(f"⚠️  {key}: no golden file (run update)")
+            failures += 1
+            continue
+        failed_before = failures
+        with open(_path(key), encoding="utf-8") as f:
+            expected = json.load(f)
+        actual = render_checksums(key, expected["seed"])
+        for kind in ("frames", "terminal"):
+            if kind not in expected:
+                continue
+            want, got = expected[kind], actual.get(kind, [])
+            if want == got:
+                continue
+            failures += 1
+            first = next((i for i, (a, b) in enumerate(zip(want, got)) if a != b), min(len(want), len(got)))
+            print(f"❌ {key} {expected['name']} ({kind}): first differing frame {first} "
+                  f"({len(got)} frames, expected {len(want)})")
+        if not check_negative_seed(key):
+            failures += 1
+        if not check_deterministic(key, expected["seed"], actual.get("frames")):
+            failures += 1
+        if failures == failed_before:
+            print(f"✅ {key} {expected['name']}")
+    return 1 if failures else 0
+
+def main(argv=None):
+    from animations.registry import all_entries
+
+    parser = argparse.ArgumentParser(description="Check or update golden frame checksums")
+    parser.add_argument("command", choices=["check", "update"])
+    parser.add_argument("keys", nargs="*", help="Animation keys (default: all)")
+    args = parser.parse_args(argv)
+    keys = args.keys or sorted(all_entries(), key=int)
+    return check(keys) if args.command == "check" else update(keys)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+# animations/image_ascii.py
+"""
+Image to ASCII art conversion.
+
+Reads binary or plain PPM/PGM files (and PNG when Pillow is installed),
+averages the pixels under each character cell, and maps brightness to a
+glyph ramp, optionally with Floyd–Steinberg dithering. Everything works on
+whole NumPy arrays; the only Python loop per image is over row bands.
+
+Large files are converted in bands of source rows. A band only needs the
+rows under its output lines, so bands are independent: each one is
+memory-mapped straight from the file and, for big images, handed to a
+process pool. Memory stays bounded by the band size, not the image size.
+
+    python -m animations.image_ascii logo.ppm --width 60 --dither
+    python -m animations.image_ascii --bench 4000
+
+Images dropped into images/ (or $ASCII_IMAGE_DIR) appear in the gallery as
+reveal animations, next to the asciiArt.txt entries.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import multiprocessing
+
+import numpy as np
+
+from animations.registry import IMAGE_DIR
+
+RAMPS = {
+    "ascii": " .:-=+*#%@",
+    "blocks": " ░▒▓█",
+    "mixed": " .:-=+*░▒▓█",
+}
+DEFAULT_RAMP = "mixed"
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+CELL_ASPECT = 0.5          # terminal cells are about twice as tall as wide
+BAND_ROWS = 256            # source rows per band
+POOL_MIN_PIXELS = 2_000_000
+
+# === Decoding ===
+def parse_pnm_header(data):
+    """
+    Parse a PNM header from the start of `data`.
+    Returns (magic, width, height, maxval, offset of the pixel data).
+    """
+    magic = bytes(data[:2])
+    if magic not in (b"P2", b"P3", b"P5", b"P6"):
+        raise ValueError("Not a PPM/PGM image")
+    values = []
+    pos = 2
+    while len(values) < 3:
+        while pos < len(data) and data[pos:pos + 1].isspace():
+            pos += 1
+        if data[pos:pos + 1] == b"#":
+            while pos < len(data) and data[pos:pos + 1] not in (b"\n", b"\r"):
+                pos += 1
+            continue
+        start = pos
+        while pos < len(data) and data[pos:pos + 1].isdigit():
+            pos += 1
+        if start == pos:
+            raise ValueError("Malformed PPM/PGM header")
+        values.append(int(data[start:pos]))
+    width, height, maxval = values
+    if not (width > 0 and height > 0 and 0 < maxval < 65536):
+        raise ValueError("Malformed PPM/PGM header")
+    return magic, width, height, maxval, pos + 1
+
+def _pnm_layout(magic, width, height, maxval):
+    channels = 3 if magic in (b"P3", b"P6") else 1
+    shape = (height, width, 3) if channels == 3 else (height, width)
+    dtype = np.dtype(np.uint8) if maxval < 256 else np.dtype(">u2")
+    return shape, dtype
+
+def decode_pnm(data):
+    """Decode PPM/PGM bytes into (pixels, maxval); binary formats are not copied."""
+    magic, width, height, maxval, offset = parse_pnm_header(data)
+    shape, dtype = _pnm_layout(magic, width, height, maxval)
+    if magic in (b"P5", b"P6"):
+        pixels = np.frombuffer(data, dtype=dtype, count=int(np.prod(shape)), offset=offset)
+    else:
+        pixels = np.array(bytes(data[offset - 1:]).split()[:int(np.prod(shape))], dtype=np.uint16)
+    return pixels.reshape(shape), maxval
+
+def decode_png(data):
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ValueError("PNG support needs Pillow (pip install Pillow)") from None
+    import io
+
+    image = Image.open(io.BytesIO(data))
+    image = image.convert("RGB" if image.mode not in ("L", "I;16") else image.mode)
+    pixels = np.asarray(image)
+    return pixels, 65535 if pixels.dtype == np.uint16 else 255
+
+def decode_image(data):
+    """Decode image bytes (PPM, PGM or PNG) into (pixels, maxval)."""
+    if bytes(data[:8]) == b"\x89PNG\r\n\x1a\n":
+        return decode_png(data)
+    return decode_pnm(data)
+
+# === Area averaging ===
+def _area_mean(values, edges, axis):
+    """
+    Average `values` over the cells between consecutive `edges` (fractional
+    source coordinates) along `axis`, weighting partly covered pixels by the
+    covered fraction. Uses one cumulative sum, so any scale factor costs the same.
+    """
+    n = values.shape[axis]
+    csum = np.cumsum(values, axis=axis, dtype=np.float64)
+    index = np.minimum(np.floor(edges).astype(np.intp), n - 1)
+    frac = edges - index
+    shape = [1] * values.ndim
+    shape[axis] = len(edges)
+    frac = frac.reshape(shape)
+    # Sum of everything left of each edge: full pixels up to `index`, minus
+    # the part of pixel `index` that lies right of the edge
+    below = np.take(csum, index, axis=axis) - (1 - frac) * np.take(values, index, axis=axis)
+    widths = np.diff(edges).reshape([len(edges) - 1 if i == axis else 1 for i in range(values.ndim)])
+    return np.diff(below, axis=axis) / widths
+
+def cell_brightness(pixels, x_edges, y_edges, maxval):
+    """Brightness (0..1) of the output cells covering one band of source rows."""
+    if pixels.ndim == 3:
+        # Luminance is linear, so converting first gives the same cell averages
+        # while the cumulative sums only see one channel
+        pixels = pixels @ LUMA
+    cells = _area_mean(pixels, x_edges, axis=1)
+    cells = _area_mean(cells, y_edges, axis=0)
+    return cells / maxval
+
+def _bands(height, y_edges):
+    """Split output rows into (first, last) ranges spanning about BAND_ROWS source rows."""
+    out_rows = len(y_edges) - 1
+    per_band = max(1, int(BAND_ROWS * out_rows / height))
+    return [(r, min(r + per_band, out_rows)) for r in range(0, out_rows, per_band)]
+
+def _band_job(pixels, maxval, x_edges, y_edges, rows):
+    first, last = rows
+    top = int(np.floor(y_edges[first]))
+    bottom = min(pixels.shape[0], int(np.ceil(y_edges[last])))
+    return cell_brightness(pixels[top:bottom], x_edges, y_edges[first:last + 1] - top, maxval)
+
+def _file_band(path, offset, shape, dtype, maxval, x_edges, y_edges, rows):
+    """Process-pool task: memory-map the image file and convert one band."""
+    pixels = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+    return _band_job(pixels, maxval, x_edges, y_edges, rows)
+
+@lru_cache(maxsize=None)
+def _executor(workers):
+    # forkserver: the web server is multi-threaded, which makes plain fork unsafe
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else None
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(method))
+
+def output_size(width, height, columns, aspect=CELL_ASPECT):
+    columns = max(1, min(columns, width))
+    return columns, max(1, round(height / width * columns * aspect))
+
+def image_brightness(source, columns=80, aspect=CELL_ASPECT, workers=None):
+    """
+    Area-averaged brightness (rows x columns array, 0..1) of an image path or
+    image bytes. Large binary PPM/PGM files are converted by a process pool.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        pixels, maxval = decode_image(source)
+        path = None
+    else:
+        path = source
+        with open(path, "rb") as f:
+            head = f.read(4096)
+        if head[:2] in (b"P5", b"P6"):
+            magic, width, height, maxval, offset = parse_pnm_header(head)
+            shape, dtype = _pnm_layout(magic, width, height, maxval)
+            pixels = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+        else:
+            with open(path, "rb") as f:
+                pixels, maxval = decode_image(f.read())
+            path = None
+
+    height, width = pixels.shape[:2]
+    out_w, out_h = output_size(width, height, columns, aspect)
+    x_edges = np.linspace(0, width, out_w + 1)
+    y_edges = np.linspace(0, height, out_h + 1)
+    bands = _bands(height, y_edges)
+
+    workers = workers or os.cpu_count() or 1
+    if path is not None and workers > 1 and len(bands) > 1 and width * height >= POOL_MIN_PIXELS:
+        pool = _executor(workers)
+        futures = [
+            pool.submit(_file_band, path, offset, shape, dtype, maxval, x_edges, y_edges, rows)
+            for rows in bands
+        ]
+        parts = [future.result() for future in futures]
+    else:
+        parts = [_band_job(pixels, maxval, x_edges, y_edges, rows) for rows in bands]
+    return np.vstack(parts)
+
+# === Glyph mapping ===
+def floyd_steinberg(values, levels):
+    """
+    Quantize 0..1 values to `levels` evenly spaced levels with Floyd–Steinberg
+    error diffusion, returning level indices.
+
+    A pixel only depends on its left neighbour and the three pixels above, so
+    every pixel on the line x + 2y = t can be processed at once: one vectorized
+    step per anti-diagonal instead of one Python step per pixel.
+    """
+    image = values.astype(np.float64)
+    height, width = image.shape
+    result = np.empty((height, width), dtype=np.intp)
+    scale = levels - 1
+    for t in range(width + 2 * (height - 1)):
+        ys = np.arange(max(0, (t - width + 2) // 2), min(height - 1, t // 2) + 1)
+        xs = t - 2 * ys
+        old = image[ys, xs]
+        quantized = np.clip(np.rint(old * scale), 0, scale)
+        result[ys, xs] = quantized
+        error = old - quantized / scale
+        right = xs + 1 < width
+        image[ys[right], xs[right] + 1] += error[right] * (7 / 16)
+        below = ys + 1 < height
+        ys, xs, error = ys[below] + 1, xs[below], error[below]
+        left = xs > 0
+        image[ys[left], xs[left] - 1] += error[left] * (3 / 16)
+        image[ys, xs] += error * (5 / 16)
+        right = xs + 1 < width
+        image[ys[right], xs[right] + 1] += error[right] * (1 / 16)
+    return result
+
+def ramp_glyphs(ramp):
+    """Glyphs of a ramp given by name (see RAMPS) or as a literal string."""
+    glyphs = RAMPS.get(ramp, ramp)
+    if len(glyphs) < 2:
+        raise ValueError("A glyph ramp needs at least two characters")
+    return glyphs
+
+def ramp_levels(brightness, levels, dither=False):
+    """Ramp index (0..levels-1) for every cell of a 0..1 brightness array."""
+    if dither:
+        return floyd_steinberg(brightness, levels)
+    return np.minimum((np.clip(brightness, 0, 1) * levels).astype(np.intp), levels - 1)
+
+def glyph_rows(index, glyphs):
+    """
+    Turn a 2-D array of ramp indices into one string per row without a
+    Python loop over cells: the code points are laid out as UTF-32 and
+    viewed as fixed-width numpy strings.
+    """
+    codes = np.array([ord(glyph) for glyph in glyphs], dtype=np.uint32)[index]
+    return np.ascontiguousarray(codes).view(f"<U{index.shape[1]}").ravel().tolist()
+
+def brightness_to_lines(brightness, ramp=DEFAULT_RAMP, dither=False, invert=False):
+    """Map a brightness array onto a glyph ramp (name from RAMPS or a literal string)."""
+    glyphs = ramp_glyphs(ramp)
+    if invert:
+        brightness = 1.0 - brightness
+    index = ramp_levels(brightness, len(glyphs), dither)
+    return [row.rstrip() for row in glyph_rows(index, glyphs)]
+
+def image_to_ascii(source, columns=80, ramp=DEFAULT_RAMP, dither=False, invert=False, workers=None):
+    """Convert an image path or image bytes into a list of ASCII art lines."""
+    return brightness_to_lines(image_brightness(source, columns, workers=workers), ramp, dither, invert)
+
+# === Gallery images ===
+def image_path(image_name):
+    return os.path.join(IMAGE_DIR, image_name)
+
+@lru_cache(maxsize=32)
+def _cached_art(path, mtime, columns):
+    return tuple(image_to_ascii(path, columns, dither=True))
+
+def image_art(image_name, columns=80):
+    """Art lines for a file in images/, converted once per file version."""
+    path = image_path(image_name)
+    return list(_cached_art(path, os.path.getmtime(path), columns))
+
+# === Command line ===
+def _synthetic_ppm(path, size):
+    """Write a size x size test image: radial gradient with a diagonal stripe."""
+    y, x = np.mgrid[0:size, 0:size].astype(np.float32) / size
+    red = np.hypot(x - 0.5, y - 0.5) * 2
+    green = (np.abs(x - y) < 0.1).astype(np.float32)
+    blue = x
+    pixels = (np.clip(np.dstack([red, green, blue]), 0, 1) * 255).astype(np.uint8)
+    with open(path, "wb") as f:
+        f.write(f"P6\n{size} {size}\n255\n".encode("ascii"))
+        f.write(pixels.tobytes())
+
+def bench(size, columns, workers):
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.ppm")
+        _synthetic_ppm(path, size)
+        image_to_ascii(path, columns, workers=workers)  # warm up the pool and page cache
+        timings = []
+        for dither in (False, True):
+            start = time.perf_counter()
+            lines = image_to_ascii(path, columns, dither=dither, workers=workers)
+            timings.append((dither, time.perf_counter() - start))
+    for dither, seconds in timings:
+        label = "dithered" if dither else "plain"
+        print(f"⏱️  {size}x{size} -> {columns}x{len(lines)} {label}: {seconds * 1000:.1f} ms "
+              f"({workers or os.cpu_count()} workers)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert an image to ASCII art")
+    parser.add_argument("image", nargs="?", help="PPM/PGM (or PNG with Pillow) file")
+    parser.add_argument("--width", "-w", type=int, default=80, help="Output columns")
+    parser.add_argument("--ramp", default=DEFAULT_RAMP,
+                        help=f"Glyph ramp, dark to bright: {', '.join(RAMPS)} or a literal string")
+    parser.add_argument("--dither", action="store_true", help="Floyd–Steinberg dithering")
+    parser.add_argument("--invert", action="store_true", help="Dark pixels get the dense glyphs")
+    parser.add_argument("--workers", type=int, help="Process pool size (default: CPU count)")
+    parser.add_argument("--bench", type=int, metavar="SIZE", help="Time a SIZE x SIZE synthetic image")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        bench(args.bench, args.width, args.workers)
+        return 0
+    if not args.image:
+        parser.error("an image is required (or --bench SIZE)")
+    try:
+        lines = image_to_ascii(args.image, args.width, args.ramp, args.dither, args.invert, args.workers)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    print("\n".join(lines))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,9 @@ import math
 import random
 import sys
 
+from animations.registry import AnimationMap
+from animations.styles import COLOR, FIRE_GRADIENT, MATRIX_GRADIENT, gradient, print_frame, styled_frame
+
 def clear():
     # For web interface compatibility
     print("CLEAR_SCREEN")  # This will be caught by our web handler
@@ -14,7 +17,7 @@ def web_safe_sleep(duration):
     time.sleep(min(duration, 0.2))  # Cap sleep time for better web responsiveness
 
 # === Orbital Motion ===
-def animate_orbit():
+def animate_orbit(seed=None):
     width, height = 20, 10
     for i in range(40):
         clear()
@@ -29,7 +32,7 @@ def animate_orbit():
         web_safe_sleep(0.15)
 
 # === Binary Stars ===
-def animate_binary_stars():
+def animate_binary_stars(seed=None):
     width, height = 25, 12
     for i in range(40):
         clear()
@@ -49,7 +52,8 @@ def animate_binary_stars():
         web_safe_sleep(0.12)
 
 # === Devil rising from Lava ===
-def animate_devil_from_lava():
+def animate_devil_from_lava(seed=None):
+    rng = random.Random(seed)
     width, height = 40, 12
     lava_wave = [3,5,4,6,5,7,6,5,4,5,6,5,4,3,4,5,6,7,6,5]
     devil = [
@@ -74,7 +78,7 @@ def animate_devil_from_lava():
             wave_h = int(10 - (lava_wave[x % len(lava_wave)] + math.sin(frame*0.3 + x*0.2)*1.5))
             wave_h = max(0, min(height-1, wave_h))
             for y in range(wave_h, height):
-                grid[y][x] = random.choice(["█","▓","▒","░","*"])
+                grid[y][x] = rng.choice(["█","▓","▒","░","*"])
         # devil rising
         dy = height + 10 - frame*1.5
         if dy < height:
@@ -87,41 +91,45 @@ def animate_devil_from_lava():
                             grid[int(gr)][center_x+dc] = ch
         # embers
         for _ in range(5):
-            x = random.randint(0,width-1)
-            y = random.randint(0,height//2)
-            grid[y][x] = random.choice(["*","+","✦"])
+            x = rng.randint(0,width-1)
+            y = rng.randint(0,height//2)
+            grid[y][x] = rng.choice(["*","+","✦"])
         print("\n".join("".join(row) for row in grid))
         web_safe_sleep(0.15)
 
 # === Matrix Rain ===
-def animate_matrix_rain():
+def animate_matrix_rain(seed=None):
+    rng = random.Random(seed)
     width, height = 50, 15
     chars = "アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨラリルレロワヲン0123456789"
     columns = []
     for x in range(width):
         columns.append({
-            "y": random.randint(-height,0),
-            "speed": random.choice([1,2,3]),
-            "chars": [random.choice(chars) for _ in range(random.randint(5,15))]
+            "y": rng.randint(-height,0),
+            "speed": rng.choice([1,2,3]),
+            "chars": [rng.choice(chars) for _ in range(rng.randint(5,15))]
         })
     for frame in range(80):
         clear()
         grid = [[" " for _ in range(width)] for _ in range(height)]
+        colors = [[0]*width for _ in range(height)]
         for x,col in enumerate(columns):
+            trail = len(col["chars"])
             for i,char in enumerate(col["chars"]):
                 y = col["y"]+i
                 if 0 <= y < height:
                     grid[y][x] = char
+                    colors[y][x] = COLOR["green-head"] if i == trail-1 else gradient(MATRIX_GRADIENT[:-1], (i+1)/trail)
             col["y"] += col["speed"]
             if col["y"] > height+len(col["chars"]):
-                col["y"] = random.randint(-height,-5)
-                col["speed"] = random.choice([1,2,3])
-                col["chars"] = [random.choice(chars) for _ in range(random.randint(5,15))]
-        print("\n".join("".join(row) for row in grid))
+                col["y"] = rng.randint(-height,-5)
+                col["speed"] = rng.choice([1,2,3])
+                col["chars"] = [rng.choice(chars) for _ in range(rng.randint(5,15))]
+        print_frame(styled_frame(grid, colors))
         web_safe_sleep(0.08)
 
 # === Bouncing Ball ===
-def animate_bouncing_ball():
+def animate_bouncing_ball(seed=None):
     width, height = 30, 12
     x, y = width//2, height//2
     dx, dy = 1, 1
@@ -144,7 +152,8 @@ def animate_bouncing_ball():
         web_safe_sleep(0.08)
 
 # === Wave Pattern ===
-def animate_wave():
+def animate_wave(seed=None):
+    rng = random.Random(seed)
     width, height = 60, 15
     for frame in range(80):
         clear()
@@ -155,12 +164,12 @@ def animate_wave():
             y3 = int(height//2 + math.sin(frame*0.2 + x*0.15)*1.5)
             for y in [y1, y2, y3]:
                 if 0 <= y < height: 
-                    grid[y][x] = random.choice(["~","≈","∼"])
+                    grid[y][x] = rng.choice(["~","≈","∼"])
         print("\n".join("".join(row) for row in grid))
         web_safe_sleep(0.08)
 
 # === DNA Helix ===
-def animate_dna_helix():
+def animate_dna_helix(seed=None):
     width, height = 30, 15
     for frame in range(60):
         clear()
@@ -182,7 +191,8 @@ def animate_dna_helix():
         web_safe_sleep(0.12)
 
 # === Spiral Galaxy ===
-def animate_spiral_galaxy():
+def animate_spiral_galaxy(seed=None):
+    rng = random.Random(seed)
     width, height = 50, 20
     for frame in range(100):
         clear()
@@ -195,18 +205,19 @@ def animate_spiral_galaxy():
                 x = int(cx + r*math.cos(angle))
                 y = int(cy + r*math.sin(angle)*0.5)
                 if 0 <= x < width and 0 <= y < height:
-                    grid[y][x] = random.choice(["●","◉","○","*","·","+","✦"])
+                    grid[y][x] = rng.choice(["●","◉","○","*","·","+","✦"])
         grid[cy][cx] = "◯"
         for _ in range(20):
-            x = random.randint(0, width-1)
-            y = random.randint(0, height-1)
+            x = rng.randint(0, width-1)
+            y = rng.randint(0, height-1)
             if grid[y][x] == " ": 
-                grid[y][x] = random.choice(["·","‧","∘"])
+                grid[y][x] = rng.choice(["·","‧","∘"])
         print("\n".join("".join(row) for row in grid))
         web_safe_sleep(0.1)
 
 # === Fire Effect ===
-def animate_fire():
+def animate_fire(seed=None):
+    rng = random.Random(seed)
     width, height = 40, 20
     fire_chars = ["░", "▒", "▓", "█", "*", "+", "^", "~"]
     colors = [" ", ".", ":", "*", "o", "O", "#", "█"]
@@ -214,10 +225,11 @@ def animate_fire():
     for frame in range(100):
         clear()
         grid = [[" " for _ in range(width)] for _ in range(height)]
+        heat = [[0]*width for _ in range(height)]
         
         # Generate fire base
         for x in range(width):
-            intensity = random.uniform(0.5, 1.0)
+            intensity = rng.uniform(0.5, 1.0)
             fire_height = int(height * intensity)
             
             for y in range(height - fire_height, height):
@@ -225,25 +237,44 @@ def animate_fire():
                 char_index = min(len(colors) - 1, 
                                int(distance_from_base * len(colors) / fire_height))
                 grid[y][x] = colors[char_index]
+                heat[y][x] = gradient(FIRE_GRADIENT, 1 - distance_from_base / fire_height)
         
         # Add flickering
         for _ in range(width // 2):
-            x = random.randint(0, width - 1)
-            y = random.randint(height // 2, height - 1)
-            grid[y][x] = random.choice(fire_chars)
+            x = rng.randint(0, width - 1)
+            y = rng.randint(height // 2, height - 1)
+            grid[y][x] = rng.choice(fire_chars)
+            heat[y][x] = gradient(FIRE_GRADIENT, (y+1) / height)
         
-        print("\n".join("".join(row) for row in grid))
+        print_frame(styled_frame(grid, heat))
+        web_safe_sleep(0.1)
+
+# === N-Body Gravity ===
+def animate_nbody(preset, seed=None):
+    from animations.nbody import iter_nbody  # NumPy is only imported when a preset plays
+
+    for frame in iter_nbody(preset, seed):
+        clear()
+        print(frame)
+        web_safe_sleep(0.1)
+
+def animate_automaton(preset, seed=None):
+    from animations.automata import iter_automaton
+
+    for frame in iter_automaton(preset, seed):
+        clear()
+        print(frame)
+        web_safe_sleep(0.1)
+
+def animate_fractal(target, depth, julia=None, seed=None):
+    from animations.fractal import iter_zoom
+
+    for frame in iter_zoom(target, depth, julia):
+        clear()
+        print(frame)
         web_safe_sleep(0.1)
 
 # === Registry ===
-MATH_ANIMATIONS = {
-    "1": ("Orbital Motion", animate_orbit),
-    "2": ("Binary Stars", animate_binary_stars),
-    "3": ("Devil from Lava", animate_devil_from_lava),
-    "4": ("Matrix Rain", animate_matrix_rain),
-    "5": ("Bouncing Ball", animate_bouncing_ball),
-    "6": ("Wave Pattern", animate_wave),
-    "7": ("DNA Helix", animate_dna_helix),
-    "8": ("Spiral Galaxy", animate_spiral_galaxy),
-    "9": ("Fire Effect", animate_fire),
-}
\ No newline at end of file
+# Names and keys are declared in animations/registry.py; this is the view of
+# the entries implemented in this module.
+MATH_ANIMATIONS = AnimationMap("terminal", module=__name__)
@@ -0,0 +1,341 @@
+# animations/nbody.py
+"""
+N-body gravity animations.
+
+Bodies live in NumPy position/velocity/mass arrays and move with a leapfrog
+(kick-drift-kick) integrator, which keeps orbits stable over long runs.
+Accelerations come from one of two solvers:
+
+    direct_accelerations  - every pair, O(N^2), blocked to bound memory;
+                            test particles (mass below TEST_MASS) feel
+                            gravity but exert none, so a disk of them
+                            around a few stars costs O(N)
+    tree_accelerations    - Barnes-Hut quadtree, O(N log N): a cell whose
+                            size / distance is below `theta` acts as a
+                            single body at its center of mass
+
+The tree is built and walked without Python loops over bodies: bodies are
+sorted by Morton code, so every cell at every level is a contiguous run,
+and the walk keeps (body, cell) pairs in arrays, level by level, splitting
+the pairs that are too close into the cell's children.
+
+Frames are rasterized into the character grid by counting bodies per cell
+(density glyphs), with stars and planets drawn on top. Presets:
+
+    binary      - two stars with a circumbinary disk
+    planetary   - a sun, five planets and an asteroid belt
+    galaxies    - two self-gravitating disk galaxies colliding (Barnes-Hut)
+
+    python -m animations.nbody --bench    # steps/second vs body count
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from animations.quality import FULL
+
+G = 1.0
+THETA = 0.7  # Barnes-Hut opening angle
+MAX_DEPTH = 12  # quadtree levels at most; bodies sharing a leaf interact directly
+DIRECT_BLOCK = 256  # rows per block of the direct solver
+TEST_MASS = 1e-6  # lighter bodies exert no gravity in the direct solver
+
+DENSITY_GLYPHS = ((1, "·"), (2, "∘"), (4, "•"), (8, "●"), (16, "◉"))  # bodies per cell
+STAR_GLYPH = "★"
+PLANET_GLYPH = "◉"
+
+# === Solvers ===
+def direct_accelerations(pos, mass, softening):
+    """Acceleration on every body from every body of at least TEST_MASS."""
+    acc = np.empty_like(pos)
+    eps2 = softening * softening
+    sources = mass >= TEST_MASS
+    source_pos, source_mass = pos[sources], mass[sources]
+    for start in range(0, len(pos), DIRECT_BLOCK):
+        d = source_pos[None, :, :] - pos[start:start + DIRECT_BLOCK, None, :]
+        r2 = np.einsum("ijk,ijk->ij", d, d) + eps2
+        w = source_mass[None, :] * r2 ** -1.5  # a body's own term has d = 0
+        acc[start:start + DIRECT_BLOCK] = G * np.einsum("ij,ijk->ik", w, d)
+    return acc
+
+def _morton(cells, depth):
+    """Interleave the bits of integer (x, y) cell coordinates."""
+    x, y = cells[:, 0], cells[:, 1]
+    code = np.zeros(len(cells), dtype=np.int64)
+    for bit in range(depth):
+        code |= ((x >> bit) & 1) << (2 * bit)
+        code |= ((y >> bit) & 1) << (2 * bit + 1)
+    return code
+
+def _ragged_arange(counts):
+    """0..counts[0]-1, 0..counts[1]-1, ... concatenated."""
+    ends = np.cumsum(counts)
+    return np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - counts, counts)
+
+def tree_depth(count):
+    """About one body per leaf: deeper trees only add levels to walk."""
+    return min(MAX_DEPTH, max(2, int(np.ceil(np.log(max(count, 1)) / np.log(4))) + 1))
+
+class QuadTree:
+    """Every non-empty cell of every level, as arrays over Morton-sorted bodies."""
+
+    def __init__(self, pos, mass, depth=None):
+        depth = depth or tree_depth(len(pos))
+        self.depth = depth
+        lo = pos.min(axis=0)
+        self.size = float((pos.max(axis=0) - lo).max()) * (1 + 1e-9) or 1.0
+        grid = 1 << depth
+        cells = np.minimum(((pos - lo) * (grid / self.size)).astype(np.int64), grid - 1)
+        self.code = _morton(cells, depth)
+        self.order = np.argsort(self.code, kind="stable")
+        codes = self.code[self.order]
+        weighted = pos[self.order] * mass[self.order, None]
+        self.levels = []
+        for level in range(depth + 1):
+            level_codes = codes >> (2 * (depth - level))
+            starts = np.flatnonzero(np.r_[True, level_codes[1:] != level_codes[:-1]])
+            cell_mass = np.add.reduceat(mass[self.order], starts)
+            center = np.add.reduceat(weighted, starts) / cell_mass[:, None]
+            counts = np.diff(np.r_[starts, len(codes)])
+            self.levels.append((level_codes[starts], cell_mass, center, starts, counts))
+
+def tree_accelerations(pos, mass, softening, theta=THETA, depth=None):
+    """Barnes-Hut approximation of direct_accelerations (masses must be positive)."""
+    n = len(pos)
+    tree = QuadTree(pos, mass, depth)
+    depth = tree.depth
+    eps2 = softening * softening
+    acc = np.zeros_like(pos)
+
+    def add(body, source_pos, source_mass):
+        d = source_pos - pos[body]
+        r2 = np.einsum("ij,ij->i", d, d) + eps2
+        w = G * source_mass * r2 ** -1.5
+        acc[:, 0] += np.bincount(body, weights=w * d[:, 0], minlength=n)
+        acc[:, 1] += np.bincount(body, weights=w * d[:, 1], minlength=n)
+
+    first = tree.levels[1][0]
+    body = np.repeat(np.arange(n), len(first))
+    cell = np.tile(np.arange(len(first)), n)
+    for level in range(1, depth + 1):
+        codes, cell_mass, center, starts, counts = tree.levels[level]
+        side = tree.size / (1 << level)
+        d = center[cell] - pos[body]
+        r2 = np.einsum("ij,ij->i", d, d)
+        # Open cells that look too big from the body, and always the body's own cell
+        inside = (tree.code[body] >> (2 * (depth - level))) == codes[cell]
+        open_ = inside | (side * side >= theta * theta * r2)
+        far = ~open_
+        add(body[far], center[cell[far]], cell_mass[cell[far]])
+        body, cell = body[open_], cell[open_]
+        if level == depth:
+            # Leaves: every member individually, except the body itself
+            members = counts[cell]
+            body = np.repeat(body, members)
+            other = tree.order[np.repeat(starts[cell], members) + _ragged_arange(members)]
+            keep = other != body
+            add(body[keep], pos[other[keep]], mass[other[keep]])
+            break
+        # Split the rest into the child cells that exist
+        children = tree.levels[level + 1][0]
+        lo = np.searchsorted(children, codes[cell] << 2)
+        hi = np.searchsorted(children, (codes[cell] << 2) + 4)
+        body = np.repeat(body, hi - lo)
+        cell = np.repeat(lo, hi - lo) + _ragged_arange(hi - lo)
+    return acc
+
+# === Integrator ===
+class System:
+    """Bodies moved by a leapfrog integrator."""
+
+    def __init__(self, pos, vel, mass, softening, theta=None):
+        self.pos = np.asarray(pos, dtype=np.float64)
+        self.vel = np.asarray(vel, dtype=np.float64)
+        self.mass = np.asarray(mass, dtype=np.float64)
+        self.softening = softening
+        self.theta = theta  # None: direct summation
+        self.acc = self.accelerations()
+
+    def accelerations(self):
+        if self.theta is None:
+            return direct_accelerations(self.pos, self.mass, self.softening)
+        return tree_accelerations(self.pos, self.mass, self.softening, self.theta)
+
+    def step(self, dt):
+        self.vel += 0.5 * dt * self.acc
+        self.pos += dt * self.vel
+        self.acc = self.accelerations()
+        self.vel += 0.5 * dt * self.acc
+
+# === Rendering ===
+_DENSITY_COUNTS = np.array([count for count, _ in DENSITY_GLYPHS])
+_DENSITY_CODES = np.array([32] + [ord(glyph) for _, glyph in DENSITY_GLYPHS], dtype=np.uint32)
+
+def rasterize(pos, width, height, half_width, marks=None):
+    """
+    Draw bodies into a width x height frame covering x in [-half_width,
+    half_width] (rows are twice as tall as columns are wide). `marks` is a
+    per-body array of glyph code points drawn over the density (0: none).
+    """
+    scale = width / (2 * half_width)
+    col = np.floor(pos[:, 0] * scale + width / 2).astype(np.int64)
+    row = np.floor(pos[:, 1] * scale / 2 + height / 2).astype(np.int64)
+    visible = (col >= 0) & (col < width) & (row >= 0) & (row < height)
+    col, row = col[visible], row[visible]
+    counts = np.bincount(row * width + col, minlength=width * height)
+    codes = np.full((height, width + 1), 10, dtype=np.uint32)
+    codes[:, :width] = _DENSITY_CODES[np.searchsorted(_DENSITY_COUNTS, counts, side="right")].reshape(height, width)
+    if marks is not None:
+        marks = marks[visible]
+        marked = np.flatnonzero(marks)
+        codes[row[marked], col[marked]] = marks[marked]
+    return codes.tobytes().decode("utf-32-le")[:-1]
+
+def _marks(count, glyphs):
+    """Mark array for `count` bodies, with {index: glyph} drawn over the density."""
+    marks = np.zeros(count, dtype=np.uint32)
+    for index, glyph in glyphs.items():
+        marks[index] = ord(glyph)
+    return marks
+
+# === Presets ===
+def _circular(pos, central_mass):
+    """Velocities for circular orbits around the origin."""
+    r = np.hypot(pos[:, 0], pos[:, 1])
+    speed = np.sqrt(G * central_mass / r)
+    return np.column_stack((-pos[:, 1], pos[:, 0])) / r[:, None] * speed[:, None]
+
+def _ring(rng, count, r_min, r_max):
+    r = rng.uniform(r_min, r_max, count)
+    angle = rng.uniform(0, 2 * np.pi, count)
+    return np.column_stack((r * np.cos(angle), r * np.sin(angle)))
+
+def _binary(rng, bodies):
+    """Two stars of mass 0.5 one unit apart, with a disk of light particles around both."""
+    stars = np.array([[0.5, 0.0], [-0.5, 0.0]])
+    star_vel = np.array([[0.0, 0.5], [0.0, -0.5]])
+    disk = _ring(rng, bodies - 2, 1.6, 2.8)
+    pos = np.vstack((stars, disk))
+    vel = np.vstack((star_vel, _circular(disk, 1.0)))
+    mass = np.r_[0.5, 0.5, np.full(bodies - 2, 1e-7)]
+    return pos, vel, mass, _marks(bodies, {0: STAR_GLYPH, 1: STAR_GLYPH})
+
+PLANETS = ((0.9, 2e-5), (1.5, 5e-5), (2.2, 1e-4), (3.6, 1e-3), (5.0, 3e-4))  # (radius, mass)
+
+def _planetary(rng, bodies):
+    """A sun, five planets at random phases and an asteroid belt between the third and fourth."""
+    radius = np.array([r for r, _ in PLANETS])
+    angle = rng.uniform(0, 2 * np.pi, len(PLANETS))
+    planets = np.column_stack((radius * np.cos(angle), radius * np.sin(angle)))
+    belt = _ring(rng, max(0, bodies - 1 - len(PLANETS)), 2.7, 3.1)
+    orbiting = np.vstack((planets, belt))
+    pos = np.vstack(([[0.0, 0.0]], orbiting))
+    vel = np.vstack(([[0.0, 0.0]], _circular(orbiting, 1.0)))
+    mass = np.r_[1.0, [m for _, m in PLANETS], np.full(len(belt), 1e-9)]
+    vel[0] = -(mass[1:, None] * vel[1:]).sum(axis=0) / mass[0]  # the sun recoils: zero momentum
+    marks = _marks(len(pos), {0: STAR_GLYPH, **{i + 1: PLANET_GLYPH for i in range(len(PLANETS))}})
+    return pos, vel, mass, marks
+
+def _galaxy(rng, count, core, disk_mass, spin):
+    disk = _ring(rng, count, 0.5, 4.0)
+    r = np.hypot(disk[:, 0], disk[:, 1])
+    enclosed = core + disk_mass * (r - 0.5) / 3.5
+    speed = np.sqrt(G * enclosed / r) * spin
+    vel = np.column_stack((-disk[:, 1], disk[:, 0])) / r[:, None] * speed[:, None]
+    pos = np.vstack(([[0.0, 0.0]], disk))
+    vel = np.vstack(([[0.0, 0.0]], vel))
+    mass = np.r_[core, np.full(count, disk_mass / count)]
+    return pos, vel, mass
+
+def _galaxies(rng, bodies):
+    """Two disk galaxies with heavy cores on a grazing collision course, spinning opposite ways."""
+    half = (bodies - 2) // 2
+    parts = []
+    cores = {0: STAR_GLYPH, half + 1: STAR_GLYPH}
+    for center, velocity, spin, count in (
+        ((-5.0, -1.5), (0.45, 0.0), 1, half),
+        ((5.0, 1.5), (-0.45, 0.0), -1, bodies - 2 - half),
+    ):
+        pos, vel, mass = _galaxy(rng, count, core=1.0, disk_mass=0.25, spin=spin)
+        parts.append((pos + center, vel + velocity, mass))
+    pos, vel, mass = (np.concatenate(arrays) for arrays in zip(*parts))
+    return pos, vel, mass, _marks(len(pos), cores)
+
+def _rng(seed):
+    """A NumPy generator for any integer seed; NumPy rejects negative ones, so they wrap to 64 bits."""
+    return np.random.default_rng(None if seed is None else seed % 2 ** 64)
+
+PRESETS = {
+    "binary": dict(build=_binary, bodies=300, width=50, height=24, half_width=3.0,
+                   frames=120, dt=0.02, substeps=4, softening=0.05, theta=None),
+    "planetary": dict(build=_planetary, bodies=400, width=60, height=26, half_width=6.0,
+                      frames=150, dt=0.05, substeps=2, softening=0.02, theta=None),
+    "galaxies": dict(build=_galaxies, bodies=1000, width=70, height=30, half_width=12.0,
+                     frames=150, dt=0.1, substeps=1, softening=0.1, theta=0.8),
+}
+
+def iter_nbody(preset, seed=None, quality=FULL):
+    """Yield the frames of a preset one at a time."""
+    config = PRESETS[preset]
+    width, height = quality.size(config["width"], config["height"])
+    pos, vel, mass, marks = config["build"](_rng(seed), quality.particles(config["bodies"]))
+    system = System(pos, vel, mass, config["softening"], config["theta"])
+    # Fewer frames cover the same time span in bigger steps
+    frames = quality.frames(config["frames"])
+    dt = config["dt"] * config["frames"] / frames
+    for _ in range(frames):
+        yield rasterize(system.pos, width, height, config["half_width"], marks)
+        for _ in range(config["substeps"]):
+            system.step(dt)
+
+def nbody_frames(preset, seed=None, quality=FULL):
+    """Create the frames of an N-body preset (scalable, see animations/quality.py)"""
+    return list(iter_nbody(preset, seed, quality))
+
+# === Benchmark ===
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench(counts=(100, 300, 1000, 3000, 10000), repeat=3, direct_limit=3000, seed=0):
+    """Leapfrog steps per second vs body count for both solvers, and the tree's force error."""
+    print(f"{'bodies':>8}{'direct':>14}{'tree':>14}{'tree error':>12}")
+    for count in counts:
+        pos, vel, mass, _ = _galaxies(_rng(seed), count)
+        cells = []
+        results = {}
+        for theta in (None, THETA):
+            if theta is None and count > direct_limit:
+                cells.append(f"{'-':>14}")
+                continue
+            system = System(pos.copy(), vel.copy(), mass, softening=0.1, theta=theta)
+            seconds = best_time(lambda: system.step(0.01), repeat)
+            results[theta] = system.accelerations()
+            cells.append(f"{1 / seconds:>8.1f} st/s")
+        error = "-"
+        if None in results:
+            exact, approx = results[None], results[THETA]
+            relative = np.linalg.norm(approx - exact, axis=1) / np.linalg.norm(exact, axis=1)
+            error = f"{np.median(relative) * 100:.2f}%"
+        print(f"{count:>8}{''.join(cells)}{error:>12}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the N-body solvers")
+    parser.add_argument("--bench", action="store_true", help="Steps/second vs body count, direct and Barnes-Hut")
+    parser.add_argument("--counts", default="100,300,1000,3000,10000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    if not args.bench:
+        parser.print_help()
+        return 0
+    bench([int(n) for n in args.counts.split(",")], args.repeat)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
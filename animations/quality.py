@@ -0,0 +1,35 @@
+# animations/quality.py
+"""
+Rendering quality levels, used by the load governor (governor.py) to ask
+scalable animations for cheaper variants while the server is busy.
+
+A scalable generator takes a `quality` keyword and scales its knobs with it:
+
+    width, height = quality.size(50, 25)   # smaller canvas
+    frames = quality.frames(120)           # fewer frames
+    sparks = quality.particles(15)         # fewer particles
+
+At FULL every method returns its argument unchanged, so the full-quality
+output (and its golden checksums) is exactly the unscaled one.
+"""
+from collections import namedtuple
+
+def _scaled(value, factor):
+    return value if factor == 1 else max(1, int(round(value * factor)))
+
+class Quality(namedtuple("Quality", "name particle_scale frame_scale canvas_scale")):
+    """One quality level: a name and the factors its knobs are scaled by."""
+
+    def particles(self, count):
+        return _scaled(count, self.particle_scale)
+
+    def frames(self, count):
+        return _scaled(count, self.frame_scale)
+
+    def size(self, width, height):
+        return _scaled(width, self.canvas_scale), _scaled(height, self.canvas_scale)
+
+FULL = Quality("full", 1, 1, 1)
+REDUCED = Quality("reduced", 0.5, 0.75, 1)
+LOW = Quality("low", 0.25, 0.5, 0.75)
+QUALITIES = (FULL, REDUCED, LOW)
@@ -0,0 +1,267 @@
+# animations/registry.py
+"""
+Lazy animation registry shared by the web app and the terminal menu.
+
+Every animation is declared once, by name and by the import paths of its
+implementations:
+
+    frames    - returns a list of frame strings (web player, exports)
+    terminal  - prints the animation to the terminal (main.py)
+
+Nothing is imported until an animation is actually played, and asciiArt.txt
+and images/ are only scanned for names until one of their reveals runs. This
+keeps `main.py --list` and `import app` from paying for modules they never use.
+"""
+import functools
+import importlib
+import os
+from collections.abc import Mapping
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE_DIR = os.environ.get("ASCII_IMAGE_DIR", os.path.join(PROJECT_DIR, "images"))
+IMAGE_EXTENSIONS = (".ppm", ".pgm", ".pnm", ".png")
+VIDEO_DIR = os.environ.get("ASCII_VIDEO_DIR", os.path.join(PROJECT_DIR, "videos"))
+VIDEO_EXTENSIONS = (".y4m",)
+
+class Animation:
+    """
+    One registry entry. Targets are callables or "module:attribute" strings,
+    where the attribute may be dotted ("module:SPEC.play"). Scalable frames
+    targets also take a `quality` keyword (see animations/quality.py).
+    Deterministic entries ignore their seed, so every seed shares one render
+    (`python -m animations.golden check` verifies the declaration).
+    """
+
+    def __init__(self, key, name, frames=None, terminal=None, args=(), scalable=False, deterministic=False):
+        self.key = key
+        self.name = name
+        self.frames = frames
+        self.terminal = terminal
+        self.args = tuple(args)
+        self.scalable = scalable
+        self.deterministic = deterministic
+
+    def target(self, kind):
+        return getattr(self, kind)
+
+    def module_name(self, kind):
+        target = self.target(kind)
+        if callable(target):
+            return target.__module__
+        return target.split(":", 1)[0]
+
+    def load(self, kind):
+        """Import and return the implementation for `kind`."""
+        target = self.target(kind)
+        if not callable(target):
+            module_name, attr = target.split(":", 1)
+            target = importlib.import_module(module_name)
+            for name in attr.split("."):
+                target = getattr(target, name)
+        if self.args:
+            return functools.partial(target, *self.args)
+        return target
+
+class DeferredAnimation:
+    """Callable placeholder that imports the real implementation on first call."""
+
+    def __init__(self, entry, kind):
+        self.entry = entry
+        self.kind = kind
+        self.__module__ = entry.module_name(kind)
+        self.__name__ = self.__qualname__ = entry.name
+        self._func = None
+
+    def resolve(self):
+        if self._func is None:
+            self._func = self.entry.load(self.kind)
+        return self._func
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+# === Declarations ===
+_declared = {}
+_art_entries = None
+
+def register(key, name, frames=None, terminal=None, args=(), scalable=False, deterministic=False):
+    """Declare an animation. Later declarations with the same key replace earlier ones."""
+    global _art_entries
+    _declared[key] = Animation(key, name, frames=frames, terminal=terminal, args=args,
+                               scalable=scalable, deterministic=deterministic)
+    _art_entries = None  # art keys follow the declared ones
+    return _declared[key]
+
+register("1", "Orbital Motion",
+         frames="animations.spec_animations:ORBITAL_MOTION",
+         terminal="animations.math_animations:animate_orbit")
+register("2", "Binary Stars",
+         frames="animations.spec_animations:BINARY_STARS",
+         terminal="animations.math_animations:animate_binary_stars")
+register("3", "Devil from Lava",
+         frames="animations.frame_animations:create_devil_from_lava_animation",
+         terminal="animations.math_animations:animate_devil_from_lava")
+register("4", "Matrix Rain",
+         frames="animations.frame_animations:create_matrix_rain_animation",
+         terminal="animations.math_animations:animate_matrix_rain")
+register("5", "Bouncing Ball",
+         frames="animations.frame_animations:create_bouncing_ball_animation",
+         terminal="animations.math_animations:animate_bouncing_ball",
+         deterministic=True)
+register("6", "Wave Pattern",
+         frames="animations.spec_animations:wave_pattern",
+         terminal="animations.math_animations:animate_wave",
+         scalable=True)
+register("7", "DNA Helix",
+         frames="animations.spec_animations:DNA_HELIX",
+         terminal="animations.math_animations:animate_dna_helix",
+         deterministic=True)
+register("8", "Spiral Galaxy",
+         frames="animations.spec_animations:spiral_galaxy",
+         terminal="animations.math_animations:animate_spiral_galaxy",
+         scalable=True)
+register("9", "Fire Effect",
+         frames="animations.frame_animations:create_fire_animation",
+         terminal="animations.math_animations:animate_fire",
+         scalable=True)
+
+for key, name, preset in (("10", "N-Body Binary", "binary"),
+                          ("11", "N-Body Planetary System", "planetary"),
+                          ("12", "N-Body Colliding Galaxies", "galaxies")):
+    register(key, name,
+             frames="animations.nbody:nbody_frames",
+             terminal="animations.math_animations:animate_nbody",
+             args=(preset,),
+             scalable=True)
+
+for key, name, preset in (("13", "Conway's Life", "life"),
+                          ("14", "Brian's Brain", "brians-brain")):
+    register(key, name,
+             frames="animations.automata:automaton_frames",
+             terminal="animations.math_animations:animate_automaton",
+             args=(preset,))
+
+# Fractal zooms: (target x, target y), final magnification, Julia constant (None: Mandelbrot)
+for key, name, args in (("15", "Mandelbrot Zoom", ((-0.743643887037151, 0.131825904205330), 1e6, None)),
+                        ("16", "Julia Zoom", ((-0.0937, -0.5166), 50, (0.285, 0.01)))):
+    register(key, name,
+             frames="animations.fractal:zoom_frames",
+             terminal="animations.math_animations:animate_fractal",
+             args=args,
+             scalable=True,
+             deterministic=True)
+
+def scan_media_names(directory, extensions):
+    """File names in `directory` with one of `extensions`, in name order."""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name for name in os.listdir(directory) if name.lower().endswith(extensions))
+
+def scan_image_names(directory=IMAGE_DIR):
+    return scan_media_names(directory, IMAGE_EXTENSIONS)
+
+def scan_video_names(directory=VIDEO_DIR):
+    return scan_media_names(directory, VIDEO_EXTENSIONS)
+
+def media_paths():
+    """Every image and video file the registry turns into an animation."""
+    return ([os.path.join(IMAGE_DIR, name) for name in scan_image_names()]
+            + [os.path.join(VIDEO_DIR, name) for name in scan_video_names()])
+
+def _title(file_name):
+    return os.path.splitext(file_name)[0].replace("_", " ").replace("-", " ").title()
+
+def _load_art_entries():
+    """
+    Give every block in asciiArt.txt a reveal and a Game of Life animation,
+    then every file in images/ a reveal, after the declared keys, followed by
+    the clips in videos/.
+    """
+    from animations.ascii_animations import scan_art_names
+
+    key = max((int(key) for key in _declared), default=0) + 1
+    entries = {}
+    art_names = scan_art_names()
+    for art_name in art_names:
+        entries[str(key)] = Animation(
+            str(key), f"Animate {art_name.title()}",
+            frames="animations.frame_animations:create_ascii_art_reveal",
+            terminal="animations.ascii_animations:animate_art",
+            args=(art_name,),
+        )
+        key += 1
+    for art_name in art_names:
+        entries[str(key)] = Animation(
+            str(key), f"Life {art_name.title()}",
+            frames="animations.automata:art_life_frames",
+            terminal="animations.ascii_animations:animate_art_life",
+            args=(art_name,),
+            deterministic=True,
+        )
+        key += 1
+    for image_name in scan_image_names():
+        entries[str(key)] = Animation(
+            str(key), f"Image {_title(image_name)}",
+            frames="animations.frame_animations:create_image_reveal",
+            terminal="animations.ascii_animations:animate_image",
+            args=(image_name,),
+        )
+        key += 1
+    for video_name in scan_video_names():
+        entries[str(key)] = Animation(
+            str(key), f"Video {_title(video_name)}",
+            frames="animations.video_ascii:video_frames",
+            terminal="animations.video_ascii:play_video",
+            args=(video_name,),
+            deterministic=True,
+        )
+        key += 1
+    return entries
+
+def all_entries():
+    """Declared entries plus art, image and video entries, keyed by animation number."""
+    global _art_entries
+    if _art_entries is None:
+        _art_entries = _load_art_entries()
+    entries = dict(_declared)
+    entries.update(_art_entries)
+    return entries
+
+class AnimationMap(Mapping):
+    """
+    Read-only {key: (name, callable)} view over the registry for one kind of
+    implementation, in numeric key order. The callables are DeferredAnimation
+    placeholders, so iterating the map never imports an animation module.
+    """
+
+    def __init__(self, kind, module=None):
+        self.kind = kind
+        self.module = module
+        self._deferred = {}
+
+    def _entries(self):
+        entries = all_entries()
+        return {
+            key: entry for key, entry in entries.items()
+            if entry.target(self.kind) is not None
+            and (self.module is None or entry.module_name(self.kind) == self.module)
+        }
+
+    def entry(self, key):
+        return self._entries()[key]
+
+    def __getitem__(self, key):
+        entry = self._entries()[key]
+        deferred = self._deferred.get(key)
+        if deferred is None or deferred.entry is not entry:
+            deferred = self._deferred[key] = DeferredAnimation(entry, self.kind)
+        return entry.name, deferred
+
+    def __iter__(self):
+        return iter(sorted(self._entries(), key=int))
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, key):
+        return key in self._entries()
@@ -0,0 +1,207 @@
+# animations/scene.py
+"""
+Sparse scenes for mostly-empty animations.
+
+A dense payload sends every cell of every frame, even when a frame is a
+star, a planet and a few dots on a 30x15 grid of spaces. A sparse payload
+describes the same frames as a fixed grid, the cells that never change
+(declared once), and per frame only the cells drawn on top:
+
+    {"format": "sparse", "width": 30, "height": 15,
+     "background": [[15, 7, "★"]],
+     "frames": [[[25, 7, "◉"], [3, 1, "·"], ...], ...]}
+
+Entries are [x, y, glyph], or [x, y, glyph, color] for colored cells
+(a palette index, see styles.py). Every other payload field (timeline,
+checksums) still describes the dense frames, which a player rebuilds
+before showing them.
+
+An entry costs 11-14 bytes of JSON where a dense cell costs 1-3, which
+puts the break-even point around 9% of the cells. The app sends an
+animation sparse when at most SPARSE_MAX_DENSITY of its cells (background
+aside) are drawn per frame, comfortably below that, and dense otherwise.
+
+Generators that already know where they draw can build frames with a
+Scene, which keeps the entries and saves rescanning the text:
+
+    scene = Scene(30, 15, background={(15, 7): "★"})
+    frame = scene.frame({(25, 7): "◉"})   # the dense string, plus .cells
+"""
+from animations.styles import decode_row, encode_styles
+
+SPARSE_MAX_DENSITY = 0.05
+SCENE_FIELDS = ("format", "width", "height", "background")
+
+class SceneFrame(str):
+    """A frame string that also carries its cells over its scene's background."""
+
+    def __new__(cls, text, scene, cells):
+        frame = super().__new__(cls, text)
+        frame.scene = scene
+        frame.cells = cells
+        return frame
+
+class Scene:
+    """A fixed-size grid with background cells that every frame shares."""
+
+    def __init__(self, width, height, background=None):
+        self.width = width
+        self.height = height
+        self.background = dict(background or {})
+
+    def is_blank(self, cells, x, y):
+        """True if nothing is drawn at (x, y), neither in `cells` nor the background."""
+        return (x, y) not in cells and (x, y) not in self.background
+
+    def frame(self, cells):
+        """Draw {(x, y): glyph} over the background and return a SceneFrame."""
+        grid = [[" "] * self.width for _ in range(self.height)]
+        for (x, y), glyph in self.background.items():
+            grid[y][x] = glyph
+        entries = []
+        for (x, y), glyph in sorted(cells.items(), key=lambda item: (item[0][1], item[0][0])):
+            if glyph != grid[y][x]:
+                grid[y][x] = glyph
+                entries.append((x, y, glyph))
+        return SceneFrame("\n".join("".join(row) for row in grid), self, tuple(entries))
+
+def grid_size(frames):
+    """(width, height) if every frame is the same full rectangle, else None."""
+    if not frames:
+        return None
+    rows = frames[0].split("\n")
+    width, height = len(rows[0]), len(rows)
+    size = (width + 1) * height - 1
+    for frame in frames:
+        if len(frame) != size or frame[width::width + 1] != "\n" * (height - 1):
+            return None
+    return width, height
+
+def _cell_colors(styles, width, height):
+    """Flat palette indices laid out like the frame text (newlines included)."""
+    colors = []
+    for y in range(height):
+        spans = styles[y] if styles and y < len(styles) else ()
+        colors += decode_row(spans, width)
+        colors.append(0)
+    return colors[:-1]
+
+def _entry(p, glyph, colors, width):
+    entry = [p % (width + 1), p // (width + 1), glyph]
+    if colors is not None and colors[p]:
+        entry.append(colors[p])
+    return entry
+
+def _scene_frames(frames):
+    """Background and entries straight from SceneFrames of one scene, else None."""
+    scene = getattr(frames[0], "scene", None)
+    if scene is None or any(getattr(frame, "scene", None) is not scene for frame in frames):
+        return None
+    background = [[x, y, glyph] for (x, y), glyph in sorted(
+        scene.background.items(), key=lambda item: (item[0][1], item[0][0]))]
+    return background, [[list(cell) for cell in frame.cells] for frame in frames]
+
+def scene_fields(frames, styles=None, max_density=None):
+    """
+    Describe `frames` (strings, with optional per-frame row styles in payload
+    form) as a sparse scene: the SCENE_FIELDS plus a "frames" list of entries.
+    Returns None if the frames don't share one grid, or if more than
+    `max_density` of the cells would be entries.
+    """
+    size = grid_size(frames)
+    if size is None:
+        return None
+    width, height = size
+    styles = styles if styles and any(style is not None for style in styles) else None
+    cells = width * height
+    known = None if styles else _scene_frames(frames)
+    if known is not None:
+        background, entries = known
+        density = sum(len(frame_entries) for frame_entries in entries) / (len(frames) * cells or 1)
+        if max_density is not None and density > max_density:
+            return None
+        return {"format": "sparse", "width": width, "height": height,
+                "background": background, "frames": entries}
+
+    colors = [_cell_colors(style, width, height) for style in styles] if styles else None
+    # Background: drawn cells with the same glyph (and color) in every frame
+    background = {}
+    for p, glyphs in enumerate(zip(*frames)):
+        glyph = glyphs[0]
+        if glyph in " \n" or glyphs.count(glyph) != len(glyphs):
+            continue
+        if colors is not None and len({frame_colors[p] for frame_colors in colors}) != 1:
+            continue
+        background[p] = glyph
+
+    # Every drawn cell that isn't background becomes an entry
+    drawn = sum(len(frame) - frame.count(" ") - (height - 1) for frame in frames)
+    density = (drawn - len(frames) * len(background)) / (len(frames) * cells or 1)
+    if max_density is not None and density > max_density:
+        return None
+    entries = []
+    for i, frame in enumerate(frames):
+        frame_colors = colors[i] if colors is not None else None
+        entries.append([_entry(p, glyph, frame_colors, width) for p, glyph in enumerate(frame)
+                        if glyph not in " \n" and p not in background])
+    return {
+        "format": "sparse", "width": width, "height": height,
+        "background": [_entry(p, glyph, colors[0] if colors else None, width)
+                       for p, glyph in background.items()],
+        "frames": entries,
+    }
+
+def dense_frames(payload):
+    """Rebuild a sparse payload's frames; returns (frames, styles or None)."""
+    width, height = payload["width"], payload["height"]
+    base = [[" "] * width for _ in range(height)]
+    base_colors = [[0] * width for _ in range(height)]
+    colored = False
+    for x, y, glyph, *color in payload["background"]:
+        base[y][x] = glyph
+        if color:
+            base_colors[y][x] = color[0]
+            colored = True
+    grids = []
+    for entries in payload["frames"]:
+        grid = [row[:] for row in base]
+        colors = [row[:] for row in base_colors]
+        for x, y, glyph, *color in entries:
+            grid[y][x] = glyph
+            colors[y][x] = color[0] if color else 0
+            colored = colored or bool(color)
+        grids.append((grid, colors))
+
+    frames = ["\n".join("".join(row) for row in grid) for grid, _ in grids]
+    if not colored:
+        return frames, None
+    styles = []
+    for grid, colors in grids:
+        rows = encode_styles(grid, colors)
+        styles.append([list(row) for row in rows] if any(rows) else None)
+    return frames, styles
+
+def convert_payload(payload, fmt):
+    """
+    Return a payload dict in `fmt` ("sparse" or "dense"). Frames that don't
+    fit one grid can't be sent sparse and stay dense.
+    """
+    current = payload.get("format", "dense")
+    if current == fmt:
+        return payload
+    payload = dict(payload)
+    if current == "sparse":
+        frames, styles = dense_frames(payload)
+        for field in SCENE_FIELDS:
+            payload.pop(field, None)
+        if styles is not None:
+            payload["styles"] = styles
+        payload["frames"] = frames
+        return payload
+    scene = scene_fields(payload["frames"], payload.get("styles"))
+    if scene is None:
+        return payload
+    payload.pop("styles", None)
+    payload.pop("frames")
+    payload.update(scene)
+    return payload
@@ -0,0 +1,366 @@
+# animations/spec.py
+"""
+Declarative animation specs, compiled to vectorized NumPy kernels.
+
+Most parametric effects are the same few patterns: a glyph drawn along a
+curve (orbits, helix strands, wave lines, spiral arms), a run of cells
+between two curves (helix rungs), glyphs picked by a value band (distance
+from a galaxy's core) and random particles sprinkled over blank cells
+every frame. A Spec lists those as layers, drawn in order, with positions
+written as ordinary arithmetic on symbolic variables:
+
+    T = Var("t")                                   # frame number
+    ORBIT = Spec(30, 15, frames=60, layers=[
+        Curve(x=trunc(15 + 10 * cos(T * 0.2)), y=trunc(7 + 6 * sin(T * 0.2)), glyph="◉"),
+        Curve(x=15, y=7, glyph="★"),
+        Particles(8, x=(0, 29), y=(0, 14), glyph="·"),
+    ])
+    frames = ORBIT(seed=3)
+
+Expressions evaluate in the order they are written, with the same float
+operations as the equivalent loop, so a spec can reproduce a hand-written
+generator exactly. A layer can sweep extra variables
+(`over={"r": range(1, 30)}`) and skip cells with `when=`; cells outside the
+grid are dropped, and later cells overwrite earlier ones.
+
+Compiling a spec evaluates every layer for every frame at once and bakes
+the layers that don't depend on the seed into a base grid. Rendering a
+seed then only replays the random draws (with random.Random, in the same
+order as a loop would make them) and turns the grid into strings.
+"""
+import random
+import time
+
+import numpy as np
+
+SPACE = ord(" ")
+
+# === Expressions ===
+class Expr:
+    """A symbolic value; arithmetic on it builds an expression tree."""
+    __hash__ = object.__hash__
+
+    def __add__(self, other): return Op(np.add, self, other)
+    def __radd__(self, other): return Op(np.add, other, self)
+    def __sub__(self, other): return Op(np.subtract, self, other)
+    def __rsub__(self, other): return Op(np.subtract, other, self)
+    def __mul__(self, other): return Op(np.multiply, self, other)
+    def __rmul__(self, other): return Op(np.multiply, other, self)
+    def __truediv__(self, other): return Op(np.true_divide, self, other)
+    def __rtruediv__(self, other): return Op(np.true_divide, other, self)
+    def __floordiv__(self, other): return Op(np.floor_divide, self, other)
+    def __rfloordiv__(self, other): return Op(np.floor_divide, other, self)
+    def __mod__(self, other): return Op(np.mod, self, other)
+    def __pow__(self, other): return Op(np.power, self, other)
+    def __neg__(self): return Op(np.negative, self)
+    def __abs__(self): return Op(np.abs, self)
+    def __lt__(self, other): return Op(np.less, self, other)
+    def __le__(self, other): return Op(np.less_equal, self, other)
+    def __gt__(self, other): return Op(np.greater, self, other)
+    def __ge__(self, other): return Op(np.greater_equal, self, other)
+    def __eq__(self, other): return Op(np.equal, self, other)
+    def __ne__(self, other): return Op(np.not_equal, self, other)
+    def __and__(self, other): return Op(np.logical_and, self, other)
+    def __or__(self, other): return Op(np.logical_or, self, other)
+    def __invert__(self): return Op(np.logical_not, self)
+
+class Var(Expr):
+    """A variable bound at evaluation time: "t" (the frame), a sweep, or x/y."""
+
+    def __init__(self, name):
+        self.name = name
+
+class Op(Expr):
+    def __init__(self, fn, *args):
+        self.fn = fn
+        self.args = args
+
+def _truncate(values):
+    """int() for every element: round toward zero."""
+    if np.issubdtype(np.asarray(values).dtype, np.integer):
+        return values
+    return np.trunc(values).astype(np.int64)
+
+def sin(e): return Op(np.sin, e)
+def cos(e): return Op(np.cos, e)
+def sqrt(e): return Op(np.sqrt, e)
+def trunc(e): return Op(_truncate, e)
+def minimum(a, b): return Op(np.minimum, a, b)
+def maximum(a, b): return Op(np.maximum, a, b)
+
+T = Var("t")
+X = Var("x")  # the cell's own column, for glyph expressions
+Y = Var("y")  # the cell's own row
+
+def evaluate(expr, env, memo):
+    """Value of `expr` with variables from `env`; shared subtrees are evaluated once."""
+    if not isinstance(expr, Expr):
+        return expr
+    key = id(expr)
+    if key not in memo:
+        if isinstance(expr, Var):
+            memo[key] = env[expr.name]
+        else:
+            memo[key] = expr.fn(*(evaluate(arg, env, memo) for arg in expr.args))
+    return memo[key]
+
+# === Glyphs ===
+class Choice:
+    """A glyph drawn at random, per cell, from `glyphs`."""
+
+    def __init__(self, glyphs):
+        self.glyphs = list(glyphs)
+
+class Pick:
+    """glyphs[index] for an integer expression."""
+
+    def __init__(self, index, glyphs):
+        self.index = index
+        self.glyphs = glyphs
+
+class Bands:
+    """The glyph of the first (limit, glyph) band with value < limit, else `otherwise`."""
+
+    def __init__(self, value, bands, otherwise=" "):
+        self.value = value
+        self.bands = bands
+        self.otherwise = otherwise
+
+def _codes(glyph, env, memo, shape):
+    """(code points, random-draw mask or None, Choice or None) for every cell."""
+    if isinstance(glyph, str):
+        return np.full(shape, ord(glyph), np.uint32), None, None
+    if isinstance(glyph, Choice):
+        return np.zeros(shape, np.uint32), np.ones(shape, bool), glyph
+    if isinstance(glyph, Pick):
+        table = np.array([ord(g) for g in glyph.glyphs], np.uint32)
+        return np.broadcast_to(table[evaluate(glyph.index, env, memo)], shape), None, None
+    if isinstance(glyph, Bands):
+        codes, draw, choice = _codes(glyph.otherwise, env, memo, shape)
+        codes = codes.copy()
+        value = np.broadcast_to(evaluate(glyph.value, env, memo), shape)
+        banded = np.zeros(shape, bool)
+        for limit, band_glyph in glyph.bands:
+            hit = (value < limit) & ~banded
+            codes[hit] = ord(band_glyph)
+            banded |= hit
+        if draw is not None:
+            draw = draw & ~banded
+        return codes, draw, choice
+    raise TypeError(f"Unsupported glyph: {glyph!r}")
+
+# === Layers ===
+class Cells:
+    """A layer's cells for every frame, in drawing order."""
+
+    def __init__(self, frame, index, codes, draw=None, choice=None):
+        self.frame = frame
+        self.index = index  # flat index into the (frames, height, width + 1) grid
+        self.codes = codes
+        self.draw = draw
+        self.choice = choice
+
+class Curve:
+    """One cell per frame and sweep value, at (x, y)."""
+
+    def __init__(self, x, y, glyph, over=None, when=None):
+        self.x = x
+        self.y = y
+        self.glyph = glyph
+        self.over = over or {}
+        self.when = when
+
+    def uses_rng(self):
+        return _uses_choice(self.glyph)
+
+    def cells(self, env, memo, shape, width, height):
+        x = np.broadcast_to(evaluate(self.x, env, memo), shape)
+        y = np.broadcast_to(evaluate(self.y, env, memo), shape)
+        valid = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        if self.when is not None:
+            valid &= np.broadcast_to(evaluate(self.when, env, memo), shape)
+        env = dict(env, x=x, y=y)
+        codes, draw, choice = _codes(self.glyph, env, memo, shape)
+        return _pack(env["t"], x, y, codes, draw, choice, valid, width, height)
+
+class Span:
+    """Every cell of row `y` with start <= column < stop, per frame and sweep value."""
+
+    def __init__(self, y, start, stop, glyph, over=None, when=None):
+        self.y = y
+        self.start = start
+        self.stop = stop
+        self.glyph = glyph
+        self.over = over or {}
+        self.when = when
+
+    def uses_rng(self):
+        return _uses_choice(self.glyph)
+
+    def cells(self, env, memo, shape, width, height):
+        # One more axis for the columns; the glyph can't depend on the column
+        full = shape + (width,)
+        env = {name: value[..., None] for name, value in env.items()}
+        x = np.broadcast_to(np.arange(width), full)
+        y = np.broadcast_to(evaluate(self.y, env, memo), full)
+        start = evaluate(self.start, env, memo)
+        stop = evaluate(self.stop, env, memo)
+        valid = (x >= start) & (x < stop) & (y >= 0) & (y < height)
+        if self.when is not None:
+            valid &= evaluate(self.when, env, memo)
+        env = dict(env, x=x, y=y)
+        codes, draw, choice = _codes(self.glyph, env, memo, full)
+        return _pack(env["t"], x, y, codes, draw, choice, valid, width, height)
+
+class Particles:
+    """`count` random cells per frame, drawn only where the grid is still blank."""
+
+    def __init__(self, count, x, y, glyph):
+        self.count = count
+        self.x = x  # inclusive (low, high), like random.randint
+        self.y = y
+        self.glyph = glyph
+
+    def uses_rng(self):
+        return True
+
+    def paint(self, frame, rng):
+        (x0, x1), (y0, y1) = self.x, self.y
+        choices = self.glyph.glyphs if isinstance(self.glyph, Choice) else None
+        code = None if choices else ord(self.glyph)
+        randint, choice = rng.randint, rng.choice
+        for _ in range(self.count):
+            x = randint(x0, x1)
+            y = randint(y0, y1)
+            if frame[y, x] == SPACE:
+                frame[y, x] = ord(choice(choices)) if choices else code
+
+def _uses_choice(glyph):
+    if isinstance(glyph, Bands):
+        return _uses_choice(glyph.otherwise)
+    return isinstance(glyph, Choice)
+
+def _pack(t, x, y, codes, draw, choice, valid, width, height):
+    """Flatten one layer's cells (frame-major, in sweep order) and drop invalid ones."""
+    valid = np.broadcast_to(valid, x.shape)
+    t, y = (np.broadcast_to(a, valid.shape) for a in (t, y))
+    index = (t * height + y) * (width + 1) + x
+    keep = valid.ravel()
+    return Cells(
+        t.ravel()[keep], index.ravel()[keep], np.broadcast_to(codes, valid.shape).ravel()[keep],
+        None if draw is None else np.broadcast_to(draw, valid.shape).ravel()[keep], choice,
+    )
+
+def _last_wins(index):
+    """Mask of the last write to each cell (later cells overwrite earlier ones)."""
+    keep = np.zeros(len(index), bool)
+    _, first = np.unique(index[::-1], return_index=True)
+    keep[len(index) - 1 - first] = True
+    return keep
+
+# === Compiled kernels ===
+class Kernel:
+    """A spec evaluated for all of its frames; render(seed) only adds the random parts."""
+
+    def __init__(self, spec):
+        width, height, count = spec.width, spec.height, spec.frames
+        self.spec = spec
+        self.shape = (count, height, width + 1)
+        # Each row ends in a newline; the last one is a NUL that the string view drops
+        base = np.full(self.shape, SPACE, np.uint32)
+        base[:, :, width] = ord("\n")
+        base[:, height - 1, width] = 0
+
+        layers = spec.layers
+        random_layers = [i for i, layer in enumerate(layers) if layer.uses_rng()]
+        first = random_layers[0] if random_layers else len(layers)
+        last = random_layers[-1] + 1 if random_layers else len(layers)
+
+        cells = [self._cells(layer) if not isinstance(layer, Particles) else None for layer in layers]
+        # Layers before the first random one are the same for every seed
+        index, codes = self._merge(cells[:first])
+        base.flat[index] = codes
+        self.base = base
+        self.middle = [(layer, self._by_frame(layer_cells))
+                       for layer, layer_cells in zip(layers[first:last], cells[first:last])]
+        self.suffix = self._merge(cells[last:])
+
+    def _cells(self, layer):
+        spec = self.spec
+        t = np.arange(spec.frames)
+        names = list(layer.over)
+        sweeps = np.meshgrid(*(np.asarray(layer.over[name]) for name in names), indexing="ij")
+        count = sweeps[0].size if sweeps else 1
+        env = {"t": t[:, None]}
+        env.update({name: sweep.reshape(1, count) for name, sweep in zip(names, sweeps)})
+        return layer.cells(env, {}, (spec.frames, count), spec.width, spec.height)
+
+    def _merge(self, cells):
+        """Flat indices and codes of deterministic layers, last write per cell only."""
+        if not cells:
+            return np.zeros(0, np.intp), np.zeros(0, np.uint32)
+        index = np.concatenate([c.index for c in cells])
+        codes = np.concatenate([c.codes for c in cells])
+        keep = _last_wins(index)
+        return index[keep], codes[keep]
+
+    def _by_frame(self, cells):
+        if cells is None:
+            return None
+        bounds = np.searchsorted(cells.frame, np.arange(self.spec.frames + 1))
+        return cells, _last_wins(cells.index), bounds
+
+    def render(self, seed=None):
+        rng = random.Random(seed)
+        grid = self.base.copy()
+        if self.middle:
+            flat = grid.reshape(-1)
+            for f in range(self.spec.frames):
+                for layer, by_frame in self.middle:
+                    if by_frame is None:
+                        layer.paint(grid[f], rng)
+                        continue
+                    cells, keep, bounds = by_frame
+                    start, end = bounds[f], bounds[f + 1]
+                    codes = cells.codes[start:end]
+                    if cells.draw is not None:
+                        draw = cells.draw[start:end]
+                        codes = codes.copy()
+                        glyphs = cells.choice.glyphs
+                        codes[draw] = [ord(rng.choice(glyphs)) for _ in range(int(draw.sum()))]
+                    frame_keep = keep[start:end]
+                    flat[cells.index[start:end][frame_keep]] = codes[frame_keep]
+        index, codes = self.suffix
+        grid.flat[index] = codes
+        length = self.shape[1] * self.shape[2]
+        return grid.reshape(self.spec.frames, length).view(f"<U{length}").ravel().tolist()
+
+class Spec:
+    """An animation as a grid size, a frame count and layers drawn in order."""
+
+    def __init__(self, width, height, frames, layers, delay=0.1):
+        self.width = width
+        self.height = height
+        self.frames = frames
+        self.layers = layers
+        self.delay = delay  # seconds per frame when played in the terminal
+        self._kernel = None
+
+    def compile(self):
+        if self._kernel is None:
+            self._kernel = Kernel(self)
+        return self._kernel
+
+    def __call__(self, seed=None):
+        """The frame list, like any frame_animations generator."""
+        return self.compile().render(seed)
+
+    def play(self, seed=None):
+        """Print the frames in the terminal, like math_animations does."""
+        from animations.math_animations import clear
+        for frame in self(seed=seed):
+            clear()
+            print(frame)
+            # This module's time.sleep: asciicast exports swap in their clock here
+            # (they patch the module defining the method, not the registry target's)
+            time.sleep(self.delay)
@@ -0,0 +1,170 @@
+# animations/spec_animations.py
+"""
+The parametric gallery animations as specs (see animations/spec.py).
+
+Each spec renders exactly the frames of the loop it replaces in
+frame_animations.py, which is kept as the reference implementation:
+
+    python -m animations.spec_animations --bench   # timings, and checks the output matches
+
+Wave Pattern and Spiral Galaxy are served through Scalable, which also
+renders them at lower quality (fewer particles and frames, a smaller
+canvas) when the load governor asks for it.
+"""
+import argparse
+import math
+import sys
+import time
+
+from animations.quality import FULL
+from animations.spec import (
+    Bands, Choice, Curve, Particles, Pick, Span, Spec, T, X, Y,
+    cos, maximum, minimum, sin, sqrt, trunc, Var,
+)
+
+R = Var("r")
+ARM = Var("arm")
+ROW = Var("row")
+COLUMN = Var("column")
+
+# === Orbital Motion ===
+def _orbital_motion(width=30, height=15):
+    angle = T * 0.2
+    return Spec(width, height, frames=60, layers=[
+        Curve(x=trunc(width // 2 + 10 * cos(angle)), y=trunc(height // 2 + 6 * sin(angle)), glyph="◉"),
+        Curve(x=width // 2, y=height // 2, glyph="★"),  # central star
+        Particles(8, x=(0, width - 1), y=(0, height - 1), glyph="·"),
+    ])
+
+# === Binary Stars ===
+def _binary_stars(width=35, height=18, r=8):
+    angle = T * 0.15
+    return Spec(width, height, frames=80, layers=[
+        Curve(x=trunc(width // 2 + r * cos(angle)), y=trunc(height // 2 + r * sin(angle)), glyph="⊛"),
+        Curve(x=trunc(width // 2 + r * cos(angle + math.pi)),
+              y=trunc(height // 2 + r * sin(angle + math.pi)), glyph="⊗"),
+        Curve(x=width // 2, y=height // 2, glyph="●"),  # center of mass
+        Particles(12, x=(0, width - 1), y=(0, height - 1), glyph=Choice(["·", "∘", "•"])),
+    ])
+
+# === Wave Pattern ===
+def _wave_pattern(width=70, height=20, quality=FULL):
+    width, height = quality.size(width, height)
+    columns = {"column": range(width)}
+    crest = abs(sin(T * 0.15 + COLUMN * 0.1)) > 0.9
+    layers = []
+    for speed, k, amplitude, glyph in ((0.15, 0.1, 4, "~"), (0.1, 0.08, 3, "≈"), (0.2, 0.12, 2, "∼")):
+        y = trunc(height // 2 + sin(T * speed + COLUMN * k) * amplitude)
+        layers += [
+            Curve(x=COLUMN, y=y, glyph=glyph, over=columns),
+            Curve(x=COLUMN, y=y - 1, glyph="^", over=columns, when=crest),
+            Curve(x=COLUMN, y=y + 1, glyph="v", over=columns, when=crest),
+        ]
+    layers.append(Particles(quality.particles(10), x=(0, width - 1), y=(height // 3, 2 * height // 3),
+                            glyph=Choice(["·", "°", "◦", "∘"])))  # foam
+    return Spec(width, height, frames=quality.frames(100), layers=layers)
+
+# === DNA Helix ===
+def _dna_helix(width=40, height=25):
+    rows = {"row": range(height)}
+    angle = T * 0.2 + ROW * 0.4
+    x1 = trunc(width // 2 + 10 * cos(angle))
+    x2 = trunc(width // 2 + 10 * cos(angle + math.pi))
+    rung = ROW % 4 == 0
+    return Spec(width, height, frames=80, layers=[
+        Curve(x=x1, y=ROW, glyph="●", over=rows),
+        Curve(x=x2, y=ROW, glyph="●", over=rows),
+        Span(y=ROW, start=minimum(x1, x2) + 1, stop=maximum(x1, x2),
+             glyph=Pick(ROW // 4 % 4, "─═⋯┅"), over=rows, when=rung),
+        Curve(x=(x1 + x2) // 2, y=ROW, glyph=Pick(ROW // 4 % 4, "ATGC"), over=rows, when=rung),
+    ])
+
+# === Spiral Galaxy ===
+def _spiral_galaxy(width=60, height=30, quality=FULL):
+    width, height = quality.size(width, height)
+    cx, cy = width // 2, height // 2
+    angle = ARM * math.pi / 2 + T * 0.05 + R * 0.2
+    distance = sqrt((X - cx) ** 2 + (Y - cy) ** 2)
+    return Spec(width, height, frames=quality.frames(120), layers=[
+        Curve(x=trunc(cx + R * cos(angle)), y=trunc(cy + R * sin(angle) * 0.6),  # flattened vertically
+              over={"arm": range(4), "r": range(1, min(width // 2, height))},
+              glyph=Bands(distance, ((3, "◯"), (8, "●"), (15, "◉")),  # core, inner, mid spiral
+                          otherwise=Choice(["○", "*", "·", "✦"]))),
+        Particles(quality.particles(30), x=(0, width - 1), y=(0, height - 1), glyph=Choice(["·", "∘", "°", "+"])),
+        Curve(x=cx, y=cy, glyph="⬤"),  # central black hole
+    ])
+
+ORBITAL_MOTION = _orbital_motion()
+BINARY_STARS = _binary_stars()
+WAVE_PATTERN = _wave_pattern()
+DNA_HELIX = _dna_helix()
+SPIRAL_GALAXY = _spiral_galaxy()
+
+# === Scalable Specs ===
+class Scalable:
+    """
+    Frames target for a spec factory: renders `spec` at full quality, and a
+    lower-quality spec built (and compiled) the first time it is asked for.
+    """
+
+    def __init__(self, factory, spec):
+        self.factory = factory
+        self.specs = {FULL: spec}
+
+    def __call__(self, seed=None, quality=FULL):
+        spec = self.specs.get(quality)
+        if spec is None:
+            spec = self.specs[quality] = self.factory(quality=quality)
+        return spec(seed=seed)
+
+wave_pattern = Scalable(_wave_pattern, WAVE_PATTERN)
+spiral_galaxy = Scalable(_spiral_galaxy, SPIRAL_GALAXY)
+
+# === Benchmark ===
+BENCH = (
+    ("Orbital Motion", ORBITAL_MOTION, "create_orbital_animation"),
+    ("Binary Stars", BINARY_STARS, "create_binary_stars_animation"),
+    ("Wave Pattern", WAVE_PATTERN, "create_wave_animation"),
+    ("DNA Helix", DNA_HELIX, "create_dna_helix_animation"),
+    ("Spiral Galaxy", SPIRAL_GALAXY, "create_spiral_galaxy_animation"),
+)
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench(repeat=5, seeds=range(8)):
+    """Compare each spec with its loop version; returns False if any output differs."""
+    from animations import frame_animations
+
+    identical = True
+    print(f"{'animation':<16}{'loop':>10}{'spec':>10}{'compile':>10}{'speedup':>10}")
+    for name, spec, original_name in BENCH:
+        original = getattr(frame_animations, original_name)
+        spec._kernel = None
+        compile_time = best_time(spec.compile, 1)
+        same = all(spec(seed=seed) == original(seed=seed) for seed in seeds)
+        identical = identical and same
+        loop_time = best_time(lambda: original(seed=1), repeat)
+        spec_time = best_time(lambda: spec(seed=1), repeat)
+        print(f"{name:<16}{loop_time * 1000:>8.2f}ms{spec_time * 1000:>8.2f}ms"
+              f"{compile_time * 1000:>8.2f}ms{loop_time / spec_time:>9.1f}x"
+              + ("" if same else "  ❌ output differs"))
+    return identical
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the spec animations against their loop versions")
+    parser.add_argument("--bench", action="store_true", help="Time every spec against its loop version")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    if not args.bench:
+        parser.print_help()
+        return 0
+    return 0 if bench(args.repeat) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
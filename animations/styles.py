@@ -0,0 +1,163 @@
+# animations/styles.py
+"""
+Styled cells: a glyph plus a small palette index.
+
+Colored generators build a glyph grid and a parallel grid of palette indices
+and turn them into a StyledFrame. A StyledFrame *is* the frame string (so
+every existing consumer keeps working) and additionally carries its colors
+as run-length-encoded spans per row:
+
+    styles = ((2, 5, 0, 3, 4, 1), (), ...)
+              ^ row 0: 5 cells of color 2, 3 default cells, 1 cell of color 4
+                                  ^ row 1: all default
+
+Index 0 is the default (terminal green), trailing default runs are dropped,
+so the common case of long same-colored runs costs a couple of integers.
+"""
+import os
+import sys
+
+# name, ANSI SGR parameters, CSS color
+PALETTE = [
+    ("default", "0", None),
+    # Fire, coolest to hottest
+    ("smoke", "38;5;238", "#444444"),
+    ("ember", "38;5;88", "#870000"),
+    ("red", "38;5;160", "#d70000"),
+    ("orange", "38;5;202", "#ff5f00"),
+    ("amber", "38;5;214", "#ffaf00"),
+    ("yellow", "38;5;226", "#ffff00"),
+    ("white-hot", "38;5;230", "#ffffd7"),
+    # Matrix rain, dimmest to brightest
+    ("green-dim", "38;5;22", "#005f00"),
+    ("green", "38;5;28", "#008700"),
+    ("green-bright", "38;5;46", "#00ff00"),
+    ("green-head", "38;5;157", "#afffaf"),
+]
+COLOR = {name: index for index, (name, _, _) in enumerate(PALETTE)}
+FIRE_GRADIENT = [COLOR[n] for n in ("ember", "red", "orange", "amber", "yellow", "white-hot")]
+MATRIX_GRADIENT = [COLOR[n] for n in ("green-dim", "green", "green-bright", "green-head")]
+
+def gradient(colors, level):
+    """Pick a palette index for a 0..1 level along a gradient."""
+    level = min(1.0, max(0.0, level))
+    return colors[min(len(colors) - 1, int(level * len(colors)))]
+
+def encode_row(colors):
+    """Run-length encode one row of palette indices as a flat tuple."""
+    spans = []
+    run_color, run_length = None, 0
+    for color in colors:
+        if color == run_color:
+            run_length += 1
+            continue
+        if run_length:
+            spans += (run_color, run_length)
+        run_color, run_length = color, 1
+    if run_length and run_color != 0:
+        spans += (run_color, run_length)
+    return tuple(spans)
+
+class StyledFrame(str):
+    """A frame string that also carries per-row color spans."""
+
+    def __new__(cls, text, styles):
+        frame = super().__new__(cls, text)
+        frame.styles = styles
+        return frame
+
+    def __eq__(self, other):
+        if isinstance(other, StyledFrame):
+            return str.__eq__(self, other) and self.styles == other.styles
+        if isinstance(other, str):
+            return str.__eq__(self, other) and not any(self.styles)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = str.__hash__
+
+def _blanks_merged(glyphs, colors):
+    """
+    A blank cell looks the same in any color, so let it continue the run
+    before it (and drop the color of trailing blanks). Fewer, longer runs
+    mean fewer spans in the payload and fewer escape codes on the terminal.
+    """
+    merged = []
+    previous = 0
+    for glyph, color in zip(glyphs, colors):
+        if glyph == " ":
+            color = previous
+        merged.append(color)
+        previous = color
+    end = len(glyphs)
+    while end and glyphs[end - 1] == " ":
+        end -= 1
+    merged[end:] = [0] * (len(merged) - end)
+    return merged
+
+def encode_styles(grid, colors):
+    """Row spans for a glyph grid and a same-shaped palette grid."""
+    return tuple(encode_row(_blanks_merged(glyphs, row)) for glyphs, row in zip(grid, colors))
+
+def decode_row(spans, length):
+    """Expand one row's spans back to `length` palette indices."""
+    colors = []
+    for i in range(0, len(spans), 2):
+        colors += [spans[i]] * spans[i + 1]
+    return (colors + [0] * length)[:length]
+
+def styled_frame(grid, colors):
+    """Build a StyledFrame from a glyph grid and a same-shaped palette grid."""
+    text = "\n".join("".join(row) for row in grid)
+    return StyledFrame(text, encode_styles(grid, colors))
+
+def frame_styles(frame):
+    """Styles for the payload: None for plain frames, else a list of row span lists."""
+    styles = getattr(frame, "styles", None)
+    if styles is None or not any(styles):
+        return None
+    return [list(row) for row in styles]
+
+def css_palette():
+    return [css for _, _, css in PALETTE]
+
+# === Terminal output ===
+def color_enabled(stream=None):
+    stream = stream or sys.stdout
+    return (not os.environ.get("NO_COLOR")) and hasattr(stream, "isatty") and stream.isatty()
+
+def to_ansi(frame):
+    """
+    Render a frame with SGR color codes, emitting an escape sequence only
+    where the color changes (not once per cell). Plain frames pass through.
+    """
+    styles = getattr(frame, "styles", None)
+    if not styles or not any(styles):
+        return str(frame)
+    out = []
+    current = 0
+    for row_text, spans in zip(frame.split("\n"), styles):
+        position = 0
+        for i in range(0, len(spans), 2):
+            color, length = spans[i], spans[i + 1]
+            if color != current:
+                out.append(f"\x1b[{PALETTE[color][1]}m")
+                current = color
+            out.append(row_text[position:position + length])
+            position += length
+        if position < len(row_text):
+            if current != 0:
+                out.append("\x1b[0m")
+                current = 0
+            out.append(row_text[position:])
+        out.append("\n")
+    if current != 0:
+        out.append("\x1b[0m")
+    return "".join(out).rstrip("\n")
+
+def print_frame(frame):
+    """print() a frame, in color when stdout is a terminal that wants it."""
+    print(to_ansi(frame) if color_enabled() else str(frame))
@@ -0,0 +1,86 @@
+# animations/timeline.py
+"""
+Compact frame timelines.
+
+Generators return one string per tick. Many of those ticks are redundant:
+reveals end on a run of identical frames and some animations repeat
+exactly after a while. compact_frames() removes both kinds of redundancy:
+
+    frames           - distinct consecutive frames
+    frame_durations  - how many ms each frame stays up (only when they differ)
+    loop_start       - index the cycle restarts from (only when one was found)
+    total_frames     - how many ticks the original animation lasted
+
+A player reproduces the original by showing frames[i] for frame_durations[i]
+ms, and once it runs off the end, continuing from loop_start until
+total_frames ticks have passed (or forever, when looping).
+"""
+
+def coalesce(frames, frame_delay):
+    """Merge runs of identical frames, returning (frames, durations_ms)."""
+    merged = []
+    durations = []
+    for frame in frames:
+        if merged and merged[-1] == frame:
+            durations[-1] += frame_delay
+        else:
+            merged.append(frame)
+            durations.append(frame_delay)
+    return merged, durations
+
+def find_loop(items, min_repeats=2):
+    """
+    Find the shortest (start, period) such that items[start:] repeats with
+    that period until the end and is seen at least `min_repeats` times.
+    Returns None when the sequence has no such tail.
+    """
+    count = len(items)
+    best = None
+    for period in range(1, count // min_repeats + 1):
+        # Walk backwards while the tail keeps matching one period earlier
+        start = count - period
+        while start > 0 and items[start - 1] == items[start - 1 + period]:
+            start -= 1
+        if count - start < min_repeats * period:
+            continue
+        if best is None or start + period < best[0] + best[1]:
+            best = (start, period)
+    return best
+
+def compact_frames(frames, frame_delay):
+    """Return the compact timeline fields for a payload (see module docstring)."""
+    merged, durations = coalesce(frames, frame_delay)
+    loop = find_loop(list(zip(merged, durations)))
+    if loop is not None:
+        start, period = loop
+        merged = merged[:start + period]
+        durations = durations[:start + period]
+
+    timeline = {"frames": merged, "total_frames": len(frames)}
+    if any(duration != frame_delay for duration in durations):
+        timeline["frame_durations"] = durations
+    if loop is not None:
+        timeline["loop_start"] = loop[0]
+    return timeline
+
+def iter_timeline(payload, loops=False):
+    """
+    Yield (seconds, frame) for a compact payload, expanded back to the
+    original length (or endlessly if `loops`).
+    """
+    frames = payload["frames"]
+    delay = payload.get("frame_delay", 100)
+    durations = payload.get("frame_durations") or [delay] * len(frames)
+    loop_start = payload.get("loop_start")
+    total_ms = payload.get("total_frames", len(frames)) * delay
+
+    elapsed = 0
+    index = 0
+    while frames and (loops or elapsed < total_ms):
+        yield elapsed / 1000.0, frames[index]
+        elapsed += durations[index]
+        index += 1
+        if index == len(frames):
+            if loop_start is None and not loops:
+                break
+            index = loop_start or 0
@@ -0,0 +1,319 @@
+# animations/video_ascii.py
+"""
+Play uncompressed YUV4MPEG2 (.y4m) clips as ASCII animations.
+
+Only the luma (Y) plane is needed for ASCII, and a y4m frame stores it
+first, uncompressed, at a fixed size. So a clip is memory-mapped and each
+frame's luma is a zero-copy NumPy view at a known offset. Pages are
+released again once a frame has been converted, so memory use stays flat
+no matter how long the clip is.
+
+A helper thread converts frames ahead of playback into a bounded queue
+(`read_ahead` frames), and the consumer (terminal playback, the web frame
+generator, or an asciicast export) takes them as it needs them.
+
+    python -m animations.video_ascii clip.y4m --play
+    python -m animations.video_ascii clip.y4m --width 100   # conversion fps only
+    python -m animations.video_ascii --bench
+
+Clips dropped into videos/ (or $ASCII_VIDEO_DIR) appear in the gallery.
+"""
+import argparse
+import math
+import mmap
+import os
+import queue
+import re
+import sys
+import threading
+import time
+
+import numpy as np
+
+from animations.image_ascii import (
+    CELL_ASPECT, DEFAULT_RAMP, cell_brightness, glyph_rows, output_size, ramp_glyphs, ramp_levels
+)
+from animations.registry import VIDEO_DIR
+
+COLORSPACE = re.compile(r"^(mono|420|422|444)(alpha)?\w*?(?:p(\d+))?$")
+PAGE_SIZE = mmap.PAGESIZE
+FAULT_AROUND_BYTES = 64 * 1024  # Linux default fault_around_bytes
+
+class Y4MClip:
+    """A memory-mapped .y4m file; frames are read as luma views."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path}: empty file") from None
+        end = self._map.find(b"\n")
+        header = self._map[:end].decode("ascii", "replace").split()
+        if end < 0 or not header or header[0] != "YUV4MPEG2":
+            self.close()
+            raise ValueError(f"{path}: not a YUV4MPEG2 file")
+        params = {}
+        extensions = []
+        for token in header[1:]:
+            if token[0] == "X":
+                extensions.append(token[1:])
+            else:
+                params[token[0]] = token[1:]
+
+        self.width = int(params["W"])
+        self.height = int(params["H"])
+        num, den = params.get("F", "25:1").split(":")
+        self.fps = int(num) / int(den) if int(den) else 25.0
+        match = COLORSPACE.match(params.get("C", "420jpeg"))
+        if not match:
+            self.close()
+            raise ValueError(f"{path}: unsupported colorspace {params['C']}")
+        subsampling, alpha, depth = match.group(1), match.group(2), int(match.group(3) or 8)
+        self.sample = np.dtype(np.uint8) if depth <= 8 else np.dtype("<u2")
+        self.maxval = (1 << depth) - 1
+        # Video luma is normally "limited range" (16..235 for 8 bit)
+        if "COLORRANGE=FULL" in extensions:
+            self.black, self.white = 0, self.maxval
+        else:
+            self.black, self.white = 16 << (depth - 8), 235 << (depth - 8)
+
+        luma = self.width * self.height
+        half_w, half_h = (self.width + 1) // 2, (self.height + 1) // 2
+        chroma = {"mono": 0, "420": 2 * half_w * half_h, "422": 2 * half_w * self.height, "444": 2 * luma}
+        planes = luma + chroma[subsampling] + (luma if alpha else 0)
+        self.frame_bytes = planes * self.sample.itemsize
+        self._first_frame = end + 1
+        self._released = 0
+
+    def frame_offsets(self):
+        """Yield the byte offset of each frame's luma plane."""
+        position = self._first_frame
+        size = len(self._map)
+        while position < size:
+            end = self._map.find(b"\n", position)
+            if end < 0 or self._map[position:position + 5] != b"FRAME":
+                return
+            data = end + 1
+            if data + self.frame_bytes > size:
+                return  # truncated last frame
+            yield data
+            position = data + self.frame_bytes
+
+    def luma(self, offset):
+        """The luma plane at `offset` as a (height, width) array backed by the mapping."""
+        count = self.width * self.height
+        return np.frombuffer(self._map, dtype=self.sample, count=count, offset=offset).reshape(
+            self.height, self.width)
+
+    def release(self, offset):
+        """
+        Drop the mapped pages up to the end of the frame at `offset` from this
+        process's memory. Not just the frame itself: reading the next frame's
+        header also maps the pages around it (the kernel's fault-around).
+        """
+        end = offset + self.frame_bytes
+        end -= end % PAGE_SIZE
+        # Fault-around can also map pages just behind the last release again
+        start = max(0, self._released - FAULT_AROUND_BYTES)
+        if end > start and hasattr(self._map, "madvise"):
+            self._map.madvise(mmap.MADV_DONTNEED, start, end - start)
+            self._released = end
+
+    def close(self):
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # a frame view is still referenced; the mapping goes away with it
+        self._file.close()
+
+class FrameConverter:
+    """Luma plane -> ASCII frame, with the cell grid and ramp computed once per clip."""
+
+    def __init__(self, clip, columns=80, ramp=DEFAULT_RAMP, dither=False, aspect=CELL_ASPECT):
+        self.columns, self.rows = output_size(clip.width, clip.height, columns, aspect)
+        self.x_edges = np.linspace(0, clip.width, self.columns + 1)
+        self.y_edges = np.linspace(0, clip.height, self.rows + 1)
+        self.glyphs = ramp_glyphs(ramp)
+        self.dither = dither
+        self.black = clip.black / clip.maxval
+        self.range = (clip.white - clip.black) / clip.maxval
+        self.maxval = clip.maxval
+
+    def __call__(self, luma):
+        brightness = cell_brightness(luma, self.x_edges, self.y_edges, self.maxval)
+        brightness = (brightness - self.black) / self.range
+        index = ramp_levels(brightness, len(self.glyphs), self.dither)
+        return "\n".join(glyph_rows(index, self.glyphs))
+
+class ConversionStats:
+    def __init__(self):
+        self.frames = 0
+        self.seconds = 0.0  # time spent converting, excluding waits on the queue
+
+    @property
+    def fps(self):
+        return self.frames / self.seconds if self.seconds else 0.0
+
+def stream_frames(path, columns=80, fps=None, read_ahead=8, ramp=DEFAULT_RAMP, dither=False,
+                  max_frames=None, stats=None):
+    """
+    Yield (seconds, frame) for a y4m clip, converted by a helper thread that
+    stays at most `read_ahead` frames ahead of the consumer.
+
+    `fps` resamples the clip (frames are dropped or repeated to match);
+    by default the clip's own rate is kept. Pass a ConversionStats to get the
+    conversion rate. Closing the generator early stops the helper thread.
+    """
+    clip = Y4MClip(path)
+    convert = FrameConverter(clip, columns, ramp, dither)
+    target_fps = fps or clip.fps
+    stats = stats if stats is not None else ConversionStats()
+    frames = queue.Queue(maxsize=read_ahead)
+    stopped = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run():
+        try:
+            tick = 0
+            for index, offset in enumerate(clip.frame_offsets()):
+                # Output ticks that fall within this source frame's display time
+                end_tick = math.ceil((index + 1) * target_fps / clip.fps - 1e-9)
+                if max_frames is not None:
+                    end_tick = min(end_tick, max_frames)
+                if end_tick > tick:
+                    start = time.perf_counter()
+                    frame = convert(clip.luma(offset))
+                    stats.seconds += time.perf_counter() - start
+                    stats.frames += 1
+                    clip.release(offset)
+                    for t in range(tick, end_tick):
+                        if not put((t / target_fps, frame)):
+                            return
+                    tick = end_tick
+                if max_frames is not None and tick >= max_frames:
+                    break
+        except Exception as e:
+            put(e)
+        finally:
+            put(done)
+
+    worker = threading.Thread(target=run, name="y4m-reader", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = frames.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+        while worker.is_alive():
+            try:
+                frames.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        clip.close()
+
+# === Gallery clips ===
+WEB_FPS = 10            # the web player's fixed frame rate (FRAME_DELAY in app.py)
+MAX_WEB_SECONDS = 60    # a web payload holds every frame, so keep it short
+
+def video_path(video_name):
+    return os.path.join(VIDEO_DIR, video_name)
+
+def video_frames(video_name, seed=None, columns=80):
+    """Frame list for the web player, resampled to its frame rate."""
+    return [frame for _, frame in stream_frames(
+        video_path(video_name), columns, fps=WEB_FPS, max_frames=WEB_FPS * MAX_WEB_SECONDS)]
+
+def play_video(video_name, seed=None, columns=80):
+    """Play a clip from videos/ in the terminal (main.py)."""
+    play(video_path(video_name), columns)
+
+def play(path, columns=80, **kwargs):
+    """Print a clip frame by frame on a fixed schedule, returning its ConversionStats."""
+    stats = ConversionStats()
+    home = "\x1b[H\x1b[2J" if hasattr(sys.stdout, "isatty") and sys.stdout.isatty() else ""
+    started = time.monotonic()
+    for seconds, frame in stream_frames(path, columns, stats=stats, **kwargs):
+        # Sleep until the frame's own timestamp, so slow frames don't add up
+        time.sleep(max(0.0, started + seconds - time.monotonic()))
+        print(home + frame, flush=True)
+    return stats
+
+# === Command line ===
+def write_test_clip(path, width=640, height=360, frames=120, fps=30):
+    """Write a synthetic 4:2:0 clip: a bright disc orbiting over a moving gradient."""
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    chroma = np.full(((width + 1) // 2) * ((height + 1) // 2) * 2, 128, dtype=np.uint8).tobytes()
+    with open(path, "wb") as f:
+        f.write(f"YUV4MPEG2 W{width} H{height} F{fps}:1 Ip A1:1 C420jpeg\n".encode("ascii"))
+        for i in range(frames):
+            angle = i / frames * 2 * np.pi
+            cx = width / 2 + np.cos(angle) * width / 3
+            cy = height / 2 + np.sin(angle) * height / 3
+            background = 40 + 60 * (0.5 + 0.5 * np.sin(x / width * 6 + i * 0.1))
+            disc = np.hypot(x - cx, y - cy) < height / 6
+            luma = np.where(disc, 235, background).astype(np.uint8)
+            f.write(b"FRAME\n")
+            f.write(luma.tobytes())
+            f.write(chroma)
+
+def report(stats, clip_path):
+    print(f"🎞️  {os.path.basename(clip_path)}: converted {stats.frames} frames "
+          f"in {stats.seconds * 1000:.0f} ms ({stats.fps:.0f} fps)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a YUV4MPEG2 clip to ASCII frames")
+    parser.add_argument("clip", nargs="?", help=".y4m file")
+    parser.add_argument("--width", "-w", type=int, default=80, help="Output columns")
+    parser.add_argument("--fps", type=float, help="Resample to this frame rate (default: the clip's)")
+    parser.add_argument("--ramp", default=DEFAULT_RAMP, help="Glyph ramp name or literal string")
+    parser.add_argument("--dither", action="store_true")
+    parser.add_argument("--read-ahead", type=int, default=8, help="Frames converted ahead of playback")
+    parser.add_argument("--play", action="store_true", help="Play in the terminal")
+    parser.add_argument("--bench", action="store_true", help="Convert a synthetic 640x360 clip")
+    args = parser.parse_args(argv)
+
+    options = dict(fps=args.fps, read_ahead=args.read_ahead, ramp=args.ramp, dither=args.dither)
+    if args.bench:
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.y4m")
+            write_test_clip(path, frames=300)
+            stats = ConversionStats()
+            for _ in stream_frames(path, args.width, stats=stats, **options):
+                pass
+            report(stats, path)
+        return 0
+    if not args.clip:
+        parser.error("a clip is required (or --bench)")
+    try:
+        if args.play:
+            stats = play(args.clip, args.width, **options)
+        else:
+            stats = ConversionStats()
+            for _ in stream_frames(args.clip, args.width, stats=stats, **options):
+                pass
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    report(stats, args.clip)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,9 @@
 # app.py - Terminal Modal Version
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify
+from werkzeug.wsgi import wrap_file
+import argparse
+import glob
+import hmac
 import threading
 import time
 import json
@@ -7,20 +11,60 @@ import random
 import math
 import os
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import your animation system
-from main import build_animations, MAX_WIDTH
+from animations.registry import AnimationMap, media_paths
+from frame_store import LocalFrameStore, SharedFrameStore
+from disk_store import DiskFrameStore, code_version, encode_frames_payload
+from animations.asciicast import iter_cast
+from animations.timeline import compact_frames, iter_timeline
+from animations.golden import frame_checksums
+from animations.styles import css_palette, frame_styles
+from animations.scene import SPARSE_MAX_DENSITY, convert_payload, scene_fields
+from animations.banner import DEFAULT_FONT, list_fonts, render_banner
+from animations.quality import FULL, QUALITIES
+from governor import CACHED_ONLY, LEVEL_NAMES, LoadGovernor
+import profiling
 
 app = Flask(__name__)
 
-# Build animations at startup
-animations, ascii_arts = build_animations()
-
 # Global state for animation control
 current_animation = None
 animation_running = False
 stop_requested = False
 
+# Rendered payloads are cached per (animation, seed). Generators are seeded,
+# so each animation keeps a few variants (seeds 0..FRAME_VARIANTS-1) and
+# repeat visitors still see different frames, while most requests are served
+# from the store instead of being re-rendered. Other seeds requested with
+# ?seed= are rendered on demand and never persisted to disk.
+FRAME_VARIANTS = 4
+MAX_SEED = 2 ** 32  # ?seed= must lie in 0..MAX_SEED-1, keeping cache keys short and bounded
+SEED_ERROR = f"seed must be an integer from 0 to {MAX_SEED - 1}"
+FRAME_DELAY = 100  # milliseconds between frames
+MAX_BANNER_TEXT = 64  # characters accepted by /banner
+MAX_BATCH_KEYS = 16  # animations accepted by one /get_animations request
+BATCH_WORKERS = 4  # threads rendering /get_animations items
+frame_store = LocalFrameStore()
+
+# Lowers the quality of cache misses under load (see governor.py)
+governor = LoadGovernor()
+
+# Optional persistent store (enabled by `python app.py`, see --store-dir).
+# Its version covers every file that shapes the stored bytes: all of
+# animations/ (generators, the registry's key -> animation mapping, timeline
+# compaction, checksums), this file (payload fields), disk_store.py and
+# asciiArt.txt. Editing any of them invalidates previously rendered variants.
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATOR_SOURCES = sorted(glob.glob(os.path.join(APP_DIR, "animations", "*.py"))) + [
+    os.path.join(APP_DIR, "app.py"),
+    os.path.join(APP_DIR, "disk_store.py"),
+    os.path.abspath("asciiArt.txt"),
+]
+disk_store = None
+
 class TerminalEmulator:
     def __init__(self):
         self.buffer = []
@@ -47,509 +91,173 @@ class TerminalEmulator:
 # Create terminal emulator instance
 terminal = TerminalEmulator()
 
-def create_orbital_animation():
-    """Create orbital motion animation frames"""
-    frames = []
-    width, height = 30, 15
-    
-    for i in range(60):
-        terminal.clear()
-        grid = [[" " for _ in range(width)] for _ in range(height)]
-        
-        # Planet orbit
-        angle = i * 0.2
-        x = int(width // 2 + 10 * math.cos(angle))
-        y = int(height // 2 + 6 * math.sin(angle))
-        
-        if 0 <= y < height and 0 <= x < width:
-            grid[y][x] = "◉"
-        
-        # Central star
-        grid[height//2][width//2] = "★"
-        
-        # Add some stars
-        for _ in range(8):
-            sx = random.randint(0, width-1)
-            sy = random.randint(0, height-1)
-            if grid[sy][sx] == " ":
-                grid[sy][sx] = "·"
-        
-        frame = "\n".join("".join(row) for row in grid)
-        frames.append(frame)
-    
-    return frames
+# Animation registry: names come from animations/registry.py, generator
+# modules are only imported the first time an animation is rendered.
+ANIMATION_GENERATORS = AnimationMap("frames")
 
-def create_binary_stars_animation():
-    """Create binary stars animation frames"""
-    frames = []
-    width, height = 35, 18
-    
-    for i in range(80):
-        terminal.clear()
-        grid = [[" " for _ in range(width)] for _ in range(height)]
-        
-        # Binary star system
-        angle = i * 0.15
-        r = 8
-        
-        # Star 1
-        x1 = int(width//2 + r * math.cos(angle))
-        y1 = int(height//2 + r * math.sin(angle))
-        
-        # Star 2
-        x2 = int(width//2 + r * math.cos(angle + math.pi))
-        y2 = int(height//2 + r * math.sin(angle + math.pi))
-        
-        if 0 <= y1 < height and 0 <= x1 < width:
-            grid[y1][x1] = "⊛"
-        if 0 <= y2 < height and 0 <= x2 < width:
-            grid[y2][x2] = "⊗"
-            
-        # Center of mass
-        grid[height//2][width//2] = "●"
-        
-        # Background stars
-        for _ in range(12):
-            sx = random.randint(0, width-1)
-            sy = random.randint(0, height-1)
-            if grid[sy][sx] == " ":
-                grid[sy][sx] = random.choice(["·", "∘", "•"])
-        
-        frame = "\n".join("".join(row) for row in grid)
-        frames.append(frame)
+@app.route('/')
+def index():
+    # Create a clean data structure for the template (no functions)
+    animations_data = {}
+    for key, (name, _) in ANIMATION_GENERATORS.items():
+        animations_data[key] = name
     
-    return frames
+    return render_template('index.html', animations=animations_data)
 
-def create_matrix_rain_animation():
-    """Create Matrix rain animation frames"""
-    frames = []
-    width, height = 60, 20
-    chars = "アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨラリルレロワヲン0123456789"
-    
-    # Initialize columns
-    columns = []
-    for x in range(width):
-        columns.append({
-            "y": random.randint(-height, 0),
-            "speed": random.choice([1, 2, 3]),
-            "chars": [random.choice(chars) for _ in range(random.randint(5, 15))],
-            "color": random.choice(["normal", "bright"])
-        })
-    
-    for frame_num in range(100):
-        grid = [[" " for _ in range(width)] for _ in range(height)]
-        
-        for x, col in enumerate(columns):
-            for i, char in enumerate(col["chars"]):
-                y = col["y"] + i
-                if 0 <= y < height:
-                    grid[y][x] = char
-            
-            col["y"] += col["speed"]
-            if col["y"] > height + len(col["chars"]):
-                col["y"] = random.randint(-height, -5)
-                col["speed"] = random.choice([1, 2, 3])
-                col["chars"] = [random.choice(chars) for _ in range(random.randint(5, 15))]
-        
-        frame = "\n".join("".join(row) for row in grid)
-        frames.append(frame)
-    
-    return frames
-
-def create_bouncing_ball_animation():
-    """Create bouncing ball animation frames"""
-    frames = []
-    width, height = 40, 20
-    x, y = width//2, height//2
-    dx, dy = 2, 1
-    
-    for i in range(100):
-        grid = [[" " for _ in range(width)] for _ in range(height)]
-        
-        # Draw borders
-        for j in range(width):
-            grid[0][j] = "─"
-            grid[height-1][j] = "─"
-        for j in range(height):
-            grid[j][0] = "│"
-            grid[j][width-1] = "│"
-        
-        # Corners
-        grid[0][0] = "┌"
-        grid[0][width-1] = "┐"
-        grid[height-1][0] = "└"
-        grid[height-1][width-1] = "┘"
-        
-        # Move ball
-        x += dx
-        y += dy
-        
-        # Bounce off walls
-        if x <= 1 or x >= width-2:
-            dx *= -1
-        if y <= 1 or y >= height-2:
-            dy *= -1
-        
-        # Draw ball with trail
-        grid[y][x] = "●"
-        if 0 <= y-dy < height and 0 <= x-dx < width:
-            grid[y-dy][x-dx] = "○"
-        
-        frame = "\n".join("".join(row) for row in grid)
-        frames.append(frame)
-    
-    return frames
+def canonical_seed(key, seed):
+    """Seed whose render is stored for (key, seed); deterministic animations share seed 0"""
+    return 0 if ANIMATION_GENERATORS.entry(key).deterministic else seed
 
-def create_ascii_art_reveal(art_name):
-    """Create ASCII art reveal animation frames"""
-    if art_name not in ascii_arts:
-        return [f"ASCII art '{art_name}' not found"]
-    
-    frames = []
-    art_lines = ascii_arts[art_name]
-    
-    # Create chaos version first
-    chaos_chars = list("░▒▓█▄▀▐▌▆▇▉▊▋●◉✦✧*+#@")
-    chaos_grid = []
-    
-    for line in art_lines:
-        chaos_line = ""
-        for char in line:
-            if char == " ":
-                chaos_line += " "
-            else:
-                chaos_line += random.choice(chaos_chars)
-        chaos_grid.append(chaos_line)
-    
-    # Start with chaos
-    frames.append("\n".join(chaos_grid))
-    
-    # Gradually reveal
-    positions = []
-    for row_idx, line in enumerate(art_lines):
-        for col_idx, char in enumerate(line):
-            if char != " ":
-                positions.append((row_idx, col_idx))
-    
-    random.shuffle(positions)
-    current_grid = [list(line) for line in chaos_grid]
-    
-    # Reveal in chunks
-    chunk_size = max(1, len(positions) // 30)  # 30 frames of reveal
-    
-    for i in range(0, len(positions), chunk_size):
-        chunk = positions[i:i+chunk_size]
-        for row_idx, col_idx in chunk:
-            current_grid[row_idx][col_idx] = art_lines[row_idx][col_idx]
-        
-        frame = "\n".join("".join(row) for row in current_grid)
-        frames.append(frame)
-    
-    # Add final clean version
-    frames.append("\n".join(art_lines))
-    
-    return frames
+def payload_fields(name, frames, seed, deterministic=False):
+    """Compact a frame list and describe it; returns (fields, frames) for encode_frames_payload"""
+    timeline = compact_frames(frames, FRAME_DELAY)
+    frames = timeline.pop("frames")
+    fields = {
+        "name": name,
+        "frame_delay": FRAME_DELAY,
+        "seed": None if deterministic else seed,
+        "deterministic": deterministic,
+        **timeline,
+        "checksums": frame_checksums(frames),
+    }
+    styles = [frame_styles(frame) for frame in frames]
+    colored = any(style is not None for style in styles)
+    if colored:
+        fields["palette"] = css_palette()
+    # Mostly-empty animations are sent as a sparse scene (see animations/scene.py)
+    scene = scene_fields(frames, styles, max_density=SPARSE_MAX_DENSITY)
+    if scene is not None:
+        frames = scene.pop("frames")
+        fields.update(scene)
+    elif colored:
+        fields["styles"] = styles
+    return fields, frames
 
-def create_devil_from_lava_animation():
-    """Create Devil from Lava animation frames"""
-    frames = []
-    width, height = 50, 20
-    lava_wave = [3, 5, 4, 6, 5, 7, 6, 5, 4, 5, 6, 5, 4, 3, 4, 5, 6, 7, 6, 5]
-    
-    # Enhanced devil ASCII art
-    devil = [
-        "      ▄▄████▄▄      ",
-        "    ██▀▀    ▀▀██    ",
-        "   ██  ▄▄  ▄▄  ██   ",
-        "   ██ ████████ ██   ",
-        "    ██  ████  ██    ",
-        "     ▀██▄▄▄▄██▀     ",
-        "       ██████       ",
-        "      ▄██  ██▄      ",
-        "     ██      ██     ",
-        "    ██   ▄▄   ██    ",
-        "   ██   ████   ██   ",
-        "   ██  ██████  ██   ",
-        "    ██  ████  ██    ",
-        "     ▀█▄▄▄▄▄▄█▀     ",
-        "        ████        ",
-        "       ██  ██       "
-    ]
-    
-    devil_h, devil_w = len(devil), len(devil[0]) if devil else 0
-    center_x = width // 2 - devil_w // 2
-    
-    for frame in range(60):
-        grid = [[" " for _ in range(width)] for _ in range(height)]
-        
-        # Create dynamic lava
-        for x in range(width):
-            base_wave = lava_wave[x % len(lava_wave)]
-            wave_h = int(height - 5 - (base_wave + math.sin(frame * 0.3 + x * 0.2) * 2))
-            wave_h = max(0, min(height - 1, wave_h))
-            
-            for y in range(wave_h, height):
-                intensity = (height - y) / (height - wave_h + 1)
-                if intensity > 0.8:
-                    grid[y][x] = "█"
-                elif intensity > 0.6:
-                    grid[y][x] = "▓"
-                elif intensity > 0.4:
-                    grid[y][x] = "▒"
-                elif intensity > 0.2:
-                    grid[y][x] = "░"
-                else:
-                    grid[y][x] = random.choice(["*", "+", "·"])
-        
-        # Devil rising from lava
-        devil_y = height - frame * 0.4
-        if devil_y < height:
-            for dr in range(devil_h):
-                gr = int(devil_y + dr)
-                if 0 <= gr < height:
-                    for dc in range(devil_w):
-                        if center_x + dc < width and devil[dr][dc] != " ":
-                            grid[gr][center_x + dc] = devil[dr][dc]
-        
-        # Add embers and sparks
-        for _ in range(8):
-            x = random.randint(0, width - 1)
-            y = random.randint(0, height // 2)
-            if grid[y][x] == " ":
-                grid[y][x] = random.choice(["*", "+", "✦", "✧", "◦"])
-        
-        frame_str = "\n".join("".join(row) for row in grid)
-        frames.append(frame_str)
-    
-    return frames
+def variant_key(key, seed, quality=FULL):
+    """Store key of one rendered variant; lower-quality renders are kept apart"""
+    return f"{key}:{seed}" if quality is FULL else f"{key}:{seed}:{quality.name}"
 
-def create_wave_animation():
-    """Create Wave Pattern animation frames"""
-    frames = []
-    width, height = 70, 20
-    
-    for frame in range(100):
-        grid = [[" " for _ in range(width)] for _ in range(height)]
-        
-        # Create multiple wave layers
-        for x in range(width):
-            # Primary wave
-            y1 = int(height // 2 + math.sin(frame * 0.15 + x * 0.1) * 4)
-            # Secondary wave
-            y2 = int(height // 2 + math.sin(frame * 0.1 + x * 0.08) * 3)
-            # Tertiary wave
-            y3 = int(height // 2 + math.sin(frame * 0.2 + x * 0.12) * 2)
-            
-            # Draw waves with different characters
-            waves = [(y1, "~"), (y2, "≈"), (y3, "∼")]
-            
-            for y, char in waves:
-                if 0 <= y < height:
-                    grid[y][x] = char
-                
-                # Add wave crests
-                if abs(math.sin(frame * 0.15 + x * 0.1)) > 0.9:
-                    if 0 <= y - 1 < height:
-                        grid[y - 1][x] = "^"
-                    if 0 <= y + 1 < height:
-                        grid[y + 1][x] = "v"
-        
-        # Add foam particles
-        for _ in range(10):
-            x = random.randint(0, width - 1)
-            y = random.randint(height // 3, 2 * height // 3)
-            if grid[y][x] == " ":
-                grid[y][x] = random.choice(["·", "°", "◦", "∘"])
-        
-        frame_str = "\n".join("".join(row) for row in grid)
-        frames.append(frame_str)
-    
-    return frames
+def render_variant(key, seed, quality=FULL):
+    """Render one seeded variant of an animation and keep it in the stores"""
+    name, generator = ANIMATION_GENERATORS[key]
+    kwargs = {} if quality is FULL else {"quality": quality}
+    # Animations declared deterministic in the registry share one render for every seed
+    deterministic = ANIMATION_GENERATORS.entry(key).deterministic
+    if deterministic:
+        seed = 0
+    start = time.perf_counter()
+    frames = generator(seed=seed, **kwargs)
+    governor.record_render(key, quality.name, time.perf_counter() - start, degraded=quality is not FULL)
+    cache_key = variant_key(key, seed, quality)
+    
+    fields, frames = payload_fields(name, frames, seed, deterministic)
+    if quality is not FULL:
+        fields["quality"] = quality.name
+    body, spans = encode_frames_payload(fields, frames)
+    # Only full-quality renders outlive the load that caused the others
+    if disk_store is not None and 0 <= seed < FRAME_VARIANTS and quality is FULL:
+        try:
+            disk_store.put(cache_key, body, spans)
+        except OSError as e:
+            app.logger.warning("Could not persist %s: %s", cache_key, e)
+    frame_store.put(cache_key, body)
+    return body
 
-def create_dna_helix_animation():
-    """Create DNA Helix animation frames"""
-    frames = []
-    width, height = 40, 25
-    
-    for frame in range(80):
-        grid = [[" " for _ in range(width)] for _ in range(height)]
-        
-        center_x = width // 2
-        
-        # Draw the DNA double helix
-        for y in range(height):
-            # Calculate the angle for this row
-            angle = frame * 0.2 + y * 0.4
-            
-            # Left and right strands
-            x1 = int(center_x + 10 * math.cos(angle))
-            x2 = int(center_x + 10 * math.cos(angle + math.pi))
-            
-            # Draw backbone
-            if 0 <= x1 < width:
-                grid[y][x1] = "●"
-            if 0 <= x2 < width:
-                grid[y][x2] = "●"
-            
-            # Draw base pairs (connecting lines) every few rows
-            if y % 4 == 0:
-                x_min, x_max = min(x1, x2), max(x1, x2)
-                for x in range(x_min + 1, x_max):
-                    if 0 <= x < width:
-                        # Use different base pair characters
-                        if (y // 4) % 4 == 0:
-                            grid[y][x] = "─"
-                        elif (y // 4) % 4 == 1:
-                            grid[y][x] = "═"
-                        elif (y // 4) % 4 == 2:
-                            grid[y][x] = "⋯"
-                        else:
-                            grid[y][x] = "┅"
-                
-                # Add base letters at connection points
-                mid_x = (x1 + x2) // 2
-                if 0 <= mid_x < width:
-                    bases = ["A", "T", "G", "C"]
-                    grid[y][mid_x] = bases[(y // 4) % 4]
-        
-        frame_str = "\n".join("".join(row) for row in grid)
-        frames.append(frame_str)
-    
-    return frames
+def cached_payload(cache_key):
+    """Stored JSON bytes from memory or disk, or None"""
+    data = frame_store.get(cache_key)
+    if data is None and disk_store is not None:
+        frame_file = disk_store.get(cache_key)
+        if frame_file is not None:
+            data = bytes(frame_file.body())
+    return data
 
-def create_spiral_galaxy_animation():
-    """Create Spiral Galaxy animation frames"""
-    frames = []
-    width, height = 60, 30
-    
-    for frame in range(120):
-        grid = [[" " for _ in range(width)] for _ in range(height)]
-        
-        cx, cy = width // 2, height // 2
-        
-        # Create spiral arms
-        for arm in range(4):
-            arm_offset = arm * math.pi / 2
-            
-            # Draw spiral arm
-            for r in range(1, min(width // 2, height)):
-                angle = arm_offset + frame * 0.05 + r * 0.2
-                
-                # Calculate position
-                x = int(cx + r * math.cos(angle))
-                y = int(cy + r * math.sin(angle) * 0.6)  # Flatten vertically
-                
-                if 0 <= x < width and 0 <= y < height:
-                    # Distance from center affects brightness
-                    distance = math.sqrt((x - cx) ** 2 + (y - cy) ** 2)
-                    
-                    if distance < 3:
-                        grid[y][x] = "◯"  # Core
-                    elif distance < 8:
-                        grid[y][x] = "●"  # Inner spiral
-                    elif distance < 15:
-                        grid[y][x] = "◉"  # Mid spiral
-                    else:
-                        grid[y][x] = random.choice(["○", "*", "·", "✦"])
-        
-        # Add background stars
-        for _ in range(30):
-            x = random.randint(0, width - 1)
-            y = random.randint(0, height - 1)
-            if grid[y][x] == " ":
-                grid[y][x] = random.choice(["·", "∘", "°", "+"])
-        
-        # Add central black hole
-        if 0 <= cx < width and 0 <= cy < height:
-            grid[cy][cx] = "⬤"
-        
-        frame_str = "\n".join("".join(row) for row in grid)
-        frames.append(frame_str)
-    
-    return frames
+def lookup_payload(key, seed):
+    """
+    (cache_key, JSON bytes) for one variant of an animation. Serves a stored
+    render when the current quality level allows it, else renders at that
+    level's quality.
+    """
+    level = governor.level()
+    seed = canonical_seed(key, seed)
+    qualities = QUALITIES[:level + 1]
+    for quality in qualities:
+        cache_key = variant_key(key, seed, quality)
+        data = cached_payload(cache_key)
+        if data is not None:
+            return cache_key, data
+    if level >= CACHED_ONLY:
+        # Any stored variant beats rendering one
+        for other in range(FRAME_VARIANTS):
+            for quality in qualities:
+                cache_key = variant_key(key, other, quality)
+                data = cached_payload(cache_key)
+                if data is not None:
+                    governor.record_cached_only_hit()
+                    return cache_key, data
+    quality = governor.quality(level) if ANIMATION_GENERATORS.entry(key).scalable else FULL
+    data = render_variant(key, seed, quality)
+    return variant_key(key, canonical_seed(key, seed), quality), data
 
-def create_fire_animation():
-    """Create Fire Effect animation frames"""
-    frames = []
-    width, height = 50, 25
-    
-    for frame in range(120):
-        grid = [[" " for _ in range(width)] for _ in range(height)]
-        
-        # Create fire base
-        base_height = height - 3
-        
-        for x in range(width):
-            # Create random flame height
-            flame_intensity = random.uniform(0.6, 1.0)
-            flame_height = int(base_height * flame_intensity)
-            
-            # Add wind effect
-            wind_offset = int(math.sin(frame * 0.1 + x * 0.1) * 2)
-            
-            for y in range(height - flame_height, height):
-                actual_x = max(0, min(width - 1, x + wind_offset))
-                
-                # Distance from base affects character choice
-                distance_from_base = height - y
-                heat_intensity = distance_from_base / flame_height
-                
-                if heat_intensity > 0.9:
-                    grid[y][actual_x] = "█"
-                elif heat_intensity > 0.7:
-                    grid[y][actual_x] = "▓"
-                elif heat_intensity > 0.5:
-                    grid[y][actual_x] = "▒"
-                elif heat_intensity > 0.3:
-                    grid[y][actual_x] = "░"
-                elif heat_intensity > 0.1:
-                    grid[y][actual_x] = random.choice(["*", "+", "^"])
-                else:
-                    grid[y][actual_x] = random.choice(["·", "°", "∘"])
-        
-        # Add sparks and embers
-        for _ in range(15):
-            x = random.randint(0, width - 1)
-            y = random.randint(0, height // 2)
-            if grid[y][x] == " ":
-                grid[y][x] = random.choice(["*", "+", "✦", "✧", "◦", "°"])
-        
-        # Add flickering effect
-        for _ in range(width // 3):
-            x = random.randint(0, width - 1)
-            y = random.randint(height // 2, height - 1)
-            grid[y][x] = random.choice(["▄", "▀", "▌", "▐"])
-        
-        frame_str = "\n".join("".join(row) for row in grid)
-        frames.append(frame_str)
-    
-    return frames
-
-# Animation registry with frame generators
-ANIMATION_GENERATORS = {
-    "1": ("Orbital Motion", create_orbital_animation),
-    "2": ("Binary Stars", create_binary_stars_animation),
-    "3": ("Devil from Lava", create_devil_from_lava_animation),
-    "4": ("Matrix Rain", create_matrix_rain_animation),
-    "5": ("Bouncing Ball", create_bouncing_ball_animation),
-    "6": ("Wave Pattern", create_wave_animation),
-    "7": ("DNA Helix", create_dna_helix_animation),
-    "8": ("Spiral Galaxy", create_spiral_galaxy_animation),
-    "9": ("Fire Effect", create_fire_animation),
-    "10": ("Animate Berserk Logo", lambda: create_ascii_art_reveal("berserk logo")),
-    "11": ("Animate Monas", lambda: create_ascii_art_reveal("monas")),
-    "12": ("Animate Onkar", lambda: create_ascii_art_reveal("onkar")),
-    "13": ("Animate Cyberpunk", lambda: create_ascii_art_reveal("cyberpunk")),
-}
+def get_payload(key, seed):
+    """Return the JSON bytes for one variant of an animation, rendering on a miss"""
+    return lookup_payload(key, seed)[1]
 
-@app.route('/')
-def index():
-    # Create a clean data structure for the template (no functions)
-    animations_data = {}
-    for key, (name, _) in ANIMATION_GENERATORS.items():
-        animations_data[key] = name
-    
-    return render_template('index.html', animations=animations_data)
+def formatted_payload(key, seed, fmt):
+    """A variant converted to ?format= sparse or dense, cached next to the original"""
+    seed = canonical_seed(key, seed)
+    data = frame_store.get(f"{variant_key(key, seed)}:{fmt}")
+    if data is None:
+        cache_key, original = lookup_payload(key, seed)
+        data = frame_store.get(f"{cache_key}:{fmt}")
+        if data is None:
+            payload = convert_payload(json.loads(original), fmt)
+            frames = payload.pop("frames")
+            data, _ = encode_frames_payload(payload, frames)
+            frame_store.put(f"{cache_key}:{fmt}", data)
+    return data
+
+def payload_response(key, seed, fmt=None):
+    """Serve a variant from memory, from disk via a file wrapper, or render it"""
+    if fmt is not None:
+        return Response(formatted_payload(key, seed, fmt), mimetype="application/json")
+    seed = canonical_seed(key, seed)
+    cache_key = variant_key(key, seed)
+    data = frame_store.get(cache_key)
+    if data is None and disk_store is not None:
+        frame_file = disk_store.get(cache_key)
+        if frame_file is not None:
+            response = Response(
+                wrap_file(request.environ, frame_file.open_body()),
+                mimetype="application/json",
+                direct_passthrough=True
+            )
+            response.content_length = frame_file.body_length
+            return response
+    if data is None:
+        data = get_payload(key, seed)
+    return Response(data, mimetype="application/json")
+
+def parse_seed(value):
+    """A seed from a query string; ValueError unless it is an integer in 0..MAX_SEED-1"""
+    seed = int(value)
+    if not 0 <= seed < MAX_SEED:
+        raise ValueError(value)
+    return seed
+
+def request_seed():
+    """The ?seed= query parameter, or one of the cached variants at random"""
+    seed = request.args.get("seed")
+    if seed is None:
+        return random.randrange(FRAME_VARIANTS)
+    return parse_seed(seed)
+
+def request_format():
+    """The ?format= query parameter: None (the server picks), "sparse" or "dense"."""
+    fmt = request.args.get("format", "auto")
+    if fmt not in ("auto", "sparse", "dense"):
+        raise ValueError(fmt)
+    return None if fmt == "auto" else fmt
 
 @app.route('/get_animation/<key>')
 def get_animation(key):
@@ -559,21 +267,95 @@ def get_animation(key):
     if key not in ANIMATION_GENERATORS:
         return jsonify({"error": "Animation not found"}), 404
     
-    name, generator = ANIMATION_GENERATORS[key]
+    try:
+        seed = request_seed()
+    except ValueError:
+        return jsonify({"error": SEED_ERROR}), 400
+    try:
+        fmt = request_format()
+    except ValueError:
+        return jsonify({"error": "format must be auto, sparse or dense"}), 400
     
     try:
-        # Generate frames
-        frames = generator()
-        
-        return jsonify({
-            "name": name,
-            "frames": frames,
-            "frame_delay": 100  # milliseconds between frames
-        })
+        return payload_response(key, seed, fmt)
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# === Batches ===
+# /get_animations renders (or loads) its items on a shared thread pool and
+# streams each one as soon as it is ready. The pool is created on first use,
+# so every prefork worker gets its own after the fork.
+batch_executor = None
+batch_executor_lock = threading.Lock()
+
+def get_batch_executor():
+    global batch_executor
+    with batch_executor_lock:
+        if batch_executor is None:
+            batch_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="batch")
+        return batch_executor
+
+def batch_keys():
+    """The ?keys= query parameter as a list of distinct keys, in request order"""
+    keys = []
+    for key in request.args.get("keys", "").split(","):
+        key = key.strip()
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+def batch_item(key, seed, fmt):
+    """One NDJSON line: the payload with its key spliced in, or an error"""
+    if key not in ANIMATION_GENERATORS:
+        return batch_error(key, "Animation not found", 404)
+    try:
+        data = get_payload(key, seed) if fmt is None else formatted_payload(key, seed, fmt)
+    except Exception as e:
+        app.logger.warning("Batch item %s failed: %s", key, e)
+        return batch_error(key, str(e), 500)
+    # Payloads are compact JSON objects, so the key can go in without re-encoding them
+    return b'{"key":' + json.dumps(key).encode() + b"," + data[1:] + b"\n"
+
+def batch_error(key, message, status):
+    return (json.dumps({"key": key, "error": message, "status": status}) + "\n").encode()
+
+@app.route('/get_animations')
+def get_animations():
+    """Stream several animations as newline-delimited JSON, in completion order"""
+    keys = batch_keys()
+    if not keys:
+        return jsonify({"error": "keys must list at least one animation"}), 400
+    if len(keys) > MAX_BATCH_KEYS:
+        return jsonify({"error": f"at most {MAX_BATCH_KEYS} keys per request"}), 400
+    seed = request.args.get("seed")
+    try:
+        seed = None if seed is None else parse_seed(seed)
+    except ValueError:
+        return jsonify({"error": SEED_ERROR}), 400
+    try:
+        fmt = request_format()
+    except ValueError:
+        return jsonify({"error": "format must be auto, sparse or dense"}), 400
+
+    executor = get_batch_executor()
+    # Without ?seed= each item picks its own cached variant
+    futures = {
+        executor.submit(batch_item, key, random.randrange(FRAME_VARIANTS) if seed is None else seed, fmt): key
+        for key in keys
+    }
+
+    def generate():
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # The client went away: drop items that haven't started yet
+            for future in futures:
+                future.cancel()
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
 @app.route('/get_slideshow')
 def get_slideshow():
     """Get all animations for slideshow"""
@@ -581,12 +363,11 @@ def get_slideshow():
         slideshow_data = []
         
         for key in sorted(ANIMATION_GENERATORS.keys(), key=int):
-            name, generator = ANIMATION_GENERATORS[key]
-            frames = generator()
+            payload = json.loads(get_payload(key, random.randrange(FRAME_VARIANTS)))
+            payload.pop("checksums", None)
             slideshow_data.append({
                 "key": key,
-                "name": name,
-                "frames": frames,
+                **payload,
                 "duration": 12000  # 12 seconds per animation
             })
         
@@ -595,7 +376,191 @@ def get_slideshow():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/export/<key>.cast')
+def export_cast(key):
+    """Stream an animation as an asciicast v2 recording"""
+    if key not in ANIMATION_GENERATORS:
+        return jsonify({"error": "Animation not found"}), 404
+    
+    try:
+        seed = request_seed()
+    except ValueError:
+        return jsonify({"error": SEED_ERROR}), 400
+    
+    payload = convert_payload(json.loads(get_payload(key, seed)), "dense")
+    lines = iter_cast(payload["name"], iter_timeline(payload))
+    return Response(
+        lines,
+        mimetype="application/x-asciicast",
+        headers={"Content-Disposition": f'attachment; filename="animation-{key}.cast"'}
+    )
+
+@app.route('/banner')
+def banner():
+    """Render ?text= in a FIGlet ?font=; ?reveal=1 returns a reveal animation of it"""
+    text = request.args.get("text", "")
+    font = request.args.get("font", DEFAULT_FONT)
+    if not text.strip():
+        return jsonify({"error": "text is required"}), 400
+    if len(text) > MAX_BANNER_TEXT:
+        return jsonify({"error": f"text is limited to {MAX_BANNER_TEXT} characters"}), 400
+    
+    try:
+        lines = render_banner(text, font)
+    except (FileNotFoundError, ValueError):
+        return jsonify({"error": f"Unknown font: {font}", "fonts": list_fonts()}), 404
+    
+    if request.args.get("reveal") != "1":
+        return Response("\n".join(lines) + "\n", mimetype="text/plain")
+    
+    try:
+        seed = request_seed()
+    except ValueError:
+        return jsonify({"error": SEED_ERROR}), 400
+    from animations.frame_animations import create_ascii_art_reveal
+    frames = create_ascii_art_reveal(text, seed=seed, lines=lines)
+    body, _ = encode_frames_payload(*payload_fields(text, frames, seed))
+    return Response(body, mimetype="application/json")
+
+# === Load Governor ===
+@app.before_request
+def count_request():
+    if request.endpoint != "static":
+        g.governed = True
+        governor.request_started()
+
+@app.teardown_request
+def uncount_request(exc):
+    if g.pop("governed", False):
+        governor.request_finished()
+
+@app.after_request
+def report_quality(response):
+    response.headers["X-Quality"] = LEVEL_NAMES[governor.level()]
+    return response
+
+@app.route('/metrics')
+def metrics():
+    """Current quality level and the load signals behind it"""
+    return jsonify(governor.metrics())
+
+# === Debug endpoints ===
+# Enabled only when DEBUG_TOKEN is set; callers must send it as a bearer token.
+DEBUG_TOKEN = os.environ.get("DEBUG_TOKEN")
+MAX_DEBUG_SECONDS = 60
+
+def debug_request_seconds():
+    """Check the debug token and return the requested window, or an error response"""
+    if not DEBUG_TOKEN:
+        return None, (jsonify({"error": "Not found"}), 404)
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    if not hmac.compare_digest(supplied, DEBUG_TOKEN):
+        return None, (jsonify({"error": "Unauthorized"}), 401)
+    try:
+        seconds = float(request.args.get("seconds", 5))
+    except ValueError:
+        return None, (jsonify({"error": "seconds must be a number"}), 400)
+    return max(0.1, min(seconds, MAX_DEBUG_SECONDS)), None
+
+@app.route('/debug/profile')
+def debug_profile():
+    """Sample all threads for ?seconds=N and return collapsed stacks"""
+    seconds, error = debug_request_seconds()
+    if error:
+        return error
+    
+    stacks, generators, rounds = profiling.sample_stacks(seconds)
+    if request.args.get("idle") != "1":
+        stacks = Counter({k: v for k, v in stacks.items() if not profiling.idle_stack(k)})
+    
+    if request.args.get("format") == "json":
+        busy = sum(stacks.values())
+        return jsonify({
+            "seconds": seconds,
+            "samples": rounds,
+            "busy_samples": busy,
+            "generators": {
+                name: {"samples": count, "share": round(count / busy, 4) if busy else 0}
+                for name, count in generators.most_common()
+            },
+            "stacks": dict(stacks.most_common(50)),
+        })
+    return Response(profiling.collapsed(stacks), mimetype="text/plain")
+
+@app.route('/debug/alloc')
+def debug_alloc():
+    """Diff tracemalloc snapshots across ?seconds=N, focused on /get_animation handling"""
+    seconds, error = debug_request_seconds()
+    if error:
+        return error
+    
+    report = profiling.trace_allocations(
+        seconds,
+        limit=int(request.args.get("limit", 20)),
+        focus=[get_animation, payload_response, render_variant]
+    )
+    return jsonify(report)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="🎨 ASCII Animation Gallery server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 5000)))
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        help="Number of worker processes (>1 enables prefork mode with a shared-memory frame store; "
+             "default $WORKERS or 1, not combinable with --async)"
+    )
+    parser.add_argument(
+        "--store-blocks",
+        type=int,
+        default=256,
+        help="Number of 1 MiB blocks in the shared frame store (prefork mode only)"
+    )
+    parser.add_argument(
+        "--store-dir",
+        default=os.environ.get("FRAME_STORE_DIR", "frame_cache"),
+        help="Directory for persisted rendered variants (empty string disables)"
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Serve from one asyncio event loop, with /stream/<key> for long-lived viewers"
+    )
+    parser.add_argument(
+        "--rss-limit-mb",
+        type=int,
+        default=int(os.environ.get("RSS_LIMIT_MB", 512)),
+        help="Per-process memory the load governor lowers quality against"
+    )
+    parser.add_argument(
+        "--no-governor",
+        action="store_true",
+        help="Always render at full quality"
+    )
+    args = parser.parse_args()
+    if args.use_async and args.workers is not None and args.workers > 1:
+        parser.error("--async serves from a single process; it cannot be combined with --workers")
+    if args.workers is None:
+        # Ignored in async mode, so an image-wide WORKERS doesn't block --async
+        args.workers = int(os.environ.get("WORKERS", 1))
+    return args
+
 if __name__ == '__main__':
+    args = parse_args()
     print("🎨 ASCII Animation Gallery (Terminal Modal Version) starting...")
     print("Available animations:", list(ANIMATION_GENERATORS.keys()))
-    app.run(host='0.0.0.0', debug=False, threaded=True, port=5000)
\ No newline at end of file
+    governor = LoadGovernor(rss_limit_mb=args.rss_limit_mb, enabled=not args.no_governor)
+    if args.store_dir:
+        disk_store = DiskFrameStore(args.store_dir, code_version(GENERATOR_SOURCES, media=media_paths()))
+        print(f"💾 Loaded {disk_store.load()} rendered variants from {args.store_dir}")
+    if args.use_async:
+        from async_server import serve_async
+        serve_async(sys.modules[__name__], host=args.host, port=args.port)
+    elif args.workers > 1:
+        from prefork import serve_prefork
+        frame_store = SharedFrameStore(block_count=args.store_blocks)
+        serve_prefork(app, frame_store, host=args.host, port=args.port, workers=args.workers)
+    else:
+        app.run(host=args.host, debug=False, threaded=True, port=args.port)
@@ -0,0 +1,319 @@
+# async_server.py
+"""
+asyncio serving mode (`python app.py --async`): one event loop, stdlib only.
+
+Threaded Werkzeug spends an OS thread on every open connection, which caps a
+container at a few hundred long-lived viewers. Here every connection is a
+coroutine on a single event loop:
+
+    /stream/<key>   - native: an animation streamed forever as terminal output
+                      (`curl -N host:5000/stream/1`), paced on the loop
+    everything else - the Flask app, called on a small thread pool, so the
+                      index page, static files and /get_animation JSON behave
+                      exactly as in the other modes and generation never runs
+                      on the loop
+
+A stream's output is prepared once per rendered variant and shared by every
+connection watching it: each frame as a keyframe (clear + full frame) and
+as a diff from the frame before (see animations/asciicast.py). A connection
+holds an index into those frames and a small socket send buffer, and only
+writes a frame once the previous one has been handed to the kernel, so it
+keeps at most one frame's unsent tail of its own; memory grows by a fixed
+few KB per viewer however slowly it reads. A viewer that falls behind skips to the current frame and
+is sent that frame whole.
+"""
+import asyncio
+import io
+import json
+import random
+import resource
+import socket
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote
+
+from animations.asciicast import CSI, diff_frame
+from animations.scene import convert_payload
+
+EXECUTOR_WORKERS = 8  # threads running Flask requests and renders
+STREAM_CACHE_SIZE = 64  # variants whose stream output is kept
+STREAM_SNDBUF = 8 * 1024  # kernel send buffer per stream
+MAX_HEADERS = 100
+MAX_BODY = 64 * 1024  # bytes; every route is a GET
+KEEPALIVE_TIMEOUT = 15  # seconds an idle keep-alive connection stays open
+BACKLOG = 4096
+
+# === Streams ===
+class FrameStream:
+    """One variant's terminal output, shared by every connection watching it."""
+
+    def __init__(self, payload):
+        payload = convert_payload(payload, "dense")
+        frames = payload["frames"]
+        delay = payload.get("frame_delay", 100)
+        self.name = payload["name"]
+        self.durations = [ms / 1000 for ms in payload.get("frame_durations") or [delay] * len(frames)]
+        self.loop_start = payload.get("loop_start") or 0
+        self.keyframes = [(CSI + "?25l" + diff_frame(None, frame)).encode() for frame in frames]
+        # diffs[i] turns frame i - 1 into frame i; restart turns the last frame into loop_start
+        self.diffs = [b""] + [diff_frame(frames[i - 1], frames[i]).encode() for i in range(1, len(frames))]
+        self.restart = diff_frame(frames[-1], frames[self.loop_start]).encode()
+
+    def __len__(self):
+        return len(self.keyframes)
+
+    def next(self, index):
+        return index + 1 if index + 1 < len(self) else self.loop_start
+
+    def output(self, shown, index):
+        """Bytes that turn the terminal from frame `shown` (None: unknown) into `index`."""
+        if shown is None:
+            return self.keyframes[index]
+        if shown == len(self) - 1 and index == self.loop_start:
+            return self.restart
+        return self.diffs[index]
+
+class StreamCache:
+    """FrameStreams by variant, built on the executor, least recently used evicted."""
+
+    def __init__(self, app_module, executor, size=STREAM_CACHE_SIZE):
+        self.app_module = app_module
+        self.executor = executor
+        self.size = size
+        self.streams = OrderedDict()
+        self.pending = {}
+
+    async def get(self, key, seed):
+        loop = asyncio.get_running_loop()
+        cache_key, data = await loop.run_in_executor(self.executor, self.app_module.lookup_payload, key, seed)
+        stream = self.streams.get(cache_key)
+        if stream is not None:
+            self.streams.move_to_end(cache_key)
+            return stream
+        # Viewers arriving together share one build
+        building = self.pending.get(cache_key)
+        if building is None:
+            building = self.pending[cache_key] = loop.run_in_executor(
+                self.executor, lambda: FrameStream(json.loads(data)))
+        try:
+            stream = await asyncio.shield(building)
+        finally:
+            self.pending.pop(cache_key, None)
+        self.streams[cache_key] = stream
+        while len(self.streams) > self.size:
+            self.streams.popitem(last=False)
+        return stream
+
+async def play(stream, writer):
+    """Write `stream` to `writer` until the client goes away."""
+    loop = asyncio.get_running_loop()
+    index = 0
+    shown = None
+    tick_at = loop.time()
+    while True:
+        writer.write(stream.output(shown, index))
+        await writer.drain()
+        shown = index
+        tick_at += stream.durations[index]
+        index = stream.next(index)
+        now = loop.time()
+        if tick_at + stream.durations[index] <= now:
+            # The client fell behind: jump to the frame due now and send it whole
+            while tick_at + stream.durations[index] <= now:
+                tick_at += stream.durations[index]
+                index = stream.next(index)
+            shown = None
+        await asyncio.sleep(max(0.0, tick_at - now))
+
+# === HTTP ===
+STATUS_TEXT = {400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+def _head(status, headers):
+    lines = [f"HTTP/1.1 {status}"] + [f"{name}: {value}" for name, value in headers]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+def _json_error(status, message):
+    body = json.dumps({"error": message}).encode()
+    return _head(f"{status} {STATUS_TEXT[status]}", [
+        ("Content-Type", "application/json"), ("Content-Length", str(len(body))),
+        ("Connection", "close"),
+    ]) + body
+
+async def read_request(reader):
+    """(method, target, version, headers, body) of the next request, or None at EOF."""
+    line = await reader.readline()
+    if not line:
+        return None
+    method, target, version = line.decode("latin-1").split()
+    headers = []
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) == MAX_HEADERS:
+            raise ValueError("too many headers")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers.append((name.strip(), value.strip()))
+    length = int(dict((k.lower(), v) for k, v in headers).get("content-length", 0) or 0)
+    if not 0 <= length <= MAX_BODY:
+        raise ValueError("request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, version, headers, body
+
+def wsgi_environ(method, target, version, headers, body, server, peer):
+    path, _, query = target.partition("?")
+    environ = {
+        "REQUEST_METHOD": method,
+        "SCRIPT_NAME": "",
+        "PATH_INFO": unquote(path, encoding="latin-1"),
+        "QUERY_STRING": query,
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": version,
+        "REMOTE_ADDR": peer[0] if peer else "",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in headers:
+        key = name.upper().replace("-", "_")
+        if key in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            environ[key] = value
+        else:
+            environ["HTTP_" + key] = value
+    return environ
+
+def call_wsgi(wsgi_app, environ):
+    """Start a WSGI response on an executor thread: (status, headers, first chunk, iterator)."""
+    started = []
+    def start_response(status, headers, exc_info=None):
+        started[:] = [status, headers]
+    iterable = wsgi_app(environ, start_response)
+    iterator = iter(iterable)
+    first = next(iterator, b"")
+    return started[0], started[1], first, iterable, iterator
+
+def _close(iterable):
+    if hasattr(iterable, "close"):
+        iterable.close()
+
+class AsyncServer:
+    def __init__(self, app_module, host="0.0.0.0", port=5000, workers=EXECUTOR_WORKERS):
+        self.app_module = app_module
+        self.wsgi_app = app_module.app.wsgi_app
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="async")
+        self.streams = StreamCache(app_module, self.executor)
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        peer = writer.get_extra_info("peername")
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), KEEPALIVE_TIMEOUT)
+                except ValueError:
+                    writer.write(_json_error(400, "malformed request"))
+                    break
+                if request is None:
+                    break
+                method, target, version, headers, _ = request
+                if target.startswith("/stream/"):
+                    await self.stream(target, writer)
+                    break
+                keep_alive = await self.forward(request, writer, peer)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def forward(self, request, writer, peer):
+        """Serve one request with the Flask app; returns True to keep the connection."""
+        loop = asyncio.get_running_loop()
+        method, target, version, headers, body = request
+        environ = wsgi_environ(method, target, version, headers, body, (self.host, self.port), peer)
+        status, response_headers, chunk, iterable, iterator = await loop.run_in_executor(
+            self.executor, call_wsgi, self.wsgi_app, environ)
+        try:
+            names = {name.lower() for name, _ in response_headers}
+            connection = dict((k.lower(), v.lower()) for k, v in headers).get("connection", "")
+            # Without a length the body ends when the connection closes
+            keep_alive = (version == "HTTP/1.1" and connection != "close" and "content-length" in names)
+            response_headers = list(response_headers) + [("Connection", "keep-alive" if keep_alive else "close")]
+            writer.write(_head(status, response_headers))
+            while chunk:
+                writer.write(chunk)
+                await writer.drain()
+                chunk = await loop.run_in_executor(self.executor, next, iterator, b"")
+            await writer.drain()
+        finally:
+            await loop.run_in_executor(self.executor, _close, iterable)
+        return keep_alive
+
+    async def stream(self, target, writer):
+        path, _, query = target.partition("?")
+        key = unquote(path[len("/stream/"):])
+        args = parse_qs(query)
+        if key not in self.app_module.ANIMATION_GENERATORS:
+            writer.write(_json_error(404, "Animation not found"))
+            return
+        try:
+            seed = self.app_module.parse_seed(args["seed"][0]) if "seed" in args else None
+        except ValueError:
+            writer.write(_json_error(400, self.app_module.SEED_ERROR))
+            return
+        if seed is None:
+            seed = random.randrange(self.app_module.FRAME_VARIANTS)
+        try:
+            stream = await self.streams.get(key, seed)
+        except Exception as e:
+            # Nothing has been written yet, so the viewer can still get a proper error
+            print(f"❌ Could not build stream {key}:{seed}: {e!r}")
+            writer.write(_json_error(500, "Could not render animation"))
+            return
+
+        transport = writer.transport
+        # drain() waits until the buffer is empty: buffered bytes are copies
+        transport.set_write_buffer_limits(high=0)
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, STREAM_SNDBUF)
+        writer.write(_head("200 OK", [
+            ("Content-Type", "text/plain; charset=utf-8"),
+            ("Cache-Control", "no-cache"),
+            ("X-Animation", stream.name.encode("ascii", "replace").decode()),
+            ("Connection", "close"),
+        ]))
+        await play(stream, writer)
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle, self.host, self.port, backlog=BACKLOG)
+        print(f"⚡ asyncio server on {self.host}:{self.port} (streams at /stream/<key>)")
+        async with server:
+            await server.serve_forever()
+
+def raise_fd_limit():
+    """Allow as many open connections as the hard limit permits."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+def serve_async(app_module, host="0.0.0.0", port=5000):
+    """Run the app on an asyncio event loop until interrupted."""
+    limit = raise_fd_limit()
+    print(f"🔌 Up to {limit} open connections")
+    try:
+        asyncio.run(AsyncServer(app_module, host, port).serve())
+    except KeyboardInterrupt:
+        pass
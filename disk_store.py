@@ -0,0 +1,180 @@
+# disk_store.py
+"""
+Persistent on-disk store for rendered animation variants.
+
+One file per variant, written atomically after generation:
+
+    header        : magic, format version, code version, frame count,
+                    body offset, body length
+    offset table  : (offset, length) of every frame string inside the body
+    body          : the exact JSON payload served by /get_animation
+
+The body is the last section of the file, so a response is just "open, seek
+to body offset, hand the file to the server". Werkzeug wraps it in a file
+wrapper and servers with sendfile support (gunicorn, uwsgi) push the bytes
+straight from the page cache without Python copying them.
+
+Files are mapped with mmap when loaded. The code version is a hash of the
+generator sources, so editing a generator invalidates every stale file.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from urllib.parse import quote, unquote
+
+HEADER = struct.Struct("<8sH20sIII")
+FRAME_ENTRY = struct.Struct("<II")
+MAGIC = b"ASCIIFRM"
+FORMAT_VERSION = 2  # 2: file names are percent-encoded keys
+
+def code_version(paths, media=()):
+    """
+    Hash the given source files into a 20-byte version digest. Media files
+    (images, video clips) can be large, so they count by name, size and mtime.
+    """
+    digest = hashlib.sha1(FORMAT_VERSION.to_bytes(2, "little"))
+    for path in sorted(paths):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    for path in sorted(media):
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.digest()
+
+def encode_frames_payload(fields, frames):
+    """
+    Build the JSON payload for `fields` plus a "frames" list, returning
+    (body, spans) where spans are the (offset, length) of each encoded frame.
+    """
+    head = json.dumps(fields, ensure_ascii=False, separators=(",", ":"))
+    parts = [head[:-1].encode("utf-8"), b',"frames":[']
+    offset = len(parts[0]) + len(parts[1])
+    spans = []
+    for i, frame in enumerate(frames):
+        if i:
+            parts.append(b",")
+            offset += 1
+        encoded = json.dumps(frame, ensure_ascii=False).encode("utf-8")
+        spans.append((offset, len(encoded)))
+        parts.append(encoded)
+        offset += len(encoded)
+    parts.append(b"]}")
+    return b"".join(parts), spans
+
+class FrameFile:
+    """A validated, memory-mapped variant file."""
+
+    def __init__(self, path, mm, frame_count, body_offset, body_length):
+        self.path = path
+        self.mm = mm
+        self.frame_count = frame_count
+        self.body_offset = body_offset
+        self.body_length = body_length
+
+    def body(self):
+        return memoryview(self.mm)[self.body_offset:self.body_offset + self.body_length]
+
+    def frame(self, index):
+        """Return the decoded text of one frame without touching the others."""
+        entry = HEADER.size + index * FRAME_ENTRY.size
+        offset, length = FRAME_ENTRY.unpack_from(self.mm, entry)
+        start = self.body_offset + offset
+        return json.loads(self.mm[start:start + length])
+
+    def open_body(self):
+        """Open the file positioned at the body, ready for a file wrapper."""
+        f = open(self.path, "rb")
+        f.seek(self.body_offset)
+        return f
+
+class DiskFrameStore:
+    def __init__(self, directory, version):
+        self.directory = directory
+        self.version = version
+        self.files = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        # Percent-encoded so load() can recover any key, whatever it contains
+        return os.path.join(self.directory, f"{quote(key, safe='')}.frames")
+
+    def _open(self, path):
+        """Map and validate a file, deleting it if it is stale or corrupt."""
+        try:
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            magic, fmt, version, count, body_offset, body_length = HEADER.unpack_from(mm, 0)
+            valid = (magic == MAGIC and fmt == FORMAT_VERSION and version == self.version
+                     and body_offset + body_length == len(mm))
+        except struct.error:
+            valid = False
+        if not valid:
+            mm.close()
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return FrameFile(path, mm, count, body_offset, body_length)
+
+    def load(self):
+        """Map every valid file in the directory; stale versions are removed."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                # Left behind by a write that never reached os.replace()
+                os.remove(os.path.join(self.directory, name))
+                continue
+            if not name.endswith(".frames"):
+                continue
+            frame_file = self._open(os.path.join(self.directory, name))
+            if frame_file is not None:
+                self.files[unquote(name[:-len(".frames")])] = frame_file
+        return len(self.files)
+
+    def get(self, key):
+        frame_file = self.files.get(key)
+        if frame_file is None:
+            # Another worker process may have written it since we loaded
+            path = self._path(key)
+            if os.path.exists(path):
+                frame_file = self._open(path)
+                if frame_file is not None:
+                    self.files[key] = frame_file
+        return frame_file
+
+    def put(self, key, body, spans):
+        """Write a variant atomically (temp file + rename) and map it."""
+        body_offset = HEADER.size + FRAME_ENTRY.size * len(spans)
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, self.version, len(spans), body_offset, len(body))
+        table = b"".join(FRAME_ENTRY.pack(offset, length) for offset, length in spans)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(table)
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        frame_file = self._open(self._path(key))
+        if frame_file is not None:
+            self.files[key] = frame_file
+        return frame_file
+
+    def stats(self):
+        return {
+            "type": "disk",
+            "directory": self.directory,
+            "entries": len(self.files),
+            "bytes": sum(f.body_length for f in self.files.values()),
+        }
@@ -0,0 +1,232 @@
+# frame_store.py
+"""
+Stores for rendered animation payloads.
+
+Rendering an animation is the expensive part of a request, so every rendered
+variant is kept as the exact JSON bytes that were sent to the browser. The
+single-process server uses LocalFrameStore; the prefork server (--workers N)
+uses SharedFrameStore so that a variant rendered by one worker can be served
+by every other worker without rendering it again.
+"""
+import hashlib
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing import Lock, shared_memory
+
+# === In-process store ===
+class LocalFrameStore:
+    """Thread-safe LRU of payload bytes bounded by total size."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return False
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._items[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "type": "local",
+                "entries": len(self._items),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+# === Shared-memory store ===
+# Segment layout:
+#   header       : magic, block_count, block_size, hits, misses (store-wide)
+#   index        : one INDEX_ENTRY per block (key digest, length, last use, writer pid, state)
+#   data blocks  : block_count * block_size bytes
+# Each block holds at most one payload, so the index is just "which key lives
+# in block i" (by BLAKE2b digest of the key). Payloads larger than a block are
+# not shared.
+HEADER = struct.Struct("<8sIIQQ")
+COUNTERS = struct.Struct("<QQ")
+COUNTERS_OFFSET = HEADER.size - COUNTERS.size
+INDEX_ENTRY = struct.Struct("<32sIdIB3x")
+MAGIC = b"ASCIISHM"
+KEY_DIGEST_BYTES = 32
+
+FREE, WRITING, READY = 0, 1, 2
+STALE_WRITE_SECONDS = 60.0  # copying one block takes milliseconds; a writer this old is gone
+
+class SharedFrameStore:
+    """
+    Fixed-block payload store living in a multiprocessing.shared_memory segment.
+
+    Create it in the coordinator process *before* forking workers; children
+    inherit both the mapping and the lock. Workers only ever fill free blocks,
+    the coordinator reclaims space by calling evict() (LRU by last access).
+    Hit and miss counters live in the segment too, so stats() from any
+    process covers every worker.
+    """
+
+    def __init__(self, block_count=256, block_size=1024 * 1024):
+        self.block_count = block_count
+        self.block_size = block_size
+        self.index_offset = HEADER.size
+        self.data_offset = HEADER.size + INDEX_ENTRY.size * block_count
+        total = self.data_offset + block_count * block_size
+        self.shm = shared_memory.SharedMemory(create=True, size=total)
+        self.lock = Lock()
+        HEADER.pack_into(self.shm.buf, 0, MAGIC, block_count, block_size, 0, 0)
+        for i in range(block_count):
+            INDEX_ENTRY.pack_into(self.shm.buf, self._entry_offset(i), b"", 0, 0.0, 0, FREE)
+
+    def _entry_offset(self, block):
+        return self.index_offset + block * INDEX_ENTRY.size
+
+    def _block_offset(self, block):
+        return self.data_offset + block * self.block_size
+
+    def _entries(self):
+        buf = self.shm.buf
+        for i in range(self.block_count):
+            yield (i,) + INDEX_ENTRY.unpack_from(buf, self._entry_offset(i))
+
+    def _count(self, hit):
+        """Bump the shared hit or miss counter; call with the lock held."""
+        hits, misses = COUNTERS.unpack_from(self.shm.buf, COUNTERS_OFFSET)
+        COUNTERS.pack_into(self.shm.buf, COUNTERS_OFFSET, hits + hit, misses + (not hit))
+
+    @staticmethod
+    def _digest(key):
+        """Index entries hold a digest of the whole key, so keys of any length stay distinct."""
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=KEY_DIGEST_BYTES).digest()
+
+    def _find(self, raw_key):
+        for block, key, length, last_used, owner, state in self._entries():
+            if state != FREE and key == raw_key:
+                return block, length, state
+        return None
+
+    def get(self, key):
+        raw_key = self._digest(key)
+        with self.lock:
+            found = self._find(raw_key)
+            if found is None or found[2] != READY:
+                self._count(hit=False)
+                return None
+            block, length, _ = found
+            INDEX_ENTRY.pack_into(self.shm.buf, self._entry_offset(block),
+                                  raw_key, length, time.time(), 0, READY)
+            # The copy happens under the lock so the coordinator can never
+            # recycle the block halfway through a read. WSGI servers require
+            # bytes, so this single memcpy is the only copy on the hit path.
+            start = self._block_offset(block)
+            data = bytes(self.shm.buf[start:start + length])
+            self._count(hit=True)
+        return data
+
+    def put(self, key, data):
+        raw_key = self._digest(key)
+        if len(data) > self.block_size:
+            return False
+        with self.lock:
+            if self._find(raw_key) is not None:
+                return True
+            block = next((b for b, _, _, _, _, state in self._entries() if state == FREE), None)
+            if block is None:
+                return False
+            pid = os.getpid()
+            INDEX_ENTRY.pack_into(self.shm.buf, self._entry_offset(block),
+                                  raw_key, 0, time.time(), pid, WRITING)
+        # Nobody else touches a WRITING block, so the payload copy can run
+        # without holding the lock.
+        start = self._block_offset(block)
+        self.shm.buf[start:start + len(data)] = data
+        with self.lock:
+            _, _, _, owner, state = INDEX_ENTRY.unpack_from(self.shm.buf, self._entry_offset(block))
+            if state != WRITING or owner != pid:
+                return False  # reclaimed by evict() as a stale write
+            INDEX_ENTRY.pack_into(self.shm.buf, self._entry_offset(block),
+                                  raw_key, len(data), time.time(), 0, READY)
+        return True
+
+    def _stale_write(self, started, owner, now):
+        """A WRITING block whose worker died (or hung) before finishing it."""
+        if now - started > STALE_WRITE_SECONDS:
+            return True
+        try:
+            os.kill(owner, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def evict(self, low_water=0.1, high_water=0.25):
+        """
+        Free blocks left WRITING by dead workers, then least-recently-used
+        blocks once free space drops below low_water.
+        """
+        with self.lock:
+            now = time.time()
+            evicted = 0
+            for block, _, _, last_used, owner, state in self._entries():
+                if state == WRITING and self._stale_write(last_used, owner, now):
+                    INDEX_ENTRY.pack_into(self.shm.buf, self._entry_offset(block), b"", 0, 0.0, 0, FREE)
+                    evicted += 1
+            entries = list(self._entries())
+            free = sum(1 for e in entries if e[5] == FREE)
+            if free >= self.block_count * low_water:
+                return evicted
+            target = int(self.block_count * high_water)
+            ready = sorted((e for e in entries if e[5] == READY), key=lambda e: e[3])
+            for block, _, _, _, _, _ in ready:
+                if free >= target:
+                    break
+                INDEX_ENTRY.pack_into(self.shm.buf, self._entry_offset(block), b"", 0, 0.0, 0, FREE)
+                free += 1
+                evicted += 1
+            return evicted
+
+    def stats(self):
+        with self.lock:
+            entries = list(self._entries())
+            hits, misses = COUNTERS.unpack_from(self.shm.buf, COUNTERS_OFFSET)
+        return {
+            "type": "shared",
+            "entries": sum(1 for e in entries if e[5] == READY),
+            "writing": sum(1 for e in entries if e[5] == WRITING),
+            "blocks": self.block_count,
+            "block_size": self.block_size,
+            "bytes": sum(e[2] for e in entries if e[5] == READY),
+            "hits": hits,
+            "misses": misses,
+        }
+
+    def close(self, unlink=False):
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
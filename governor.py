@@ -0,0 +1,176 @@
+# governor.py
+"""
+Load governor: lowers rendering quality while the server is under pressure
+and restores it as the load subsides.
+
+Three signals are watched, each with a threshold per level:
+
+    in flight  - requests being handled right now (the request queue)
+    slowdown   - moving average of how much slower recent renders were than
+                 the fastest render of the same animation at the same
+                 quality, decaying back to 1x while nothing renders
+    rss        - resident memory of this process (Linux /proc)
+
+Slowdown rather than render time, because render times differ by orders of
+magnitude between animations: one cold render of an expensive animation
+says nothing about load, a cheap one taking 3x its usual time does.
+
+The level is the highest one any signal reaches:
+
+    0 full     - everything renders at full quality
+    1 reduced  - scalable animations render fewer particles and frames
+    2 low      - ... and on a smaller canvas
+    3 cached   - cached variants of any seed are served first; only
+                 animations with nothing cached render (at low quality)
+
+Cached full-quality renders are always served as they are; the lower levels
+only change what a cache miss renders. The level rises as soon as a signal
+crosses a threshold, and falls one step at a time once every signal has
+stayed below RESTORE_RATIO of the thresholds for COOLDOWN seconds.
+
+In prefork mode every worker runs its own governor.
+"""
+import os
+import threading
+import time
+
+from animations.quality import QUALITIES
+
+LEVEL_NAMES = ("full", "reduced", "low", "cached")
+CACHED_ONLY = 3
+
+IN_FLIGHT_LEVELS = (4, 8, 16)  # requests
+SLOWDOWN_LEVELS = (2.0, 3.0, 5.0)  # render time / fastest render of that animation
+RSS_LEVELS = (0.6, 0.8, 0.95)  # fractions of the RSS limit
+RESTORE_RATIO = 0.7
+COOLDOWN = 5.0  # seconds
+SLOWDOWN_WEIGHT = 0.3  # weight of each new render in the moving average
+SLOWDOWN_HALF_LIFE = 10.0  # seconds for the excess over 1x to halve
+RSS_INTERVAL = 1.0  # seconds between /proc reads
+
+def read_rss():
+    """Resident memory of this process in bytes, or None off Linux."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _level(value, thresholds, scale=1.0):
+    return sum(1 for threshold in thresholds if value >= threshold * scale)
+
+class LoadGovernor:
+    def __init__(self, rss_limit_mb=512, enabled=True, clock=time.monotonic):
+        self.rss_limit = rss_limit_mb * 1024 * 1024
+        self.enabled = enabled
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.fastest = {}  # (animation, quality) -> seconds
+        self.slowdown = 1.0
+        self.slowdown_at = clock()
+        self.rss = None
+        self.rss_at = None
+        self.current = 0
+        self.changed_at = clock()
+        self.calm_since = None
+        self.changes = 0
+        self.seconds_at = [0.0] * len(LEVEL_NAMES)
+        self.degraded_renders = 0
+        self.cached_only_hits = 0
+
+    # === Signals ===
+    def request_started(self):
+        with self.lock:
+            self.in_flight += 1
+
+    def request_finished(self):
+        with self.lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def record_render(self, key, quality, seconds, degraded=False):
+        """A render of animation `key` at `quality` took `seconds`."""
+        with self.lock:
+            fastest = self.fastest.get((key, quality))
+            if fastest is None or seconds < fastest:
+                fastest = self.fastest[(key, quality)] = seconds
+            ratio = seconds / fastest if fastest > 0 else 1.0
+            self.slowdown = self._decayed_slowdown() * (1 - SLOWDOWN_WEIGHT) + ratio * SLOWDOWN_WEIGHT
+            self.slowdown_at = self.clock()
+            if degraded:
+                self.degraded_renders += 1
+
+    def record_cached_only_hit(self):
+        with self.lock:
+            self.cached_only_hits += 1
+
+    def _decayed_slowdown(self):
+        age = self.clock() - self.slowdown_at
+        return 1.0 + (self.slowdown - 1.0) * 0.5 ** (age / SLOWDOWN_HALF_LIFE)
+
+    def _rss(self):
+        now = self.clock()
+        if self.rss_at is None or now - self.rss_at >= RSS_INTERVAL:
+            self.rss = read_rss()
+            self.rss_at = now
+        return self.rss
+
+    def _pressure(self, scale):
+        """Level the signals call for, with every threshold multiplied by `scale`."""
+        level = max(_level(self.in_flight, IN_FLIGHT_LEVELS, scale),
+                    _level(self._decayed_slowdown(), SLOWDOWN_LEVELS, scale))
+        rss = self._rss()
+        if rss is not None and self.rss_limit:
+            level = max(level, _level(rss / self.rss_limit, RSS_LEVELS, scale))
+        return level
+
+    # === Level ===
+    def level(self):
+        """The current level (0 = full quality), updated from the signals."""
+        if not self.enabled:
+            return 0
+        with self.lock:
+            now = self.clock()
+            target = self._pressure(1.0)
+            if target > self.current:
+                self._set(target, now)
+                self.calm_since = None
+            elif self.current and self._pressure(RESTORE_RATIO) < self.current:
+                if self.calm_since is None:
+                    self.calm_since = now
+                elif now - max(self.calm_since, self.changed_at) >= COOLDOWN:
+                    self._set(self.current - 1, now)
+            else:
+                self.calm_since = None
+            return self.current
+
+    def _set(self, level, now):
+        self.seconds_at[self.current] += now - self.changed_at
+        self.current = level
+        self.changed_at = now
+        self.changes += 1
+
+    def quality(self, level=None):
+        """The Quality a cache miss renders at."""
+        level = self.level() if level is None else level
+        return QUALITIES[min(level, len(QUALITIES) - 1)]
+
+    def metrics(self):
+        level = self.level()
+        with self.lock:
+            seconds_at = list(self.seconds_at)
+            seconds_at[level] += self.clock() - self.changed_at
+            rss = self._rss()
+            return {
+                "level": level,
+                "quality": LEVEL_NAMES[level],
+                "enabled": self.enabled,
+                "in_flight": self.in_flight,
+                "render_slowdown": round(self._decayed_slowdown(), 2),
+                "rss_mb": round(rss / 1024 / 1024, 2) if rss is not None else None,
+                "rss_limit_mb": round(self.rss_limit / 1024 / 1024, 2),
+                "level_changes": self.changes,
+                "seconds_at_level": {name: round(seconds, 1) for name, seconds in zip(LEVEL_NAMES, seconds_at)},
+                "degraded_renders": self.degraded_renders,
+                "cached_only_hits": self.cached_only_hits,
+            }
@@ -0,0 +1,400 @@
+# loadtest.py
+"""
+Concurrent-viewer load test for the gallery server.
+
+Simulates N browsers doing what templates/index.html does: load the page,
+then repeatedly open animations (popular ones more often, Zipf-distributed)
+and occasionally start the slideshow. Concurrency is ramped in stages and
+each stage reports throughput, latency percentiles and error rate, while a
+sampler records the server's RSS and CPU over time (Linux /proc).
+
+Everything runs locally with the standard library:
+
+    python loadtest.py                          # start app.py, ramp 1..50 viewers
+    python loadtest.py --workers 4              # same, against the prefork server
+    python loadtest.py --url http://host:5000 --server-pid 1234
+    python loadtest.py --streams 10000          # slow /stream viewers against --async
+
+Results are written as JSON (everything) and CSV (one row per stage) under
+loadtest_results/, named after the current git commit for comparison.
+"""
+import argparse
+import asyncio
+import csv
+import http.client
+import json
+import os
+import random
+import re
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE_KB = os.sysconf("SC_PAGE_SIZE") // 1024 if hasattr(os, "sysconf") else 4
+
+# === Server process metrics (Linux /proc) ===
+def _children(pid):
+    kids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            kids.append(int(entry))
+    return kids
+
+def _process_tree(pid):
+    pids = [pid]
+    for child in _children(pid):
+        pids.extend(_process_tree(child))
+    return pids
+
+def read_usage(pid):
+    """Return (rss_bytes, cpu_seconds) summed over pid and its children."""
+    rss = 0
+    cpu_ticks = 0
+    for p in _process_tree(pid):
+        try:
+            with open(f"/proc/{p}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        cpu_ticks += int(fields[11]) + int(fields[12])  # utime + stime
+        rss += int(fields[21]) * PAGE_SIZE_KB * 1024
+    return rss, cpu_ticks / CLOCK_TICKS
+
+class ResourceSampler(threading.Thread):
+    def __init__(self, pid, interval=0.5):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self.stage = None
+        self.stopped = threading.Event()
+
+    def run(self):
+        start = time.perf_counter()
+        last_time, (_, last_cpu) = start, read_usage(self.pid)
+        while not self.stopped.wait(self.interval):
+            now = time.perf_counter()
+            rss, cpu = read_usage(self.pid)
+            self.samples.append({
+                "t": round(now - start, 3),
+                "stage": self.stage,
+                "rss_mb": round(rss / 1024 / 1024, 2),
+                "cpu_pct": round(100 * (cpu - last_cpu) / (now - last_time), 1),
+            })
+            last_time, last_cpu = now, cpu
+
+# === Simulated viewers ===
+def zipf_weights(count, s=1.1):
+    return [1 / (rank + 1) ** s for rank in range(count)]
+
+class Viewer(threading.Thread):
+    """One browser tab: open the page, then keep opening animations."""
+
+    def __init__(self, host, port, keys, weights, until, results, slideshow_rate, think_time, seed):
+        super().__init__(daemon=True)
+        self.host = host
+        self.port = port
+        self.keys = keys
+        self.weights = weights
+        self.until = until
+        self.results = results
+        self.slideshow_rate = slideshow_rate
+        self.think_time = think_time
+        self.rng = random.Random(seed)
+
+    def fetch(self, path, endpoint):
+        start = time.perf_counter()
+        status, size, error, quality = 0, 0, None, None
+        try:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            conn.request("GET", path)
+            response = conn.getresponse()
+            size = len(response.read())
+            status = response.status
+            quality = response.getheader("X-Quality")
+            conn.close()
+        except (OSError, http.client.HTTPException) as e:
+            error = type(e).__name__
+        elapsed = time.perf_counter() - start
+        ok = error is None and status == 200
+        self.results.append((endpoint, elapsed, ok, size, quality))
+
+    def run(self):
+        self.fetch("/", "/")
+        while time.perf_counter() < self.until:
+            if self.rng.random() < self.slideshow_rate:
+                self.fetch("/get_slideshow", "/get_slideshow")
+            else:
+                key = self.rng.choices(self.keys, self.weights)[0]
+                self.fetch(f"/get_animation/{key}", "/get_animation")
+            if self.think_time:
+                time.sleep(self.rng.expovariate(1 / self.think_time))
+
+# === Slow stream viewers (asyncio server) ===
+async def _slow_viewer(host, port, path, read_size, read_interval, stats):
+    """Open /stream/<key> and read `read_size` bytes every `read_interval` seconds."""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats["failed"] += 1
+        return
+    # A small receive window, so the server sees a genuinely slow reader
+    writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    stats["open"] += 1
+    try:
+        while True:
+            data = await reader.read(read_size)
+            if not data:
+                stats["closed"] += 1
+                break
+            stats["bytes"] += len(data)
+            await asyncio.sleep(read_interval)
+    except (OSError, asyncio.CancelledError):
+        pass
+    finally:
+        stats["open"] -= 1
+        writer.close()
+
+async def stream_soak(host, port, pid, keys, total, step, read_size, read_interval, hold_seconds):
+    """
+    Ramp up to `total` slow stream viewers `step` at a time, sampling the
+    server's RSS after each step and while holding at `total`.
+    """
+    stats = {"open": 0, "failed": 0, "closed": 0, "bytes": 0}
+    samples = []
+
+    def sample(phase):
+        rss, cpu = read_usage(pid) if pid else (0, 0)
+        samples.append({"phase": phase, "streams": stats["open"], "failed": stats["failed"],
+                        "rss_mb": round(rss / 1024 / 1024, 2), "cpu_s": round(cpu, 2),
+                        "received_mb": round(stats["bytes"] / 1024 / 1024, 2)})
+        print(f"🌊 {phase:>5}: {stats['open']:6d} streams  rss {samples[-1]['rss_mb']}MB  "
+              f"failed {stats['failed']}  received {samples[-1]['received_mb']}MB")
+
+    sample("start")
+    tasks = []
+    while len(tasks) < total:
+        for i in range(len(tasks), min(total, len(tasks) + step)):
+            path = f"/stream/{keys[i % len(keys)]}"
+            tasks.append(asyncio.ensure_future(
+                _slow_viewer(host, port, path, read_size, read_interval, stats)))
+            if i % 100 == 99:
+                await asyncio.sleep(0)
+        await asyncio.sleep(2)
+        sample("ramp")
+    for _ in range(max(1, int(hold_seconds / 5))):
+        await asyncio.sleep(5)
+        sample("hold")
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return samples
+
+def soak_summary(samples):
+    """
+    RSS growth per stream across the ramp, and over the hold. The first step
+    also pays for building every animation's stream, so the slope starts there.
+    """
+    ramp = [s for s in samples if s["phase"] == "ramp"]
+    first, ramped = ramp[0], ramp[-1]
+    held = [s for s in samples if s["phase"] == "hold"]
+    added = ramped["streams"] - first["streams"]
+    return {
+        "streams": ramped["streams"],
+        "failed": ramped["failed"],
+        "kb_per_stream": round((ramped["rss_mb"] - first["rss_mb"]) * 1024 / added, 2) if added else None,
+        "hold_rss_drift_mb": round(held[-1]["rss_mb"] - ramped["rss_mb"], 2) if held else None,
+    }
+
+# === Reporting ===
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize(results, elapsed):
+    latencies = sorted(r[1] for r in results)
+    errors = sum(1 for r in results if not r[2])
+    summary = {
+        "requests": len(results),
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0,
+        "mb_per_s": round(sum(r[3] for r in results) / elapsed / 1024 / 1024, 2) if elapsed else 0,
+        "error_rate": round(errors / len(results), 4) if results else 0,
+    }
+    for pct in (50, 90, 99):
+        value = percentile(latencies, pct)
+        summary[f"p{pct}_ms"] = round(value * 1000, 2) if value is not None else None
+    summary["max_ms"] = round(latencies[-1] * 1000, 2) if latencies else None
+    # Share of responses sent while the server's load governor had lowered quality
+    degraded = sum(1 for r in results if r[4] not in (None, "full"))
+    summary["degraded_rate"] = round(degraded / len(results), 4) if results else 0
+    return summary
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+# === Server lifecycle ===
+def start_server(port, workers, use_async=False):
+    cmd = [sys.executable, "app.py", "--port", str(port), "--store-dir", ""]
+    cmd += ["--async"] if use_async else ["--workers", str(workers)]
+    return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+
+def wait_ready(host, port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/")
+            page = conn.getresponse().read().decode("utf-8")
+            conn.close()
+            return page
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {host}:{port} did not come up within {timeout}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-viewer load test")
+    parser.add_argument("--url", help="Test an already running server instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="PID to sample RSS/CPU from when using --url")
+    parser.add_argument("--port", type=int, default=5099, help="Port for the locally started server")
+    parser.add_argument("--workers", type=int, default=1, help="Workers for the locally started server")
+    parser.add_argument("--stages", default="1,5,10,25,50", help="Comma-separated viewer counts to ramp through")
+    parser.add_argument("--stage-seconds", type=float, default=10.0)
+    parser.add_argument("--slideshow-rate", type=float, default=0.02,
+                        help="Fraction of viewer actions that start the slideshow")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Mean seconds a viewer waits between requests (0 = back-to-back)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Key popularity skew")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Start the server in asyncio mode (implied by --streams)")
+    parser.add_argument("--streams", type=int, default=0,
+                        help="Instead of viewers, hold this many slow /stream connections open")
+    parser.add_argument("--stream-step", type=int, default=1000, help="Streams opened per ramp step")
+    parser.add_argument("--read-size", type=int, default=256, help="Bytes a slow stream reads at a time")
+    parser.add_argument("--read-interval", type=float, default=1.0, help="Seconds between a slow stream's reads")
+    parser.add_argument("--hold-seconds", type=float, default=30.0, help="Seconds to hold all streams open")
+    parser.add_argument("--out", default="loadtest_results")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+        pid = args.server_pid
+    else:
+        host, port = "127.0.0.1", args.port
+        server = start_server(port, args.workers, use_async=args.use_async or args.streams > 0)
+        pid = server.pid
+
+    try:
+        page = wait_ready(host, port)
+        keys = sorted(set(re.findall(r'data-key="([^"]+)"', page)), key=int)
+        rng = random.Random(args.seed)
+        popularity = keys[:]
+        rng.shuffle(popularity)
+        weights = zipf_weights(len(popularity), args.zipf)
+
+        if args.streams:
+            soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+            samples = asyncio.run(stream_soak(
+                host, port, pid, popularity, args.streams, args.stream_step,
+                args.read_size, args.read_interval, args.hold_seconds))
+            summary = soak_summary(samples)
+            print(f"📈 {summary['streams']} streams: {summary['kb_per_stream']} KB RSS per stream, "
+                  f"drift while holding {summary['hold_rss_drift_mb']}MB")
+            commit = git_commit()
+            os.makedirs(args.out, exist_ok=True)
+            path = os.path.join(args.out, f"streams-{commit}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+            with open(path, "w") as f:
+                json.dump({"commit": commit, "config": vars(args), "summary": summary,
+                           "samples": samples}, f, indent=2)
+            print(f"📊 Results written to {path}")
+            return
+
+        sampler = ResourceSampler(pid) if pid else None
+        if sampler:
+            sampler.start()
+
+        stages = []
+        for concurrency in [int(n) for n in args.stages.split(",")]:
+            if sampler:
+                sampler.stage = concurrency
+            results = []
+            until = time.perf_counter() + args.stage_seconds
+            viewers = [
+                Viewer(host, port, popularity, weights, until, results,
+                       args.slideshow_rate, args.think_time, seed=args.seed * 100003 + i)
+                for i in range(concurrency)
+            ]
+            start = time.perf_counter()
+            for viewer in viewers:
+                viewer.start()
+            for viewer in viewers:
+                viewer.join()
+            elapsed = time.perf_counter() - start
+
+            stage = {"concurrency": concurrency, **summarize(results, elapsed), "endpoints": {}}
+            for endpoint in sorted({r[0] for r in results}):
+                stage["endpoints"][endpoint] = summarize([r for r in results if r[0] == endpoint], elapsed)
+            if sampler:
+                usage = [s for s in sampler.samples if s["stage"] == concurrency]
+                stage["peak_rss_mb"] = max((s["rss_mb"] for s in usage), default=None)
+                stage["mean_cpu_pct"] = (round(sum(s["cpu_pct"] for s in usage) / len(usage), 1)
+                                         if usage else None)
+            stages.append(stage)
+            print(f"👥 {concurrency:4d} viewers: {stage['throughput_rps']:8.1f} req/s  "
+                  f"p50 {stage['p50_ms']}ms  p99 {stage['p99_ms']}ms  "
+                  f"errors {stage['error_rate'] * 100:.1f}%  degraded {stage['degraded_rate'] * 100:.1f}%  "
+                  f"rss {stage.get('peak_rss_mb')}MB  cpu {stage.get('mean_cpu_pct')}%")
+
+        if sampler:
+            sampler.stopped.set()
+            sampler.join()
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    commit = git_commit()
+    os.makedirs(args.out, exist_ok=True)
+    base = os.path.join(args.out, f"loadtest-{commit}-{time.strftime('%Y%m%d-%H%M%S')}")
+    report = {
+        "commit": commit,
+        "config": vars(args),
+        "keys_by_popularity": popularity,
+        "stages": stages,
+        "resources": sampler.samples if sampler else [],
+    }
+    with open(base + ".json", "w") as f:
+        json.dump(report, f, indent=2)
+    columns = ["concurrency", "requests", "throughput_rps", "mb_per_s", "error_rate",
+               "p50_ms", "p90_ms", "p99_ms", "max_ms", "degraded_rate", "peak_rss_mb", "mean_cpu_pct"]
+    with open(base + ".csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(stages)
+    print(f"📊 Results written to {base}.json and {base}.csv")
+
+if __name__ == "__main__":
+    main()
@@ -3,24 +3,48 @@ import os
 import time
 import random
 import argparse
-from animations.math_animations import MATH_ANIMATIONS
-from animations.ascii_animations import build_ascii_animations
+import sys
+from animations.registry import AnimationMap
 
 MAX_WIDTH = 80  # For centering
 
 # === Load all animations ===
 def build_animations():
-    animations = {}
+    """
+    Terminal animations by key. Modules are imported (and asciiArt.txt parsed)
+    only when an animation is played, so listing them is nearly free.
+    """
+    return AnimationMap("terminal")
 
-    # Add math-based animations (e.g., "1", "2", ...)
-    for key, (name, func) in MATH_ANIMATIONS.items():
-        animations[key] = (name, func)
+def get_ascii_arts():
+    from animations.ascii_animations import get_ascii_arts as load
+    return load()
 
-    # Add ASCII art animations (e.g., "9", "10", ...)
-    ascii_anims, ascii_arts = build_ascii_animations(start_index=len(MATH_ANIMATIONS) + 1)
-    animations.update(ascii_anims)
+# === Startup profiling: re-run ourselves under -X importtime ===
+def run_startup_profile(argv, top=15):
+    import subprocess
 
-    return animations, ascii_arts
+    cmd = [sys.executable, "-X", "importtime", __file__] + argv
+    start = time.perf_counter()
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            stdin=subprocess.DEVNULL, text=True)
+    elapsed = time.perf_counter() - start
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = [part.strip() for part in line.split(":", 1)[1].split("|")]
+            imports.append((int(cumulative_us), int(self_us), name))
+        except ValueError:
+            continue  # the column header line
+
+    print(f"⏱️  Startup profile for: main.py {' '.join(argv)}")
+    print(f"   wall time: {elapsed * 1000:.1f} ms, {len(imports)} modules imported")
+    print(f"   {'cumulative':>12} {'self':>10}  module")
+    for cumulative_us, self_us, name in sorted(imports, reverse=True)[:top]:
+        print(f"   {cumulative_us / 1000:>10.1f}ms {self_us / 1000:>8.1f}ms  {name}")
 
 # === Utility: Print centered ASCII art ===
 def print_ascii_art(lines):
@@ -48,7 +72,7 @@ def sorted_animation_items(animations):
 
 # === Main ===
 def main():
-    animations, ascii_arts = build_animations()
+    animations = build_animations()
 
     parser = argparse.ArgumentParser(description="🎨 Animated ASCII Art Collection 🎨")
     parser.add_argument(
@@ -70,9 +94,53 @@ def main():
         "--view", "-v",
         help="View raw ASCII art by name (case-insensitive)"
     )
+    parser.add_argument(
+        "--seed", "-s",
+        type=int,
+        help="Seed the animation's random generator for reproducible output"
+    )
+    parser.add_argument(
+        "--banner", "-b",
+        metavar="TEXT",
+        help="Print TEXT as a FIGlet-style banner (see --font, --reveal)"
+    )
+    parser.add_argument(
+        "--font", "-f",
+        default="standard",
+        help="Banner font: the name of a .flf file in fonts/ (default: standard)"
+    )
+    parser.add_argument(
+        "--reveal",
+        action="store_true",
+        help="Play the banner with the ASCII art reveal animation instead of printing it"
+    )
+    parser.add_argument(
+        "--no-color",
+        action="store_true",
+        help="Disable colored output (same as setting NO_COLOR)"
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Measure import/startup time of the given command (e.g. --startup-profile --list)"
+    )
+    parser.add_argument(
+        "--export",
+        nargs=2,
+        metavar=("KEY", "OUT"),
+        help="Record an animation to an asciicast v2 file (e.g. --export 1 orbit.cast)"
+    )
 
     args = parser.parse_args()
 
+    if args.no_color:
+        os.environ["NO_COLOR"] = "1"
+
+    # Handle: --startup-profile
+    if args.startup_profile:
+        run_startup_profile([arg for arg in sys.argv[1:] if arg != "--startup-profile"])
+        return
+
     # Handle: --list
     if args.list:
         print("Available Animations:")
@@ -80,9 +148,40 @@ def main():
             print(f"  {key}: {name}")
         return
 
+    # Handle: --banner
+    if args.banner:
+        from animations.banner import list_fonts, render_banner
+        try:
+            lines = render_banner(args.banner.replace("\\n", "\n"), args.font)
+        except (FileNotFoundError, ValueError):
+            print(f"❌ Unknown font: {args.font}")
+            print(f"Available fonts: {', '.join(list_fonts())}")
+            return
+        if args.reveal:
+            from animations.ascii_animations import create_ascii_reveal_animation
+            create_ascii_reveal_animation(list(lines), seed=args.seed)()
+        else:
+            print("\n".join(lines))
+        return
+
+    # Handle: --export
+    if args.export:
+        from animations.asciicast import terminal_frames, write_cast
+        key, out_path = args.export
+        key = key.lstrip("-")
+        if key not in animations:
+            print(f"❌ Invalid animation number: {key}")
+            print("Use --list to see available options.")
+            return
+        name, func = animations[key]
+        size = write_cast(out_path, name, terminal_frames(func, seed=args.seed))
+        print(f"📼 Exported '{name}' to {out_path} ({size} bytes)")
+        return
+
     # Handle: --view
     if args.view:
         query = args.view.lower()
+        ascii_arts = get_ascii_arts()
         matches = [name for name in ascii_arts.keys() if query in name]
         if not matches:
             print(f"No art found matching '{args.view}'")
@@ -109,7 +208,7 @@ def main():
         else:
             print(f"▶️ Starting: {name}")
             time.sleep(1)
-            func()
+            func(seed=args.seed)
         return
 
     # === Interactive Menu ===
@@ -144,6 +243,7 @@ def main():
 
         elif choice == "v":
             query = input("Enter art name to view: ").strip().lower()
+            ascii_arts = get_ascii_arts()
             matches = [name for name in ascii_arts.keys() if query in name]
             if not matches:
                 print(f"No match for '{query}'. Press Enter...")
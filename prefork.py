@@ -0,0 +1,84 @@
+# prefork.py
+"""
+Prefork serving mode: one listening socket, N forked Werkzeug workers.
+
+The parent process owns the socket and the shared frame store. It forks the
+workers, restarts any that die, and acts as the store coordinator by running
+eviction on a timer. Workers only serve requests.
+"""
+import os
+import signal
+import socket
+import time
+
+from werkzeug.serving import make_server
+
+def _bind(host, port, backlog=128):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def _spawn_worker(app, host, port, sock):
+    pid = os.fork()
+    if pid:
+        return pid
+    # === Worker process ===
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+    try:
+        server.serve_forever()
+    finally:
+        os._exit(0)
+
+def serve_prefork(app, store, host="0.0.0.0", port=5000, workers=4, evict_interval=1.0):
+    """Run `workers` copies of `app` on one socket until interrupted."""
+    sock = _bind(host, port)
+    children = {}
+    for _ in range(workers):
+        children[_spawn_worker(app, host, port, sock)] = True
+    print(f"🧵 Prefork server on {host}:{port} with {workers} workers (pids: {list(children)})")
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    # === Coordinator loop ===
+    try:
+        while not stopping:
+            evicted = store.evict()
+            if evicted:
+                print(f"♻️  Evicted {evicted} cached variants")
+            # Restart crashed workers so the pool stays at full size
+            while True:
+                try:
+                    pid, _ = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    pid = 0
+                if not pid:
+                    break
+                children.pop(pid, None)
+                if not stopping:
+                    children[_spawn_worker(app, host, port, sock)] = True
+            time.sleep(evict_interval)
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        sock.close()
+        store.close(unlink=True)
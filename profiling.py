@@ -0,0 +1,165 @@
+# profiling.py
+"""
+On-demand diagnostics for a running server (see /debug/* in app.py).
+
+sample_stacks() is a sampling profiler: a helper thread wakes up every few
+milliseconds and records the stack of every other thread via
+sys._current_frames(). Nothing is traced, so the overhead is one stack walk
+per thread per sample and the request threads run at full speed otherwise.
+
+trace_allocations() uses tracemalloc snapshots taken at the start and end of
+a window and reports the code paths whose retained memory grew the most.
+
+Both only see the process that handles the request; in prefork mode that is
+one worker.
+"""
+import inspect
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from functools import lru_cache
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+GENERATOR_MODULES = ("animations",)
+
+@lru_cache(maxsize=None)
+def _short_path(filename):
+    """Path relative to this repository or to the sys.path entry it came from."""
+    if filename.startswith(PROJECT_ROOT):
+        return os.path.relpath(filename, PROJECT_ROOT)
+    roots = [p for p in sys.path if p and filename.startswith(os.path.join(p, ""))]
+    if roots:
+        return os.path.relpath(filename, max(roots, key=len))
+    return os.path.basename(filename)
+
+def _frame_label(code):
+    return f"{_short_path(code.co_filename)}:{code.co_name}"
+
+def _is_generator_frame(code):
+    if not code.co_filename.startswith(PROJECT_ROOT):
+        return False
+    relative = os.path.relpath(code.co_filename, PROJECT_ROOT)
+    return relative.startswith(GENERATOR_MODULES) and code.co_name.startswith(("create_", "animate_"))
+
+def sample_stacks(seconds, interval=0.005):
+    """
+    Sample every thread's stack for `seconds`.
+
+    Returns (stacks, generators, samples): a Counter of collapsed stacks
+    ("outer;inner;leaf" -> samples), a Counter of generator function names
+    (samples whose stack contains e.g. create_fire_animation), and the number
+    of sampling rounds taken.
+    """
+    stacks = Counter()
+    generators = Counter()
+    rounds = 0
+    ignore = {threading.get_ident()}
+    done = threading.Event()
+
+    def sampler():
+        nonlocal rounds
+        ignore.add(threading.get_ident())
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id in ignore:
+                    continue
+                labels = []
+                generator = None
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    if generator is None and _is_generator_frame(frame.f_code):
+                        generator = frame.f_code.co_name
+                    frame = frame.f_back
+                stacks[";".join(reversed(labels))] += 1
+                if generator:
+                    generators[generator] += 1
+            rounds += 1
+            time.sleep(interval)
+        done.set()
+
+    thread = threading.Thread(target=sampler, name="stack-sampler", daemon=True)
+    thread.start()
+    done.wait()
+    thread.join()
+    return stacks, generators, rounds
+
+def collapsed(stacks):
+    """Format stacks for flamegraph.pl / speedscope / inferno."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+def idle_stack(stack):
+    """True for threads parked in the server's accept/select loop or a lock wait."""
+    leaf = stack.rsplit(";", 1)[-1]
+    return leaf.endswith((":select", ":wait", ":accept", ":serve_forever", ":_worker", ":poll"))
+
+# === Allocation tracing ===
+_trace_lock = threading.Lock()
+
+def _line_ranges(functions):
+    ranges = []
+    for func in functions:
+        lines, start = inspect.getsourcelines(func)
+        ranges.append((func.__code__.co_filename, start, start + len(lines)))
+    return ranges
+
+def trace_allocations(seconds, frames=25, limit=20, focus=()):
+    """
+    Diff two tracemalloc snapshots taken `seconds` apart.
+
+    Returns the top `limit` allocation sites by growth, plus the top sites
+    whose traceback passes through one of the `focus` functions (e.g. the
+    /get_animation handler). Snapshots only show memory still alive at the
+    end of the window, so the traced peak is reported alongside to account
+    for short-lived allocations.
+    """
+    ranges = _line_ranges(focus)
+    with _trace_lock:
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(frames)
+        try:
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            start_size, _ = tracemalloc.get_traced_memory()
+            time.sleep(seconds)
+            end_size, peak_size = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+        finally:
+            if started_here:
+                tracemalloc.stop()
+
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ]
+    before = before.filter_traces(filters)
+    after = after.filter_traces(filters)
+
+    def describe(stat):
+        return {
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "count_diff": stat.count_diff,
+            "size_kb": round(stat.size / 1024, 1),
+            "stack": [f"{_short_path(f.filename)}:{f.lineno}" for f in reversed(stat.traceback)],
+        }
+
+    by_line = [s for s in after.compare_to(before, "lineno") if s.size_diff > 0]
+    by_path = [s for s in after.compare_to(before, "traceback") if s.size_diff > 0]
+    focused = [
+        stat for stat in by_path
+        if any(frame.filename == filename and start <= frame.lineno < end
+               for frame in stat.traceback for filename, start, end in ranges)
+    ]
+
+    return {
+        "seconds": seconds,
+        "traced_start_kb": round(start_size / 1024, 1),
+        "traced_end_kb": round(end_size / 1024, 1),
+        "traced_peak_kb": round(peak_size / 1024, 1),
+        "top_lines": [describe(s) for s in by_line[:limit]],
+        "top_request_paths": [describe(s) for s in focused[:limit]],
+    }
@@ -0,0 +1,146 @@
+// static/player-worker.js - fetches and decodes animation payloads off the main thread
+//
+// The page posts {id, url}; the worker fetches the payload, rebuilds sparse
+// scenes, renders colored rows to HTML and unrolls the timeline, then posts
+// back a compact description the player can show row by row:
+//
+//   rows      - every distinct row (plain text, or HTML when html[i] is 1)
+//   rowIds    - Int32Array of row indices, frame after frame
+//   offsets   - Int32Array: frame f uses rowIds[offsets[f]..offsets[f + 1])
+//   ticks     - Int32Array: the frame shown at each tick of frameDelay ms
+//
+// Identical rows share an index, so the player can tell which rows changed
+// between two frames by comparing integers.
+
+// Mostly-empty animations arrive as a sparse scene: a width x height grid,
+// background cells drawn in every frame, and per frame only the
+// [x, y, glyph(, color)] cells on top (see animations/scene.py).
+function sceneFrames(data) {
+    if (data.format !== 'sparse') return data;
+    const blank = () => Array.from({ length: data.height }, () => Array(data.width).fill(' '));
+    const unpainted = () => Array.from({ length: data.height }, () => Array(data.width).fill(0));
+    const base = blank();
+    const baseColors = unpainted();
+    let colored = false;
+    for (const [x, y, glyph, color] of data.background) {
+        base[y][x] = glyph;
+        if (color) { baseColors[y][x] = color; colored = true; }
+    }
+    const grids = data.frames.map(entries => {
+        const grid = base.map(row => row.slice());
+        const colors = baseColors.map(row => row.slice());
+        for (const [x, y, glyph, color] of entries) {
+            grid[y][x] = glyph;
+            colors[y][x] = color || 0;
+            if (color) colored = true;
+        }
+        return [grid, colors];
+    });
+    const frames = grids.map(([grid]) => grid.map(row => row.join('')).join('\n'));
+    if (!colored) return { ...data, frames };
+    // Row spans as in styles: [color, length, ...], trailing default dropped
+    const styles = grids.map(([, colors]) => colors.map(row => {
+        const spans = [];
+        row.forEach(color => {
+            if (spans.length && spans[spans.length - 2] === color) spans[spans.length - 1]++;
+            else spans.push(color, 1);
+        });
+        if (spans.length && spans[spans.length - 2] === 0) spans.length -= 2;
+        return spans;
+    }));
+    return { ...data, frames, styles };
+}
+
+function escapeHtml(text) {
+    return text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+}
+
+// Colored animations send per-row style spans alongside the text:
+// spans = [paletteIndex, length, paletteIndex, length, ...] with index 0
+// (and anything past the last span) in the default color. Open a <span>
+// only where the color changes.
+function styledRowHtml(line, spans) {
+    const cells = Array.from(line);
+    let html = '';
+    let position = 0;
+    for (let i = 0; i < spans.length; i += 2) {
+        const text = escapeHtml(cells.slice(position, position + spans[i + 1]).join(''));
+        html += spans[i] ? `<span class="c${spans[i]}">${text}</span>` : text;
+        position += spans[i + 1];
+    }
+    return html + escapeHtml(cells.slice(position).join(''));
+}
+
+// The server coalesces repeated frames (frame_durations) and stores only
+// one period of looping animations (loop_start); unroll both back to one
+// frame index per tick.
+function timelineTicks(data) {
+    const delay = data.frame_delay || 100;
+    const durations = data.frame_durations;
+    const total = data.total_frames || data.frames.length;
+    const loopStart = data.loop_start;
+    const ticks = new Int32Array(total);
+    let length = 0;
+    let index = 0;
+    while (length < total && data.frames.length) {
+        const count = durations ? Math.max(1, Math.round(durations[index] / delay)) : 1;
+        for (let t = 0; t < count && length < total; t++) ticks[length++] = index;
+        index++;
+        if (index === data.frames.length) {
+            if (loopStart === undefined || loopStart === null) break;
+            index = loopStart;
+        }
+    }
+    return ticks.slice(0, length);
+}
+
+function decode(data) {
+    data = sceneFrames(data);
+    const rows = [];
+    const html = [];
+    const ids = new Map();
+    const rowIds = [];
+    const offsets = new Int32Array(data.frames.length + 1);
+    data.frames.forEach((text, f) => {
+        const spans = data.styles && data.styles[f];
+        text.split('\n').forEach((line, r) => {
+            const styled = Boolean(spans && spans[r] && spans[r].length);
+            const row = styled ? styledRowHtml(line, spans[r]) : line;
+            const key = (styled ? 'h' : 't') + row;
+            let id = ids.get(key);
+            if (id === undefined) {
+                id = rows.length;
+                ids.set(key, id);
+                rows.push(row);
+                html.push(styled ? 1 : 0);
+            }
+            rowIds.push(id);
+        });
+        offsets[f + 1] = rowIds.length;
+    });
+    return {
+        name: data.name,
+        frameDelay: data.frame_delay || 100,
+        palette: data.palette || null,
+        rows,
+        html: Uint8Array.from(html),
+        rowIds: Int32Array.from(rowIds),
+        offsets,
+        ticks: timelineTicks(data),
+    };
+}
+
+self.onmessage = async (event) => {
+    const { id, url } = event.data;
+    try {
+        const response = await fetch(url);
+        const data = await response.json();
+        if (data.error) throw new Error(data.error);
+        const decoded = decode(data);
+        self.postMessage({ id, decoded }, [
+            decoded.html.buffer, decoded.rowIds.buffer, decoded.offsets.buffer, decoded.ticks.buffer,
+        ]);
+    } catch (error) {
+        self.postMessage({ id, error: error.message });
+    }
+};